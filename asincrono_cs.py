@@ -0,0 +1,241 @@
+###############################################################
+# API ASÍNCRONA (asyncio)
+# Para usar el analizador desde un servicio asyncio sin bloquear el
+# loop: el lexer, el parser y el semántico corren en un pool de
+# hilos o de procesos, cada uno con su SesionAnalisis ya construida
+# (se calienta al crear el worker).
+#
+#   async with AnalizadorAsync(workers=4, timeout=10) as analizador:
+#       resultado = await analizador.analizar(codigo)
+#
+#   resultado = {"estado": "ok"|"timeout"|"error", "ast": ...,
+#                "errores": [{"fase", "mensaje", "linea", "columna", "regla"}],
+#                "ms": ...}
+#
+# - Contrapresión: a lo sumo max_pendientes análisis en curso o en
+#   cola del pool; el que llega con el cupo lleno espera en el await.
+#   El cupo se libera cuando el worker termina de verdad, no cuando
+#   el que llamó deja de esperar.
+# - Timeout por llamada y cancelación (cancelar la tarea que hace el
+#   await): un análisis en cola no llega a empezar; uno en curso se
+#   corta en el siguiente token o sentencia (sesion_cs.Cancelacion).
+#   Con procesos el corte solo llega por el timeout, que el worker
+#   cuenta por su cuenta: cancelar deja terminar el análisis en
+#   curso y descarta el resultado.
+# - Los errores vuelven en el resultado; nada se escribe en stderr
+#   ni en logs/.
+# Con hilos el trabajo sigue compitiendo por el GIL (el loop responde
+# pero no se gana paralelismo); con procesos=True sí, a cambio de
+# mandar el fuente y el AST entre procesos (el AST viaja en el
+# formato plano de ast_cs).
+###############################################################
+
+import asyncio
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import ast_cs
+import lexer_cs
+from sesion_cs import AnalisisCancelado, Cancelacion, SesionAnalisis
+
+# Los mensajes léxicos y sintácticos traen la posición en el texto
+_UBICACION = re.compile(r"en línea (\d+), columna (\d+)")
+
+
+# ==========================
+# Trabajo en el worker
+# ==========================
+
+# Una sesión por hilo (o por proceso): se construye una vez
+_local = threading.local()
+
+
+def _sesion():
+    sesion = getattr(_local, "sesion", None)
+    if sesion is None:
+        sesion = _local.sesion = SesionAnalisis()
+    return sesion
+
+
+def _calentar():
+    """Inicializador del pool: lexer, parser y semántico listos antes del primer análisis."""
+    _sesion().analizar("int x = 1;\n")
+
+
+def error(fase, mensaje, linea=None, columna=None, regla=None):
+    """Error estructurado; si no se da la posición se busca en el mensaje."""
+    if linea is None:
+        m = _UBICACION.search(mensaje)
+        if m:
+            linea, columna = int(m.group(1)), int(m.group(2))
+    return {"fase": fase, "mensaje": mensaje, "linea": linea, "columna": columna, "regla": regla}
+
+
+def analizar_en_worker(codigo, semantico=True, cancelacion=None, timeout=None, formato_ast="nodos"):
+    """
+    Análisis completo de codigo con la sesión del hilo/proceso actual.
+    Sin cancelacion se crea una con timeout (el límite corre desde acá).
+    formato_ast: "nodos", "plano" (ast_cs.a_plano) o None (sin AST).
+    """
+    if cancelacion is None:
+        cancelacion = Cancelacion(timeout)
+    inicio = time.perf_counter()
+    semanticos = []
+    indice = None
+
+    def reportar(msg, nodo):
+        nonlocal indice
+        linea = columna = None
+        if getattr(nodo, "inicio", None) is not None:
+            if indice is None:
+                indice = lexer_cs.LineIndex(codigo)
+            linea, columna = indice.line(nodo.inicio), indice.column(nodo.inicio)
+        semanticos.append(error("semantico", msg, linea, columna, getattr(nodo, "tag", None)))
+
+    resultado = {"estado": "ok", "ast": None, "errores": [], "ms": 0.0}
+    try:
+        analisis = _sesion().analizar(codigo, semantico, reportar=reportar, cancelacion=cancelacion)
+    except AnalisisCancelado:
+        resultado["estado"] = "cancelado" if cancelacion.cancelado else "timeout"
+    except Exception as e:
+        resultado["estado"] = "error"
+        resultado["errores"].append(error("interno", f"Error durante el análisis: {e}"))
+    else:
+        errores = resultado["errores"]
+        errores.extend(error("lexico", m) for m in analisis["errores_lexicos"])
+        errores.extend(error("sintactico", m) for m in analisis["errores_sintacticos"])
+        errores.extend(semanticos)
+        if formato_ast == "nodos":
+            resultado["ast"] = analisis["ast"]
+        elif formato_ast == "plano":
+            resultado["ast"] = ast_cs.a_plano(analisis["ast"])
+    resultado["ms"] = round((time.perf_counter() - inicio) * 1000, 3)
+    return resultado
+
+
+# ==========================
+# Lado asyncio
+# ==========================
+
+class AnalizadorAsync:
+    """
+    Pool de `workers` sesiones (hilos, o procesos con procesos=True).
+    max_pendientes: análisis aceptados a la vez (por defecto 2 por
+    worker); timeout: segundos por llamada por defecto (None = sin
+    límite).
+    """
+
+    def __init__(self, workers=4, procesos=False, max_pendientes=None, timeout=None):
+        self.workers = workers
+        self.procesos = procesos
+        self.max_pendientes = max_pendientes or 2 * workers
+        self.timeout = timeout
+        self.completados = 0
+        self.timeouts = 0
+        self.cancelados = 0
+        self._executor = None
+        self._cupo = None
+        self._loop = None
+        self._en_curso = set()      # Cancelacion de los análisis en hilos sin terminar
+
+    def _iniciar(self):
+        if self._executor is None:
+            if self.procesos:
+                self._executor = ProcessPoolExecutor(self.workers, initializer=_calentar)
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="analisis",
+                                                    initializer=_calentar)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # El semáforo queda atado a un loop: uno nuevo por loop
+            self._loop = loop
+            self._cupo = asyncio.Semaphore(self.max_pendientes)
+        return loop
+
+    async def analizar(self, codigo, semantico=True, timeout=None, con_ast=True):
+        """
+        Resultado estructurado del análisis de codigo (ver arriba). Si
+        se cancela la tarea que espera, se propaga CancelledError.
+        """
+        loop = self._iniciar()
+        timeout = self.timeout if timeout is None else timeout
+        cupo = self._cupo
+        await cupo.acquire()        # contrapresión: espera a que haya lugar
+
+        cancelacion = None
+        try:
+            if self.procesos:
+                futuro = self._executor.submit(analizar_en_worker, codigo, semantico, None, timeout,
+                                               "plano" if con_ast else None)
+            else:
+                cancelacion = Cancelacion(timeout)
+                self._en_curso.add(cancelacion)
+                futuro = self._executor.submit(analizar_en_worker, codigo, semantico, cancelacion,
+                                               None, "nodos" if con_ast else None)
+        except BaseException:
+            cupo.release()
+            raise
+
+        def terminar(_):
+            # Corre en el hilo del worker (o del pool de procesos)
+            self._en_curso.discard(cancelacion)
+            try:
+                loop.call_soon_threadsafe(cupo.release)
+            except RuntimeError:
+                pass                # el loop ya se cerró
+        futuro.add_done_callback(terminar)
+
+        inicio = time.perf_counter()
+        try:
+            resultado = await asyncio.wait_for(asyncio.wrap_future(futuro), timeout)
+        except asyncio.TimeoutError:
+            # wait_for ya canceló el futuro (si no había empezado)
+            if cancelacion is not None:
+                cancelacion.cancelar()
+            self.timeouts += 1
+            return {"estado": "timeout", "ast": None, "errores": [],
+                    "ms": round((time.perf_counter() - inicio) * 1000, 3)}
+        except asyncio.CancelledError:
+            if cancelacion is not None:
+                cancelacion.cancelar()
+            self.cancelados += 1
+            raise
+
+        if resultado["estado"] == "timeout":
+            self.timeouts += 1
+        else:
+            self.completados += 1
+        if self.procesos and resultado["ast"] is not None:
+            # Armar los nodos fuera del loop
+            resultado["ast"] = await asyncio.to_thread(ast_cs.desde_plano, resultado["ast"])
+        return resultado
+
+    async def cerrar(self):
+        """Corta los análisis en curso, descarta los que esperan y cierra el pool."""
+        if self._executor is None:
+            return
+        for cancelacion in list(self._en_curso):
+            cancelacion.cancelar()
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, True, cancel_futures=True)
+
+    async def __aenter__(self):
+        self._iniciar()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.cerrar()
+
+
+# Analizador compartido de analizar() (hilos, se crea en el primer uso)
+_por_defecto = None
+
+
+async def analizar(codigo, semantico=True, timeout=None):
+    """await analizar(codigo) con un AnalizadorAsync por defecto del proceso."""
+    global _por_defecto
+    if _por_defecto is None:
+        _por_defecto = AnalizadorAsync()
+    return await _por_defecto.analizar(codigo, semantico, timeout)
@@ -0,0 +1,654 @@
+###############################################################
+# NODOS DEL AST
+# Cada tipo de nodo es una clase con __slots__ (sin __dict__ por
+# instancia) que guarda sus hijos y la posición en el fuente:
+#   inicio: offset del primer carácter del nodo
+#   fin:    offset siguiente al último carácter (se calcula a
+#           partir del largo, o del lexema en Var)
+# `tag` es la etiqueta de las tuplas que usaba antes el parser
+# ("binop", "declaration_init", ...) y `kind` un código entero
+# para despachar sin comparar strings.
+# a_tupla() convierte un nodo al formato de tuplas anterior.
+###############################################################
+
+import sys
+
+
+class Nodo:
+    __slots__ = ("inicio",)
+    tag = None
+    kind = -1
+    campos = ()
+
+    def __repr__(self):
+        valores = ", ".join(repr(getattr(self, c)) for c in self.campos)
+        return f"{type(self).__name__}({valores})"
+
+
+class Compuesto(Nodo):
+    """
+    Nodo con hijos. Guarda el largo en vez del offset final: casi
+    todos los nodos miden menos de 257 caracteres y esos enteros
+    pequeños son objetos compartidos por CPython (no ocupan memoria).
+    """
+    __slots__ = ("largo",)
+
+    @property
+    def fin(self):
+        return self.inicio + self.largo
+
+
+# ==========================
+# Programa y bloques
+# ==========================
+
+class Program(Compuesto):
+    __slots__ = ("statements",)
+    tag, kind, campos = "program", 0, ("statements",)
+
+    def __init__(self, statements, inicio=0, fin=0):
+        self.statements = statements
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class Block(Compuesto):
+    __slots__ = ("statements",)
+    tag, kind, campos = "block", 1, ("statements",)
+
+    def __init__(self, statements, inicio=0, fin=0):
+        self.statements = statements
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+# ==========================
+# Declaraciones y asignaciones
+# ==========================
+
+class Declaration(Compuesto):
+    __slots__ = ("tipo", "nombre")
+    tag, kind, campos = "declaration", 2, ("tipo", "nombre")
+
+    def __init__(self, tipo, nombre, inicio=0, fin=0):
+        self.tipo = tipo
+        self.nombre = nombre
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class DeclarationInit(Compuesto):
+    __slots__ = ("tipo", "nombre", "expr")
+    tag, kind, campos = "declaration_init", 3, ("tipo", "nombre", "expr")
+
+    def __init__(self, tipo, nombre, expr, inicio=0, fin=0):
+        self.tipo = tipo
+        self.nombre = nombre
+        self.expr = expr
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class Assign(Compuesto):
+    __slots__ = ("nombre", "expr")
+    tag, kind, campos = "assign", 4, ("nombre", "expr")
+
+    def __init__(self, nombre, expr, inicio=0, fin=0):
+        self.nombre = nombre
+        self.expr = expr
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class ArrayDecl(Compuesto):
+    __slots__ = ("tipo", "nombre", "size")
+    tag, kind, campos = "array_decl", 5, ("tipo", "nombre", "size")
+
+    def __init__(self, tipo, nombre, size, inicio=0, fin=0):
+        self.tipo = tipo
+        self.nombre = nombre
+        self.size = size
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+# ==========================
+# Estructuras de control
+# ==========================
+
+class If(Compuesto):
+    __slots__ = ("cond", "block")
+    tag, kind, campos = "if", 6, ("cond", "block")
+
+    def __init__(self, cond, block, inicio=0, fin=0):
+        self.cond = cond
+        self.block = block
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class IfElse(Compuesto):
+    __slots__ = ("cond", "then_block", "else_block")
+    tag, kind, campos = "if_else", 7, ("cond", "then_block", "else_block")
+
+    def __init__(self, cond, then_block, else_block, inicio=0, fin=0):
+        self.cond = cond
+        self.then_block = then_block
+        self.else_block = else_block
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class While(Compuesto):
+    __slots__ = ("cond", "block")
+    tag, kind, campos = "while", 8, ("cond", "block")
+
+    def __init__(self, cond, block, inicio=0, fin=0):
+        self.cond = cond
+        self.block = block
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class For(Compuesto):
+    __slots__ = ("init", "cond", "update", "block")
+    tag, kind, campos = "for", 9, ("init", "cond", "update", "block")
+
+    def __init__(self, init, cond, update, block, inicio=0, fin=0):
+        self.init = init
+        self.cond = cond
+        self.update = update
+        self.block = block
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+# ==========================
+# Funciones, procedimientos, clases
+# ==========================
+
+class FunctionDef(Compuesto):
+    __slots__ = ("tipo", "nombre", "params", "block")
+    tag, kind, campos = "function_def", 10, ("tipo", "nombre", "params", "block")
+
+    def __init__(self, tipo, nombre, params, block, inicio=0, fin=0):
+        self.tipo = tipo
+        self.nombre = nombre
+        self.params = params
+        self.block = block
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class Method(Compuesto):
+    __slots__ = ("tipo", "nombre", "params", "block")
+    tag, kind, campos = "method", 11, ("tipo", "nombre", "params", "block")
+
+    def __init__(self, tipo, nombre, params, block, inicio=0, fin=0):
+        self.tipo = tipo
+        self.nombre = nombre
+        self.params = params
+        self.block = block
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class ProcedureDef(Compuesto):
+    __slots__ = ("nombre", "params", "block")
+    tag, kind, campos = "procedure_def", 12, ("nombre", "params", "block")
+
+    def __init__(self, nombre, params, block, inicio=0, fin=0):
+        self.nombre = nombre
+        self.params = params
+        self.block = block
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class Return(Compuesto):
+    __slots__ = ("expr",)
+    tag, kind, campos = "return", 13, ("expr",)
+
+    def __init__(self, expr, inicio=0, fin=0):
+        self.expr = expr
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class Class(Compuesto):
+    __slots__ = ("nombre", "members")
+    tag, kind, campos = "class", 14, ("nombre", "members")
+
+    def __init__(self, nombre, members, inicio=0, fin=0):
+        self.nombre = nombre
+        self.members = members
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+# ==========================
+# Sentencias simples y E/S
+# ==========================
+
+class ExprStmt(Compuesto):
+    __slots__ = ("expr",)
+    tag, kind, campos = "expr_stmt", 15, ("expr",)
+
+    def __init__(self, expr, inicio=0, fin=0):
+        self.expr = expr
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class Print(Compuesto):
+    __slots__ = ("expr",)
+    tag, kind, campos = "print", 16, ("expr",)
+
+    def __init__(self, expr, inicio=0, fin=0):
+        self.expr = expr
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class Input(Compuesto):
+    __slots__ = ("nombre",)
+    tag, kind, campos = "input", 17, ("nombre",)
+
+    def __init__(self, nombre, inicio=0, fin=0):
+        self.nombre = nombre
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+# ==========================
+# Expresiones
+# ==========================
+
+class BinOp(Compuesto):
+    """El operador se guarda dentro de la forma (ver Forma más abajo)."""
+    __slots__ = ("forma", "left", "right")
+    tag, kind, campos = "binop", 18, ("op", "left", "right")
+
+    def __init__(self, op, left, right, inicio=0, fin=0):
+        self.forma = formar_binop(op, forma_de(left), forma_de(right))
+        self.left = left
+        self.right = right
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+    @property
+    def op(self):
+        return self.forma.op
+
+    # Vista como cadena de un solo operador (ver OpChain)
+    @property
+    def ops(self):
+        return (self.forma.op,)
+
+    @property
+    def operands(self):
+        return (self.left, self.right)
+
+
+class OpChain(Compuesto):
+    """
+    Cadena plana de dos o más operadores:
+        operands[0] ops[0] operands[1] ops[1] operands[2] ...
+    Todos los operadores tienen la misma precedencia y asocian a
+    izquierda ('a + b * c' es '(a + b) * c'), así que se evalúa de
+    izquierda a derecha en un solo bucle. Un operando entre
+    paréntesis a la derecha es otra BinOp/OpChain.
+    Una cadena de N operadores es un nodo y dos listas en vez de N
+    BinOp anidados; con menos de MIN_CADENA operadores los BinOp
+    ocupan menos y se siguen usando. `forma` es la del árbol de
+    BinOp equivalente.
+    """
+    __slots__ = ("forma", "ops", "operands")
+    tag, kind, campos = "op_chain", 21, ("ops", "operands")
+
+    def __init__(self, ops, operands, inicio=0, fin=0):
+        self.ops = ops
+        self.operands = operands
+        forma = forma_de(operands[0])
+        for op, operando in zip(ops, operands[1:]):
+            forma = formar_binop(op, forma, forma_de(operando))
+        self.forma = forma
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+    def agregar(self, op, operando):
+        self.ops.append(op)
+        self.operands.append(operando)
+        self.forma = formar_binop(op, self.forma, forma_de(operando))
+
+
+# Operadores desde los que una cadena pasa a ser OpChain: por debajo,
+# los BinOp anidados ocupan menos que un nodo con dos listas
+MIN_CADENA = 4
+
+
+def encadenar(op, left, right, inicio=0, fin=0):
+    """
+    'left op right' para el parser. Si left ya es una cadena se le
+    agrega el operando en su lugar (O(1) amortizado); si es una
+    espina de BinOp que llega a MIN_CADENA operadores se junta en
+    una OpChain. Vale también cuando left venía entre paréntesis: con
+    un solo nivel de precedencia '(a + b) * c' es lo mismo que
+    'a + b * c'.
+    """
+    kind = left.kind if left is not None else None
+    if kind == OpChain.kind:
+        left.agregar(op, right)
+        left.inicio = inicio
+        left.largo = fin - inicio
+        return left
+    if kind == BinOp.kind:
+        # Espina izquierda de BinOp (a lo sumo MIN_CADENA - 1, las más
+        # largas ya son OpChain)
+        espina = [left]
+        while len(espina) < MIN_CADENA - 1:
+            n = espina[-1].left
+            if n is None or n.kind != BinOp.kind:
+                break
+            espina.append(n)
+        if len(espina) == MIN_CADENA - 1:
+            espina.reverse()
+            ops = [b.op for b in espina]
+            ops.append(op)
+            operands = [espina[0].left]
+            operands.extend(b.right for b in espina)
+            operands.append(right)
+            return OpChain(ops, operands, inicio, fin)
+    return BinOp(op, left, right, inicio, fin)
+
+
+class Hoja(Nodo):
+    """Nodo de un solo token: el fin se deduce del lexema y no se guarda."""
+    __slots__ = ()
+
+    @property
+    def fin(self):
+        return self.inicio + len(self.lexema())
+
+
+class Literal(Compuesto):
+    """
+    Constante con su valor ya tipado: int, float (double), bool, None
+    (null) o, para string/char, el lexema con sus comillas. Guarda el
+    largo porque el valor no dice cuánto texto ocupaba ('007', '1.50')
+    y porque un literal plegado (plegado_cs) abarca toda la expresión.
+    """
+    __slots__ = ("valor",)
+    tag, kind, campos = "literal", 19, ("valor",)
+
+    def __init__(self, valor, inicio=0, fin=0):
+        self.valor = valor
+        self.inicio = inicio
+        self.largo = fin - inicio
+
+
+class Var(Hoja):
+    __slots__ = ("nombre",)
+    tag, kind, campos = "var", 20, ("nombre",)
+
+    def __init__(self, nombre, inicio=0):
+        self.nombre = nombre
+        self.inicio = inicio
+
+    def lexema(self):
+        return self.nombre
+
+
+NODOS = [
+    Program, Block, Declaration, DeclarationInit, Assign, ArrayDecl,
+    If, IfElse, While, For, FunctionDef, Method, ProcedureDef, Return,
+    Class, ExprStmt, Print, Input, BinOp, Literal, Var, OpChain,
+]
+POR_TAG = {cls.tag: cls for cls in NODOS}
+
+
+# ==========================
+# Formas de expresión (hash-consing)
+# Dos subexpresiones con la misma estructura (mismo operador, mismas
+# variables y literales) comparten un único objeto Forma, estén donde
+# estén en el fuente. La forma de una OpChain es la del árbol de
+# BinOp equivalente (cada prefijo de la cadena es una forma). Los nodos siguen teniendo su propia posición;
+# lo compartido es la forma, y como las formas hijas son únicas, la
+# clave de una forma es (op, hijo, hijo) con hash O(1) por identidad.
+# El semántico la usa como clave para memorizar tipos.
+# `libres` son las variables de la subexpresión (ordenadas, sin
+# repetir), o None si pasan de MAX_LIBRES: no vale la pena memorizar.
+# La tabla es global (como sys.intern) y se vacía al llegar a
+# MAX_FORMAS: las formas ya creadas siguen siendo válidas, solo dejan
+# de compartirse con las nuevas.
+# ==========================
+
+MAX_LIBRES = 16
+MAX_FORMAS = 1 << 20
+
+
+class Forma:
+    __slots__ = ("op", "left", "right", "libres")
+
+    def __init__(self, op, left, right, libres):
+        self.op = op          # operador, o "var"/"literal" en las hojas
+        self.left = left      # Forma hija, o el nombre/valor en las hojas
+        self.right = right
+        self.libres = libres
+
+    def __repr__(self):
+        if self.op in ("var", "literal"):
+            return f"Forma({self.left!r})"
+        return f"Forma({self.left!r} {self.op} {self.right!r})"
+
+
+_FORMAS = {}
+
+
+def _registrar_forma(clave, forma):
+    if len(_FORMAS) >= MAX_FORMAS:
+        _FORMAS.clear()
+    _FORMAS[clave] = forma
+    return forma
+
+
+def _unir_libres(a, b):
+    if a is None or b is None:
+        return None
+    if not b or a == b:
+        return a
+    if not a:
+        return b
+    libres = tuple(sorted(set(a).union(b)))
+    return libres if len(libres) <= MAX_LIBRES else None
+
+
+def formar_binop(op, left, right):
+    clave = (op, left, right)
+    forma = _FORMAS.get(clave)
+    if forma is None:
+        libres = None
+        if left is not None and right is not None:
+            libres = _unir_libres(left.libres, right.libres)
+        forma = _registrar_forma(clave, Forma(op, left, right, libres))
+    return forma
+
+
+def forma_de(nodo):
+    """Forma compartida de una expresión (None si no es una expresión)."""
+    if nodo is None:
+        return None
+    kind = nodo.kind
+    if kind == BinOp.kind or kind == OpChain.kind:
+        return nodo.forma
+    if kind == Var.kind:
+        clave = ("var", nodo.nombre)
+        libres = (nodo.nombre,)
+    elif kind == Literal.kind:
+        # El tipo de Python es parte de la clave: 1 y True son iguales como claves
+        clave = ("literal", type(nodo.valor), nodo.valor)
+        libres = ()
+    else:
+        return None
+    forma = _FORMAS.get(clave)
+    if forma is None:
+        forma = _registrar_forma(clave, Forma(clave[0], clave[-1], None, libres))
+    return forma
+
+
+# ==========================
+# Strings compartidos
+# Tipos, operadores y nombres se guardan una sola vez aunque el
+# lexer cree un string nuevo por token. Los nombres y los tipos ya
+# llegan compartidos del lexer (lexer_cs.nombre, internados); el
+# parser usa compartir para operadores y literales string, y
+# desde_dict para todo lo que lee de JSON.
+# ==========================
+
+def compartir(texto):
+    return sys.intern(texto) if type(texto) is str else texto
+
+
+# ==========================
+# Conversión al formato de tuplas
+# ==========================
+
+def a_tupla(nodo):
+    """Convierte un nodo (o lista de nodos) al AST de tuplas anterior."""
+    if isinstance(nodo, OpChain):
+        # Las cadenas vuelven a ser binops anidados a izquierda
+        operands = nodo.operands
+        tupla = a_tupla(operands[0])
+        for op, operando in zip(nodo.ops, operands[1:]):
+            tupla = ("binop", op, tupla, a_tupla(operando))
+        return tupla
+    if isinstance(nodo, Nodo):
+        return (nodo.tag,) + tuple(a_tupla(getattr(nodo, c)) for c in nodo.campos)
+    if isinstance(nodo, list):
+        return [a_tupla(n) for n in nodo]
+    return nodo
+
+
+# ==========================
+# Conversión a dicts (JSON) y de vuelta
+# Cada nodo es {"tag", "inicio", "fin", <campos>}; las tuplas
+# (parámetros) quedan como listas de JSON.
+# ==========================
+
+def a_dict(nodo):
+    if isinstance(nodo, Nodo):
+        d = {"tag": nodo.tag, "inicio": nodo.inicio, "fin": nodo.fin}
+        for c in nodo.campos:
+            d[c] = a_dict(getattr(nodo, c))
+        return d
+    if isinstance(nodo, (list, tuple)):
+        return [a_dict(n) for n in nodo]
+    return nodo
+
+
+def desde_dict(d):
+    """Inversa de a_dict: reconstruye los nodos a partir de dicts/listas de JSON."""
+    if isinstance(d, dict):
+        cls = POR_TAG[d["tag"]]
+        valores = [desde_dict(d[c]) for c in cls.campos]
+        if issubclass(cls, Hoja):
+            return cls(compartir(valores[0]), d["inicio"])
+        return cls(*valores, inicio=d["inicio"], fin=d["fin"])
+    if isinstance(d, list):
+        # Una lista dentro de una lista es una tupla (tipo, nombre) de parámetros
+        return [tuple(map(compartir, x)) if isinstance(x, list) else desde_dict(x) for x in d]
+    return compartir(d)
+
+
+# ==========================
+# Formato plano (caché en disco, ver cache_cs)
+# El árbol se escribe en postorden como una lista sin anidar: los
+# valores sueltos (strings, números, bool, None) van tal cual y cada
+# nodo, lista o tupla de parámetros es una tupla que cierra a sus
+# hijos, que ya están antes en la lista:
+#   (kind, inicio, largo)    nodo compuesto (len(campos) hijos)
+#   (kind, inicio)           hoja
+#   (_LISTA, n) (_TUPLA, n)  lista / tupla de n elementos
+# Ninguna de las dos funciones es recursiva (miles de paréntesis
+# anidados no llegan al límite de recursión) y marshal guarda la
+# lista sin anidar. desde_plano arma los nodos con sus constructores,
+# así las formas se comparten con las del proceso que lo carga.
+# ==========================
+
+_LISTA, _TUPLA = -1, -2
+_CERRAR = object()
+POR_KIND = {cls.kind: cls for cls in NODOS}
+# clase -> (campos, es hoja)
+_PLANO = {cls: (cls.campos, issubclass(cls, Hoja)) for cls in NODOS}
+
+
+def a_plano(nodo):
+    """Lista plana en postorden de un nodo (o lista de nodos)."""
+    plano = []
+    emitir = plano.append
+    pendientes = [nodo]
+    apilar = pendientes.append
+    sacar = pendientes.pop
+    extender = pendientes.extend
+    datos_de = _PLANO.get
+    while pendientes:
+        x = sacar()
+        if x is _CERRAR:
+            emitir(sacar())
+            continue
+        t = type(x)
+        datos = datos_de(t)
+        if datos is not None:
+            campos, hoja = datos
+            if hoja:
+                # Una hoja tiene un solo campo, escalar
+                emitir(getattr(x, campos[0]))
+                emitir((x.kind, x.inicio))
+                continue
+            apilar((x.kind, x.inicio, x.largo))
+            apilar(_CERRAR)
+            if len(campos) == 1:
+                apilar(getattr(x, campos[0]))
+            else:
+                extender([getattr(x, c) for c in reversed(campos)])
+        elif t is list or t is tuple:
+            apilar((_LISTA if t is list else _TUPLA, len(x)))
+            apilar(_CERRAR)
+            extender(reversed(x))
+        else:
+            emitir(x)
+    return plano
+
+
+def desde_plano(plano):
+    """Inversa de a_plano."""
+    valores = []
+    apilar = valores.append
+    sacar = valores.pop
+    por_kind = POR_KIND
+    for x in plano:
+        if type(x) is not tuple:
+            apilar(x)
+            continue
+        codigo = x[0]
+        if codigo < 0:
+            n = x[1]
+            if n:
+                hijos = valores[-n:]
+                del valores[-n:]
+            else:
+                hijos = []
+            apilar(hijos if codigo == _LISTA else tuple(hijos))
+            continue
+        cls = por_kind[codigo]
+        inicio = x[1]
+        n = len(cls.campos)
+        if len(x) == 2:
+            apilar(cls(sacar(), inicio))
+        elif n == 1:
+            apilar(cls(sacar(), inicio, inicio + x[2]))
+        else:
+            hijos = valores[-n:]
+            del valores[-n:]
+            apilar(cls(*hijos, inicio, inicio + x[2]))
+    return valores[0]
@@ -0,0 +1,332 @@
+###############################################################
+# ANÁLISIS POR LOTES (BATCH) DE ARCHIVOS C#
+# Recibe directorios, globs o archivos .cs y los reparte en un
+# pool de procesos. Cada proceso crea una SesionAnalisis una sola
+# vez y la reutiliza para todos los archivos que le toquen.
+#
+# Uso:
+#   python batch_cs.py <dir|glob|archivo.cs> [...] [-j N] [--timeout S] [--semantico]
+#          [--log-errores logs/errores.jsonl] [--formato-log jsonl|texto]
+#          [--max-errores-archivo N] [--log-max-mb MB]
+#          [--cache [DIR]] [--cache-max-mb MB]
+#
+# Con --cache los archivos que no cambiaron desde la corrida anterior
+# no se vuelven a tokenizar ni a parsear (cache_cs); al final se
+# informan los aciertos y fallos de la caché.
+###############################################################
+
+import argparse
+import contextlib
+import glob
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+###############################################################
+# EXPANSIÓN DE ENTRADAS
+###############################################################
+
+def expandir_entradas(entradas):
+    """Convierte directorios/globs/archivos en una lista ordenada de .cs sin duplicados."""
+    archivos = []
+    vistos = set()
+
+    def agregar(path):
+        path = os.path.normpath(path)
+        if path not in vistos:
+            vistos.add(path)
+            archivos.append(path)
+
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            for raiz, dirs, nombres in os.walk(entrada):
+                dirs.sort()
+                for nombre in sorted(nombres):
+                    if nombre.endswith(".cs"):
+                        agregar(os.path.join(raiz, nombre))
+        elif glob.has_magic(entrada):
+            for path in sorted(glob.glob(entrada, recursive=True)):
+                if os.path.isfile(path):
+                    agregar(path)
+        else:
+            agregar(entrada)
+    return archivos
+
+
+###############################################################
+# TRABAJO POR ARCHIVO (se ejecuta dentro de cada worker)
+###############################################################
+
+class TiempoAgotado(Exception):
+    pass
+
+
+def _alarma(signum, frame):
+    raise TiempoAgotado()
+
+
+@contextlib.contextmanager
+def _limite_tiempo(segundos):
+    """Corta el análisis de un archivo con SIGALRM (solo Unix y en el hilo principal)."""
+    if not segundos or not hasattr(signal, "setitimer"):
+        yield
+        return
+    anterior = signal.signal(signal.SIGALRM, _alarma)
+    signal.setitimer(signal.ITIMER_REAL, segundos)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, anterior)
+
+
+# Sesión del worker: se crea una vez por proceso y se reutiliza
+_sesion = None
+
+# Cola del escritor de errores (registro_cs) y tope de errores por
+# archivo: los fija _iniciar_worker en cada proceso
+_cola_errores = None
+_max_por_archivo = None
+
+# Caché de tokens y AST del worker (cache_cs), o None
+_cache = None
+
+
+def _iniciar_worker(cola, max_por_archivo, cache=None):
+    """cache es (directorio, max_bytes) o None; None en cada parte = el valor por defecto."""
+    global _cola_errores, _max_por_archivo, _cache
+    _cola_errores = cola
+    _max_por_archivo = max_por_archivo
+    _cache = None
+    if cache is not None:
+        import cache_cs
+        directorio, max_bytes = cache
+        _cache = cache_cs.CacheAnalisis(directorio, max_bytes or cache_cs.MAX_BYTES)
+
+
+def analizar_archivo(file_path, timeout=None, semantico=False):
+    """
+    Lexer + parser (+ semántico opcional) de un archivo.
+    Devuelve un dict con el resultado; nunca lanza excepción.
+    """
+    global _sesion
+    if _sesion is None:
+        # Import diferido: en el worker solo se construyen las tablas una vez
+        from sesion_cs import SesionAnalisis
+        _sesion = SesionAnalisis()
+    _sesion.cache = _cache
+
+    resultado = {
+        "archivo": file_path,
+        "estado": "ok",
+        "bytes": 0,
+        "lineas": 0,
+        "errores_lexicos": 0,
+        "errores_sintacticos": 0,
+        "errores_semanticos": 0,
+        "mensajes": [],
+        "segundos": 0.0,
+        "desde_cache": None,
+    }
+    inicio = time.perf_counter()
+    try:
+        with open(file_path, 'r') as f:
+            data = f.read()
+        resultado["bytes"] = len(data)
+        resultado["lineas"] = data.count('\n') + 1
+
+        reportero = None
+        if semantico and _cola_errores is not None:
+            import registro_cs
+            reportero = registro_cs.Reportero(_cola_errores, file_path, data, _max_por_archivo)
+        with _limite_tiempo(timeout):
+            analisis = _sesion.analizar(data, semantico=semantico, reportar=reportero)
+        resultado["desde_cache"] = analisis["desde_cache"]
+        resultado["errores_lexicos"] = len(analisis["errores_lexicos"])
+        resultado["errores_sintacticos"] = len(analisis["errores_sintacticos"])
+        resultado["errores_semanticos"] = len(analisis["errores_semanticos"])
+        resultado["mensajes"].extend(analisis["errores_lexicos"])
+        resultado["mensajes"].extend(analisis["errores_sintacticos"])
+        if reportero is not None:
+            # Los semánticos ya están en el log: no viajan en el resultado
+            reportero.terminar()
+        else:
+            resultado["mensajes"].extend(f"ERROR SEMÁNTICO: {e}" for e in analisis["errores_semanticos"])
+    except FileNotFoundError:
+        resultado["estado"] = "no_encontrado"
+    except TiempoAgotado:
+        resultado["estado"] = "timeout"
+    except Exception as e:
+        resultado["estado"] = "error"
+        resultado["mensajes"].append(f"Error durante el análisis: {str(e)}")
+
+    resultado["segundos"] = time.perf_counter() - inicio
+    return resultado
+
+
+def _tarea(args):
+    return analizar_archivo(*args)
+
+
+###############################################################
+# REPORTE
+###############################################################
+
+def formatear_resultado(r):
+    return "{:<14} {:<50} léx={:<4} sint={:<4} sem={:<4} {:>8.3f}s".format(
+        r["estado"].upper(),
+        r["archivo"],
+        r["errores_lexicos"],
+        r["errores_sintacticos"],
+        r["errores_semanticos"],
+        r["segundos"],
+    )
+
+
+def tiene_errores(r):
+    return (
+        r["estado"] != "ok"
+        or r["errores_lexicos"]
+        or r["errores_sintacticos"]
+        or r["errores_semanticos"]
+    )
+
+
+def ejecutar_batch(archivos, workers=None, timeout=None, semantico=False, verbose=False, out=sys.stdout,
+                   log_errores=None, formato_log="jsonl", max_por_archivo=None, log_max_bytes=None,
+                   cache=None):
+    """
+    Analiza los archivos en paralelo y escribe el reporte; devuelve la lista de resultados.
+    Con log_errores (y semantico) los errores semánticos van en streaming
+    a ese log (registro_cs) en vez de quedar en cada resultado.
+    cache es (directorio, max_bytes) para usar la caché de cache_cs
+    (None en cada parte = el valor por defecto).
+    """
+    tareas = [(path, timeout, semantico) for path in archivos]
+    workers = workers or os.cpu_count() or 1
+    inicio = time.perf_counter()
+    resultados = []
+
+    escritor = None
+    if log_errores and semantico:
+        import registro_cs
+        if workers == 1:
+            cola = None   # el escritor crea una queue.Queue
+        else:
+            import multiprocessing
+            cola = multiprocessing.Queue(registro_cs.TAM_COLA)
+        escritor = registro_cs.EscritorErrores(
+            log_errores, formato_log, cola=cola,
+            max_bytes=registro_cs.MAX_BYTES if log_max_bytes is None else log_max_bytes,
+        ).iniciar()
+
+    cola_errores = escritor.cola if escritor else None
+    if workers == 1:
+        _iniciar_worker(cola_errores, max_por_archivo, cache)
+        iterador = map(_tarea, tareas)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_iniciar_worker, initargs=(cola_errores, max_por_archivo, cache),
+        )
+        chunksize = max(1, min(32, len(tareas) // (workers * 4)))
+        iterador = executor.map(_tarea, tareas, chunksize=chunksize)
+
+    try:
+        for r in iterador:
+            resultados.append(r)
+            out.write(formatear_resultado(r) + "\n")
+            if verbose:
+                for m in r["mensajes"]:
+                    out.write(f"    {m}\n")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if escritor is not None:
+            # Los workers ya terminaron: todo lo que mandaron está en la cola
+            escritor.cerrar()
+        _iniciar_worker(None, None)
+
+    total = time.perf_counter() - inicio
+    total_bytes = sum(r["bytes"] for r in resultados)
+    total_lineas = sum(r["lineas"] for r in resultados)
+    con_errores = sum(1 for r in resultados if tiene_errores(r))
+    timeouts = sum(1 for r in resultados if r["estado"] == "timeout")
+
+    out.write("-" * 100 + "\n")
+    out.write(
+        f"{len(resultados)} archivos ({con_errores} con errores, {timeouts} timeouts) "
+        f"en {total:.3f}s con {workers} workers\n"
+    )
+    if total > 0:
+        out.write(
+            f"Throughput: {len(resultados) / total:.1f} archivos/s, "
+            f"{total_lineas / total:.0f} líneas/s, "
+            f"{total_bytes / 1024 / total:.1f} KB/s\n"
+        )
+    if cache is not None:
+        # Cada worker tiene su CacheAnalisis: se cuenta desde los resultados
+        aciertos = sum(1 for r in resultados if r["desde_cache"] is True)
+        fallos = sum(1 for r in resultados if r["desde_cache"] is False)
+        consultas = aciertos + fallos
+        tasa = f" ({aciertos / consultas:.1%} aciertos)" if consultas else ""
+        out.write(f"Caché: {aciertos} aciertos, {fallos} fallos{tasa}\n")
+    return resultados
+
+
+###############################################################
+# MAIN - EJECUCIÓN
+###############################################################
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Análisis léxico/sintáctico por lotes de archivos C#.")
+    ap.add_argument("entradas", nargs="+", help="directorios, globs o archivos .cs")
+    ap.add_argument("-j", "--workers", type=int, default=None,
+                    help="número de procesos (por defecto: número de CPUs)")
+    ap.add_argument("--timeout", type=float, default=None,
+                    help="segundos máximos por archivo")
+    ap.add_argument("--semantico", action="store_true",
+                    help="ejecutar también el análisis semántico")
+    ap.add_argument("-v", "--verbose", action="store_true",
+                    help="mostrar los mensajes de error de cada archivo")
+    ap.add_argument("--log-errores", default=None,
+                    help="log único de errores semánticos en streaming (con --semantico)")
+    ap.add_argument("--formato-log", choices=("jsonl", "texto"), default="jsonl")
+    ap.add_argument("--max-errores-archivo", type=int, default=None,
+                    help="máximo de errores semánticos por archivo en el log")
+    ap.add_argument("--log-max-mb", type=float, default=None,
+                    help="tamaño a partir del cual se rota el log (por defecto 16)")
+    ap.add_argument("--cache", nargs="?", const="", default=None, metavar="DIR",
+                    help="usar la caché de tokens y AST (cache_cs) en DIR o en el directorio por defecto")
+    ap.add_argument("--cache-max-mb", type=float, default=None,
+                    help="tamaño máximo de la caché (por defecto 256)")
+    args = ap.parse_args(argv)
+
+    archivos = expandir_entradas(args.entradas)
+    if not archivos:
+        sys.stderr.write("Error: no se encontraron archivos .cs\n")
+        return 1
+
+    resultados = ejecutar_batch(
+        archivos,
+        workers=args.workers,
+        timeout=args.timeout,
+        semantico=args.semantico,
+        verbose=args.verbose,
+        log_errores=args.log_errores,
+        formato_log=args.formato_log,
+        max_por_archivo=args.max_errores_archivo,
+        log_max_bytes=None if args.log_max_mb is None else int(args.log_max_mb * 1024 * 1024),
+        cache=None if args.cache is None else (
+            args.cache or None,
+            None if args.cache_max_mb is None else int(args.cache_max_mb * 1024 * 1024),
+        ),
+    )
+    return 1 if any(tiene_errores(r) for r in resultados) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
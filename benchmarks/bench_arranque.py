@@ -0,0 +1,74 @@
+###############################################################
+# BENCHMARK: tiempo de arranque (import + construcción de tablas)
+# Compara, lanzando un intérprete nuevo por medición:
+#   - sin caché     (LP_CS_SIN_CACHE=1: tablas LALR en cada arranque)
+#   - caché fría    (directorio de caché vacío: genera y guarda)
+#   - caché caliente (tablas ya guardadas: solo se cargan)
+#   - import perezoso (import parser_cs sin construir nada)
+#
+# Uso:
+#   python benchmarks/bench_arranque.py [repeticiones]
+###############################################################
+
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONSTRUIR = "import parser_cs; parser_cs.get_parser(); parser_cs.lexer_cs.get_lexer()"
+SOLO_IMPORT = "import parser_cs"
+
+
+def medir(codigo, env, repeticiones, preparar=None):
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", codigo],
+            cwd=RAIZ, env=env, check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    cache = tempfile.mkdtemp(prefix="lp_cs_cache_")
+    base = dict(os.environ, LP_CS_CACHE=cache)
+    base.pop("LP_CS_SIN_CACHE", None)
+
+    def vaciar_cache():
+        shutil.rmtree(cache, ignore_errors=True)
+
+    try:
+        # línea base: el intérprete sin nada
+        vacio = medir("pass", base, repeticiones)
+        casos = [
+            ("sin caché", medir(CONSTRUIR, dict(base, LP_CS_SIN_CACHE="1"), repeticiones)),
+            ("caché fría", medir(CONSTRUIR, base, repeticiones, preparar=vaciar_cache)),
+            ("caché caliente", medir(CONSTRUIR, base, repeticiones)),
+            ("import perezoso", medir(SOLO_IMPORT, base, repeticiones)),
+        ]
+    finally:
+        vaciar_cache()
+
+    print(f"--- Arranque ({repeticiones} repeticiones, mediana) ---")
+    print("{:<20} {:>12} {:>16}".format("Modo", "Total (ms)", "Sobre python (ms)"))
+    print("-" * 50)
+    base_ms = statistics.median(vacio) * 1000
+    print("{:<20} {:>12.1f} {:>16}".format("python vacío", base_ms, "-"))
+    for nombre, tiempos in casos:
+        ms = statistics.median(tiempos) * 1000
+        print("{:<20} {:>12.1f} {:>16.1f}".format(nombre, ms, ms - base_ms))
+
+
+if __name__ == '__main__':
+    main()
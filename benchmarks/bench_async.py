@@ -0,0 +1,88 @@
+###############################################################
+# BENCHMARK: API asíncrona (asincrono_cs)
+# Analiza N programas de generador_cs.py desde un loop asyncio y
+# mide el tiempo total y la peor latencia del loop (un tic que
+# duerme 1 ms y anota cuánto tardó en volver) en tres modos:
+#   - bloqueante: SesionAnalisis.analizar llamado dentro del loop
+#   - hilos:      AnalizadorAsync(workers)
+#   - procesos:   AnalizadorAsync(workers, procesos=True)
+#
+# Uso:
+#   python benchmarks/bench_async.py [-n 16] [--sentencias 600] [-j 4]
+###############################################################
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import asincrono_cs
+import generador_cs
+from sesion_cs import SesionAnalisis
+
+
+async def con_tic(trabajo):
+    """(segundos de trabajo(), peor latencia del loop en segundos)."""
+    peor = 0.0
+    seguir = True
+
+    async def tic():
+        nonlocal peor
+        while seguir:
+            inicio = time.perf_counter()
+            await asyncio.sleep(0.001)
+            peor = max(peor, time.perf_counter() - inicio - 0.001)
+
+    tarea = asyncio.create_task(tic())
+    await asyncio.sleep(0)
+    inicio = time.perf_counter()
+    await trabajo()
+    total = time.perf_counter() - inicio
+    seguir = False
+    await tarea
+    return total, peor
+
+
+async def medir(programas, workers):
+    sesion = SesionAnalisis()
+
+    async def bloqueante():
+        for data in programas:
+            sesion.analizar(data)
+            await asyncio.sleep(0)
+
+    filas = [("bloqueante", await con_tic(bloqueante))]
+    for nombre, procesos in (("hilos", False), ("procesos", True)):
+        async with asincrono_cs.AnalizadorAsync(workers, procesos=procesos) as analizador:
+            await analizador.analizar("int x = 1;\n")    # pool ya creado y caliente
+
+            async def en_pool():
+                resultados = await asyncio.gather(*(analizador.analizar(d) for d in programas))
+                if any(r["estado"] != "ok" for r in resultados):
+                    raise AssertionError("un análisis no terminó bien")
+
+            filas.append((nombre, await con_tic(en_pool)))
+    return filas
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark de la API asíncrona.")
+    ap.add_argument("-n", type=int, default=16, help="cantidad de programas")
+    ap.add_argument("--sentencias", type=int, default=600)
+    ap.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args(argv)
+
+    programas = [generador_cs.generar(args.sentencias, k) for k in range(args.n)]
+    print(f"{args.n} programas de {args.sentencias} sentencias, {args.workers} workers")
+    print(f"{'modo':<12} {'total':>9} {'peor latencia del loop':>24}")
+    for nombre, (total, peor) in asyncio.run(medir(programas, args.workers)):
+        print(f"{nombre:<12} {total:>8.2f}s {peor * 1000:>21.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+###############################################################
+# BENCHMARK: buffer columnar de tokens (buffer_cs)
+# Para programas de generador_cs.py compara, con el mejor de varias
+# repeticiones:
+#   - tokens:  todos los tokens como objetos (LexerRapido, lo que
+#              guardaba antes el modo estadísticas) frente a
+#              tokenizar a columnas; tiempo y memoria (tracemalloc)
+#   - parse:   SesionAnalisis frente a SesionAnalisis(buffer=True)
+#   - bin:     volcado binario desde tokens frente a desde el buffer
+# Ambos lados usan el backend rápido (LP_CS_LEXER=rapido), así la
+# diferencia es solo la del buffer. Comprueba que el AST es el mismo.
+#
+# Uso:
+#   python benchmarks/bench_buffer.py [N ...]
+###############################################################
+
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ["LP_CS_LEXER"] = "rapido"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ast_cs
+import buffer_cs
+import generador_cs
+import lexer_cs
+import salida_cs
+from sesion_cs import SesionAnalisis
+
+TAMANOS = [500, 2000, 6000]
+REPETICIONES = 5
+
+
+def mejor(funcion, repeticiones=REPETICIONES):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def memoria(funcion):
+    """Bytes que sigue ocupando lo que devuelve funcion()."""
+    tracemalloc.start()
+    resultado = funcion()
+    usado = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del resultado
+    return usado
+
+
+def medir(sentencias):
+    data = generador_cs.generar(sentencias, sentencias)
+    lexer = lexer_cs.build_lexer_rapido()
+
+    def objetos():
+        return list(lexer_cs.iter_tokens(lexer, data))
+
+    def columnas():
+        return buffer_cs.tokenizar(data, lexer)
+
+    normal, con_buffer = SesionAnalisis(), SesionAnalisis(buffer=True)
+    if ast_cs.a_dict(normal.parse(data)) != ast_cs.a_dict(con_buffer.parse(data)):
+        raise AssertionError("el AST con buffer no coincide")
+
+    toks, buf = objetos(), columnas()
+
+    def bin_tokens():
+        salida_cs.escribir_tokens_bin(io.BytesIO(), toks, lexer_cs.tokens)
+
+    def bin_buffer():
+        salida_cs.escribir_buffer(io.BytesIO(), buf, "bin", lexer_cs.tokens)
+
+    return {
+        "tokens": len(buf),
+        "tokens ms": (mejor(objetos), mejor(columnas)),
+        "tokens MB": (memoria(objetos) / 2 ** 20, memoria(columnas) / 2 ** 20),
+        "parse ms": (mejor(lambda: normal.parse(data)), mejor(lambda: con_buffer.parse(data))),
+        "bin ms": (mejor(bin_tokens), mejor(bin_buffer)),
+    }
+
+
+def main(argv=None):
+    tamanos = [int(n) for n in (argv if argv is not None else sys.argv[1:])] or TAMANOS
+    print(f"{'sentencias':>10} {'tokens':>8}  {'medida':<10} {'objetos':>9} {'buffer':>9} {'razón':>6}")
+    for n in tamanos:
+        r = medir(n)
+        for medida in ("tokens ms", "tokens MB", "parse ms", "bin ms"):
+            antes, despues = r[medida]
+            escala = 1000 if medida.endswith("ms") else 1
+            print(f"{n:>10} {r['tokens']:>8}  {medida:<10} {antes * escala:>9.1f} "
+                  f"{despues * escala:>9.1f} {antes / despues:>5.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+###############################################################
+# BENCHMARK: caché en disco de tokens y AST (cache_cs)
+# Para programas de generador_cs.py de distintos tamaños mide, con
+# el mejor de varias repeticiones:
+#   - parse:   SesionAnalisis sin caché
+#   - fallo:   parse + guardar la entrada (primera corrida)
+#   - acierto: buscar la entrada y armar el AST
+# y el tamaño de la entrada frente al fuente. Comprueba además que
+# el AST y los errores que salen de la caché son los mismos que los
+# de parsear.
+#
+# Uso:
+#   python benchmarks/bench_cache.py [--sin-tokens] [N ...]
+###############################################################
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ast_cs
+import cache_cs
+import generador_cs
+from sesion_cs import SesionAnalisis
+
+TAMANOS = [200, 2000, 6000]
+REPETICIONES = 3
+
+
+def mejor(funcion, repeticiones=REPETICIONES):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def medir(sentencias, directorio, tokens):
+    data = generador_cs.generar(sentencias, sentencias)
+    sin_cache = SesionAnalisis()
+    con_cache = SesionAnalisis(cache_cs.CacheAnalisis(directorio, tokens=tokens))
+
+    t_parse = mejor(lambda: sin_cache.parse(data))
+
+    def fallo():
+        con_cache.cache.limpiar()
+        con_cache.parse(data)
+    t_fallo = mejor(fallo)
+
+    t_acierto = mejor(lambda: con_cache.parse(data))
+    if not con_cache.desde_cache:
+        raise AssertionError("la entrada no se encontró en la caché")
+
+    referencia = sin_cache.parse(data)
+    errores = (sin_cache.lexer.errores, sin_cache.errores_sintacticos)
+    cacheado = con_cache.parse(data)
+    if (ast_cs.a_dict(cacheado) != ast_cs.a_dict(referencia)
+            or (con_cache.lexer.errores, con_cache.errores_sintacticos) != errores):
+        raise AssertionError("el resultado de la caché no coincide con el del parser")
+
+    entrada = os.path.getsize(con_cache.cache._path(con_cache.cache.clave(data)))
+    return len(data), entrada, t_parse, t_fallo, t_acierto
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark de la caché de tokens y AST.")
+    ap.add_argument("tamanos", nargs="*", type=int, default=TAMANOS, help="sentencias por programa")
+    ap.add_argument("--sin-tokens", action="store_true", help="guardar solo el AST")
+    args = ap.parse_args(argv)
+
+    directorio = tempfile.mkdtemp(prefix="bench_cache_")
+    try:
+        print(f"{'sentencias':>10} {'KB':>7} {'entrada KB':>10} {'parse':>9} {'fallo':>9} "
+              f"{'acierto':>9} {'aceleración':>11}")
+        for n in args.tamanos:
+            bytes_fuente, bytes_entrada, t_parse, t_fallo, t_acierto = medir(n, directorio, not args.sin_tokens)
+            print(f"{n:>10} {bytes_fuente / 1024:>7.0f} {bytes_entrada / 1024:>10.0f} "
+                  f"{t_parse * 1000:>7.1f}ms {t_fallo * 1000:>7.1f}ms {t_acierto * 1000:>7.1f}ms "
+                  f"{t_parse / t_acierto:>10.1f}x")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
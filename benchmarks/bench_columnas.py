@@ -0,0 +1,75 @@
+###############################################################
+# BENCHMARK: cálculo de columnas en archivos de una sola línea
+# Compara el método anterior (rfind del '\n' previo por token)
+# contra el índice de inicios de línea de lexer_cs (iter_tokens).
+# El método anterior solo se mide en tamaños pequeños porque es
+# cuadrático; el índice debería escalar linealmente (µs/token
+# aproximadamente constante al crecer el archivo).
+#
+# Uso:
+#   python benchmarks/bench_columnas.py [MB_maximo]
+###############################################################
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lexer_cs
+
+FRAGMENTO = "int total = saldo + 42; /* c */ bool ok = a == b; "
+
+
+def columna_rfind(input_text, token):
+    """Versión original de find_column (búsqueda hacia atrás por token)."""
+    line_start = input_text.rfind('\n', 0, token.lexpos) + 1
+    return (token.lexpos - line_start) + 1
+
+
+def generar(n_bytes):
+    return (FRAGMENTO * (n_bytes // len(FRAGMENTO) + 1))[:n_bytes].rsplit(" ", 1)[0]
+
+
+def medir_rfind(lexer, data):
+    inicio = time.perf_counter()
+    lexer.input(data)
+    n = 0
+    for tok in lexer:
+        columna_rfind(data, tok)
+        n += 1
+    return n, time.perf_counter() - inicio
+
+
+def medir_indice(lexer, data):
+    inicio = time.perf_counter()
+    n = 0
+    for tok in lexer_cs.iter_tokens(lexer, data):
+        tok.column
+        n += 1
+    return n, time.perf_counter() - inicio
+
+
+def main():
+    mb_max = float(sys.argv[1]) if len(sys.argv) > 1 else 8
+    lexer = lexer_cs.get_lexer()
+
+    print("--- Columnas en una sola línea ---")
+    print("{:<12} {:<10} {:>10} {:>12} {:>14}".format("Tamaño", "Método", "Tokens", "Segundos", "µs/token"))
+    print("-" * 62)
+
+    tam = 64 * 1024
+    while tam <= mb_max * 1024 * 1024:
+        data = generar(int(tam))
+        metodos = [("índice", medir_indice)]
+        if tam <= 512 * 1024:
+            metodos.insert(0, ("rfind", medir_rfind))
+        for nombre, medir in metodos:
+            n, seg = medir(lexer, data)
+            print("{:<12} {:<10} {:>10} {:>12.3f} {:>14.2f}".format(
+                f"{tam / 1024 / 1024:.2f} MB", nombre, n, seg, seg / n * 1e6))
+        tam *= 2
+
+
+if __name__ == '__main__':
+    main()
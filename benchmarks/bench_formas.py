@@ -0,0 +1,107 @@
+###############################################################
+# BENCHMARK: formas compartidas (hash-consing) y memo de tipos
+# Genera un programa con subexpresiones repetidas entre métodos
+# (como el código generado que se analiza) y mide:
+#   - pase semántico con memo de tipos por forma vs sin memo
+#   - tasa de aciertos del memo
+#   - binops del AST vs formas distintas y la memoria que ocupan
+#     compartidas frente a una forma por nodo
+#
+# Uso:
+#   python benchmarks/bench_formas.py [metodos]
+###############################################################
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ast_cs
+import semantico_comun
+from sesion_cs import SesionAnalisis
+
+METODO = """    double Mover{i}(double saldo, double monto, double tasa, int dias) {{
+        saldo = saldo + monto * tasa - monto / dias;
+        double interes = (saldo + monto) * tasa * dias - (saldo + monto) / dias;
+        if ((saldo + monto) * tasa > monto * tasa + saldo) {{
+            saldo = saldo + monto * tasa - monto / dias;
+        }}
+        return (saldo + monto) * tasa * dias - (saldo + monto) / dias + interes;
+    }}
+"""
+
+
+def programa(metodos, por_clase=20):
+    partes = []
+    for i in range(metodos):
+        if i % por_clase == 0:
+            if i:
+                partes.append("}\n")
+            partes.append(f"class Cuenta{i // por_clase} {{\n")
+        partes.append(METODO.format(i=i))
+    partes.append("}\n")
+    return "".join(partes)
+
+
+class SinMemo(semantico_comun.ContextoSemantico):
+    """El mismo pase semántico sin consultar ni guardar el memo."""
+
+    def _tipo_memorizado(self, forma):
+        return None
+
+    def _memorizar(self, forma, tipo, inicio_errores):
+        pass
+
+
+def binops_y_formas(ast):
+    """Operadores del AST (uno por binop del árbol equivalente) y formas distintas de las cadenas."""
+    binops = 0
+    formas = set()
+    pendientes = [ast]
+    while pendientes:
+        n = pendientes.pop()
+        if isinstance(n, (ast_cs.BinOp, ast_cs.OpChain)):
+            binops += len(n.ops)
+            formas.add(id(n.forma))
+        if isinstance(n, ast_cs.Nodo):
+            pendientes.extend(getattr(n, c) for c in n.campos)
+        elif isinstance(n, list):
+            pendientes.extend(n)
+    return binops, len(formas)
+
+
+def medir(cls, ast, repeticiones=5):
+    mejor = None
+    for _ in range(repeticiones):
+        contexto = cls()
+        inicio = time.perf_counter()
+        errores = contexto.analizar_programa(ast)
+        t = time.perf_counter() - inicio
+        mejor = t if mejor is None else min(mejor, t)
+    return mejor, contexto, errores
+
+
+def main():
+    metodos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    ast = SesionAnalisis().parse(programa(metodos))
+
+    t_memo, ctx, errores_memo = medir(semantico_comun.ContextoSemantico, ast)
+    t_sin, _, errores_sin = medir(SinMemo, ast)
+    assert errores_memo == errores_sin, "el memo cambió los errores"
+
+    print(f"{metodos} métodos, {len(errores_memo)} errores semánticos")
+    print(f"Semántico sin memo:  {t_sin * 1000:9.1f} ms")
+    print(f"Semántico con memo:  {t_memo * 1000:9.1f} ms")
+    tasa = ctx.memo_aciertos / ctx.memo_consultas if ctx.memo_consultas else 0.0
+    print(f"Memo: {ctx.memo_aciertos}/{ctx.memo_consultas} aciertos ({tasa:.1%})")
+
+    binops, formas = binops_y_formas(ast)
+    tam = sys.getsizeof(ast_cs.Forma("+", None, None, ()))
+    print(f"Operadores en el AST: {binops}, formas distintas de cadenas: {formas}")
+    print(f"Formas compartidas: {formas * tam / 1024:8.1f} KB "
+          f"(una por nodo: {binops * tam / 1024:8.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+###############################################################
+# BENCHMARK: re-análisis incremental vs análisis completo
+# Genera un programa de N líneas, aplica ediciones pequeñas al azar
+# (cambiar un literal, insertar/borrar una declaración, renombrar
+# una variable) y mide el tiempo por edición de
+# DocumentoIncremental.editar frente a re-analizar todo el archivo.
+#
+# Con --verificar aplica además ediciones arbitrarias (caracteres
+# sueltos, comentarios y strings sin cerrar) y, cada vez que el
+# archivo no tiene errores léxicos ni sintácticos, compara AST y
+# errores con un análisis completo. Termina con código 1 si difieren.
+#
+# Uso:
+#   python benchmarks/bench_incremental.py [lineas] [ediciones] [--verificar]
+###############################################################
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ast_cs
+from incremental_cs import DocumentoIncremental
+from sesion_cs import SesionAnalisis
+
+PLANTILLA = """int edad{i} = {i};
+double precio{i} = 99.99;
+bool activo{i} = true;
+if (edad{i} == 18) {{
+    edad{i} = edad{i} + 1;
+}} else {{
+    precio{i} = precio{i} + edad{i};
+}}
+int Sumar{i}(int a, int b) {{
+    return edad{i} + 1;
+}}
+"""
+
+PIEZAS = ["x", "1", " ", "\n", ";", "{", "}", "(", ")", "=", "+", "int ", "/*", "*/",
+          "//", "\"", "'", "$", "edad0", "if (", "while (", "return "]
+
+
+def generar(lineas):
+    partes = []
+    i = 0
+    while len(partes) * 11 < lineas:
+        partes.append(PLANTILLA.format(i=i))
+        i += 1
+    return "".join(partes)
+
+
+def buscar(rnd, texto, patron):
+    """Posición de patron desde un punto al azar (o desde el comienzo); -1 si no está."""
+    i = texto.find(patron, rnd.randrange(len(texto) + 1))
+    return i if i >= 0 else texto.find(patron)
+
+
+def edicion_pequena(rnd, texto):
+    """(inicio, fin, nuevo) que mantiene el programa válido."""
+    tipo = rnd.randrange(4)
+    if tipo == 1 or not texto:   # insertar una declaración al comienzo de una línea
+        i = texto.rfind("\n", 0, rnd.randrange(len(texto) + 1)) + 1
+        return i, i, f"int nueva{rnd.randrange(10 ** 6)} = edad0;\n"
+    if tipo == 0:   # cambiar un literal
+        i = buscar(rnd, texto, "99.99")
+        return (i, i + 5, str(rnd.randrange(1000))) if i >= 0 else (0, 0, "")
+    if tipo == 2:   # borrar una línea 'bool ...'
+        i = buscar(rnd, texto, "bool activo")
+        return (i, texto.index("\n", i) + 1, "") if i >= 0 else (0, 0, "")
+    # renombrar el uso de una variable (puede quedar sin declarar)
+    i = buscar(rnd, texto, "edad")
+    return (i, i + 4, rnd.choice(["edad", "edaz"])) if i >= 0 else (0, 0, "")
+
+
+def edicion_cualquiera(rnd, texto):
+    i = rnd.randrange(len(texto) + 1)
+    if rnd.random() < 0.5 or not texto:
+        return i, i, rnd.choice(PIEZAS)
+    return i, min(len(texto), i + rnd.randrange(1, 6)), ""
+
+
+def comparar(doc, sesion):
+    completo = sesion.analizar(doc.texto)
+    if completo["errores_lexicos"] or completo["errores_sintacticos"]:
+        return True
+    incremental = doc.resultado()
+    if ast_cs.a_dict(incremental["ast"]) != ast_cs.a_dict(completo["ast"]):
+        print("AST distinto")
+        return False
+    for clave in ("errores_lexicos", "errores_sintacticos", "errores_semanticos"):
+        if incremental[clave] != completo[clave]:
+            print(f"{clave} distintos:\n  incremental: {incremental[clave][:3]}\n  completo:    {completo[clave][:3]}")
+            return False
+    return True
+
+
+def verificar(ediciones, semilla=1):
+    rnd = random.Random(semilla)
+    sesion = SesionAnalisis()
+    doc = DocumentoIncremental(generar(60))
+    for k in range(ediciones):
+        pequena = rnd.random() < 0.5
+        if pequena:
+            inicio, fin, nuevo = edicion_pequena(rnd, doc.texto)
+        else:
+            inicio, fin, nuevo = edicion_cualquiera(rnd, doc.texto)
+        viejo = doc.texto[inicio:fin]
+        doc.editar(inicio, fin, nuevo)
+        if not comparar(doc, sesion):
+            print(f"Diferencia tras la edición #{k}: {(inicio, fin, nuevo)!r}")
+            return 1
+        if not pequena and rnd.random() < 0.7:
+            # Deshacer: el documento vuelve a ser válido desde un estado con errores
+            doc.editar(inicio, inicio + len(nuevo), viejo)
+            if not comparar(doc, sesion):
+                print(f"Diferencia al deshacer la edición #{k}: {(inicio, fin, nuevo)!r}")
+                return 1
+        if k % 50 == 49:
+            # Se vuelve a un programa válido para seguir probando desde ahí
+            doc.actualizar(generar(rnd.randrange(11, 120)))
+            if not comparar(doc, sesion):
+                print(f"Diferencia al restaurar tras la edición #{k}")
+                return 1
+    print(f"{ediciones} ediciones verificadas contra el análisis completo")
+    return 0
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    lineas = int(args[0]) if args else 20000
+    ediciones = int(args[1]) if len(args) > 1 else 200
+    if "--verificar" in sys.argv:
+        sys.exit(verificar(ediciones))
+
+    texto = generar(lineas)
+    rnd = random.Random(1)
+
+    inicio = time.perf_counter()
+    doc = DocumentoIncremental(texto)
+    t_inicial = time.perf_counter() - inicio
+
+    sesion = SesionAnalisis()
+    inicio = time.perf_counter()
+    sesion.analizar(texto)
+    t_completo = time.perf_counter() - inicio
+
+    tiempos, con_errores = [], []
+    for _ in range(ediciones):
+        inicio_ed, fin_ed, nuevo = edicion_pequena(rnd, doc.texto)
+        inicio = time.perf_counter()
+        doc.editar(inicio_ed, fin_ed, nuevo)
+        medio = time.perf_counter()
+        doc.errores()
+        tiempos.append(medio - inicio)
+        con_errores.append(time.perf_counter() - inicio)
+    tiempos.sort()
+    con_errores.sort()
+
+    print(f"Archivo: {texto.count(chr(10))} líneas, {len(texto) / 1024:.0f} KB")
+    print(f"Análisis completo:           {t_completo * 1000:10.1f} ms")
+    print(f"Carga incremental inicial:   {t_inicial * 1000:10.1f} ms")
+    print(f"Edición incremental mediana: {tiempos[len(tiempos) // 2] * 1000:10.3f} ms")
+    print(f"Edición incremental p95:     {tiempos[int(len(tiempos) * 0.95)] * 1000:10.3f} ms")
+    print(f"Edición + errores() mediana: {con_errores[len(con_errores) // 2] * 1000:10.3f} ms")
+    print(f"Edición + errores() p95:     {con_errores[int(len(con_errores) * 0.95)] * 1000:10.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+###############################################################
+# BENCHMARK: tokens/segundo del lexer PLY vs el backend rápido
+# Genera un fuente repitiendo los algoritmo_*.cs del repositorio
+# hasta el tamaño pedido y lo tokeniza con cada backend (mejor de
+# varias repeticiones, sin contar la construcción del lexer).
+#
+# Uso:
+#   python benchmarks/bench_lexer.py [MB] [repeticiones]
+###############################################################
+
+import glob
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import lexer_cs
+
+
+def generar(n_bytes):
+    partes = []
+    for path in sorted(glob.glob(os.path.join(RAIZ, "algoritmo_*.cs"))):
+        with open(path) as f:
+            partes.append(f.read())
+    base = "\n".join(partes)
+    return base * (n_bytes // len(base) + 1)
+
+
+def medir(lexer, data, repeticiones):
+    mejor = None
+    for _ in range(repeticiones):
+        lexer.lineno = 1
+        lexer.errores = []
+        inicio = time.perf_counter()
+        lexer.input(data)
+        n = 0
+        for _tok in lexer:
+            n += 1
+        t = time.perf_counter() - inicio
+        mejor = t if mejor is None else min(mejor, t)
+    return n, mejor
+
+
+def main():
+    mb = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    data = generar(int(mb * 1024 * 1024))
+
+    print(f"Fuente: {len(data) / 1024 / 1024:.1f} MB, mejor de {repeticiones}")
+    print("{:<10} {:>12} {:>10} {:>14}".format("Backend", "Tokens", "Segundos", "Tokens/s"))
+    print("-" * 50)
+    base = None
+    for nombre, lexer in (("ply", lexer_cs.build_lexer()), ("rapido", lexer_cs.build_lexer_rapido())):
+        n, t = medir(lexer, data, repeticiones)
+        extra = "" if base is None else f"  (x{base / t:.2f})"
+        base = base or t
+        print("{:<10} {:>12} {:>10.3f} {:>14.0f}{}".format(nombre, n, t, n / t, extra))
+
+
+if __name__ == '__main__':
+    main()
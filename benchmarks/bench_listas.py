@@ -0,0 +1,83 @@
+###############################################################
+# BENCHMARK: escalamiento del parser con N sentencias top-level
+# Con listas que se extienden en su lugar el tiempo por sentencia
+# debe mantenerse constante al pasar de 10k a 100k a 1M.
+# --comparar construye además un parser con la regla anterior
+# (p[1] + [p[2]]) para los tamaños que no tardan demasiado.
+#
+# Uso:
+#   python benchmarks/bench_listas.py [--comparar] [N ...]
+###############################################################
+
+import os
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lexer_cs
+import parser_cs
+
+SENTENCIAS = [
+    "int v{i} = {i};\n",
+    "v{i} = v{i} + 1;\n",
+    "if (v{i} == 3) {{ x = 1; }}\n",
+]
+MAX_COMPARAR = 100_000
+
+
+def generar(n):
+    return "".join(SENTENCIAS[i % len(SENTENCIAS)].format(i=i) for i in range(n))
+
+
+def p_statement_list_anterior(p):
+    """statement_list : statement_list statement
+                      | statement"""
+    if len(p) == 3:
+        p[0] = p[1] + [p[2]]
+    else:
+        p[0] = [p[1]]
+
+
+def parser_anterior():
+    import ply.yacc as yacc
+
+    ns = types.SimpleNamespace(**{k: getattr(parser_cs, k) for k in dir(parser_cs) if not k.startswith("__")})
+    ns.__file__ = parser_cs.__file__
+    ns.p_statement_list = p_statement_list_anterior
+    return yacc.yacc(module=ns, start="program", debug=False, write_tables=False,
+                     errorlog=yacc.NullLogger())
+
+
+def medir(parser, data):
+    lexer = lexer_cs.build_lexer()
+    inicio = time.perf_counter()
+    ast = parser.parse(data, lexer=lexer)
+    seg = time.perf_counter() - inicio
+    return len(ast.statements), seg
+
+
+def main():
+    args = sys.argv[1:]
+    comparar = "--comparar" in args
+    tamanos = [int(a) for a in args if a != "--comparar"] or [10_000, 100_000, 1_000_000]
+
+    parsers = [("append", parser_cs.get_parser())]
+    if comparar:
+        parsers.append(("concatenar", parser_anterior()))
+
+    print("--- Escalamiento de statement_list ---")
+    print("{:<12} {:<12} {:>12} {:>12} {:>16}".format("N", "Regla", "Sentencias", "Segundos", "µs/sentencia"))
+    print("-" * 68)
+    for n in tamanos:
+        data = generar(n)
+        for nombre, parser in parsers:
+            if nombre == "concatenar" and n > MAX_COMPARAR:
+                continue
+            total, seg = medir(parser, data)
+            print("{:<12} {:<12} {:>12} {:>12.3f} {:>16.2f}".format(n, nombre, total, seg, seg / total * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+###############################################################
+# BENCHMARK: memoria del AST (tuplas anteriores vs nodos ast_cs)
+# Parsea el mismo programa generado dos veces y mide con
+# tracemalloc la memoria que queda retenida por el AST:
+#   - "tuplas": el parser construye las tuplas de antes
+#               ("binop", op, left, right) sin compartir strings
+#   - "nodos":  nodos con __slots__ + posiciones (ast_cs)
+#
+# Uso:
+#   python benchmarks/bench_memoria_ast.py [N_sentencias ...]
+###############################################################
+
+import gc
+import os
+import sys
+import tracemalloc
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ast_cs
+import lexer_cs
+import parser_cs
+
+PLANTILLA = """int v{i} = {i};
+double d{i} = v{i} * 2.5 + 1;
+if (v{i} == 3) {{ v{i} = v{i} + 1; }} else {{ d{i} = d{i} - 1; }}
+while (v{i} < 10) {{ v{i} = v{i} + 1; }}
+for (v{i} = 0; v{i} < 5; v{i} = v{i} + 1) {{ total = total + v{i}; }}
+int F{i}(int a, int b) {{ return a + b * v{i}; }}
+class C{i} {{ int campo; double M(int x) {{ return x + campo; }} }}
+Console.WriteLine(v{i});
+"""
+
+
+def generar(n):
+    return "int total = 0;\n" + "".join(PLANTILLA.format(i=i) for i in range(n))
+
+
+def _tupla(tag):
+    def crear(*campos, inicio=0, fin=0):
+        # Los nodos reciben (campos..., inicio, fin) posicionales: se descartan
+        n = len(ast_cs.POR_TAG[tag].campos)
+        return (tag,) + campos[:n]
+    return crear
+
+
+# Módulo falso: mismas fábricas que ast_cs, pero devuelven las tuplas anteriores
+AST_TUPLAS = types.SimpleNamespace(
+    compartir=lambda x: x,
+    encadenar=lambda op, left, right, inicio=0, fin=0: ("binop", op, left, right),
+    **{cls.__name__: _tupla(cls.tag) for cls in ast_cs.NODOS},
+)
+
+
+def medir(data, modulo_ast):
+    parser = parser_cs.get_parser()
+    lexer = lexer_cs.build_lexer()
+    original = parser_cs.ast_cs
+    parser_cs.ast_cs = modulo_ast
+    try:
+        gc.collect()
+        tracemalloc.start()
+        antes = tracemalloc.get_traced_memory()[0]
+        ast = parser.parse(data, lexer=lexer)
+        lexer.input("")  # el lexer deja de retener el texto fuente
+        gc.collect()
+        retenido = tracemalloc.get_traced_memory()[0] - antes
+        tracemalloc.stop()
+    finally:
+        parser_cs.ast_cs = original
+    return ast, retenido
+
+
+def contar_nodos(n):
+    if isinstance(n, (ast_cs.Nodo, tuple)):
+        hijos = [getattr(n, c) for c in n.campos] if isinstance(n, ast_cs.Nodo) else n[1:]
+        return 1 + sum(contar_nodos(h) for h in hijos)
+    if isinstance(n, list):
+        return sum(contar_nodos(h) for h in n)
+    return 0
+
+
+def main():
+    tamanos = [int(a) for a in sys.argv[1:]] or [1_000, 10_000]
+    print("--- Memoria retenida por el AST (tracemalloc) ---")
+    print("{:<10} {:<8} {:>10} {:>14} {:>12}".format("N", "Formato", "Nodos", "Memoria (MB)", "Bytes/nodo"))
+    print("-" * 58)
+    for n in tamanos:
+        data = generar(n)
+        for nombre, modulo in (("tuplas", AST_TUPLAS), ("nodos", ast_cs)):
+            ast, retenido = medir(data, modulo)
+            nodos = contar_nodos(ast)
+            print("{:<10} {:<8} {:>10} {:>14.2f} {:>12.1f}".format(
+                n, nombre, nodos, retenido / 1024 / 1024, retenido / nodos))
+            del ast
+
+
+if __name__ == '__main__':
+    main()
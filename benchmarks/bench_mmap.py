@@ -0,0 +1,110 @@
+###############################################################
+# BENCHMARK: lexer sobre archivo mapeado (lexer_cs.LexerMapeado)
+# Tokeniza un archivo grande (por defecto uno de 256 MB armado con
+# generador_cs.py) en tres modos, cada uno en su propio proceso, y
+# compara tiempo, tokens y pico de memoria (ru_maxrss):
+#   - leer:    f.read() + lexer rápido (el texto entero en memoria)
+#   - bloques: lexer_cs.iter_tokens_stream (lectura de a bloques)
+#   - mmap:    lexer_cs.mapear + LexerMapeado
+# Los tokens se cuentan y se descartan: lo que se mide es lo que
+# cuesta el texto, no una lista de tokens.
+#
+# Uso:
+#   python benchmarks/bench_mmap.py [--mb 256] [--archivo grande.cs]
+###############################################################
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+MODOS = ("leer", "bloques", "mmap")
+
+
+def generar_archivo(path, mb):
+    import generador_cs
+
+    objetivo = mb << 20
+    escrito = semilla = 0
+    with open(path, "w") as f:
+        while escrito < objetivo:
+            programa = generador_cs.generar(2000, semilla)
+            f.write(programa)
+            escrito += len(programa)
+            semilla += 1
+    return escrito
+
+
+def tokenizar(modo, path):
+    """(tokens, segundos) de tokenizar path en el modo dado."""
+    import lexer_cs
+
+    inicio = time.perf_counter()
+    if modo == "leer":
+        with open(path) as f:
+            data = f.read()
+        toks = lexer_cs.iter_tokens(lexer_cs.build_lexer_rapido(), data)
+    elif modo == "bloques":
+        f = open(path)
+        toks = lexer_cs.iter_tokens_stream(f, lexer_cs.build_lexer_rapido())
+    else:
+        toks = lexer_cs.iter_tokens_mapeado(lexer_cs.build_lexer_mapeado(), lexer_cs.mapear(path))
+    n = 0
+    for _ in toks:
+        n += 1
+    return n, time.perf_counter() - inicio
+
+
+def medir(modo, path):
+    """Corre un modo en un proceso nuevo (el pico de memoria es solo suyo)."""
+    salida = subprocess.run([sys.executable, os.path.abspath(__file__), "--modo", modo, path],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(salida)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark del lexer sobre archivo mapeado.")
+    ap.add_argument("--mb", type=int, default=256, help="tamaño del archivo generado")
+    ap.add_argument("--archivo", default=None, help="usar este archivo en vez de generar uno")
+    ap.add_argument("--modo", choices=MODOS, default=None, help=argparse.SUPPRESS)
+    ap.add_argument("path", nargs="?", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.modo:
+        # Proceso hijo: un solo modo, resultado en JSON
+        n, segundos = tokenizar(args.modo, args.path)
+        pico_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(json.dumps({"tokens": n, "s": segundos, "pico_mb": pico_kb / 1024}))
+        return 0
+
+    path = args.archivo
+    temporal = None
+    if path is None:
+        temporal = path = tempfile.mktemp(prefix="bench_mmap_", suffix=".cs")
+        generar_archivo(path, args.mb)
+    try:
+        tamano = os.path.getsize(path) / (1 << 20)
+        print(f"archivo de {tamano:.0f} MB")
+        print(f"{'modo':<9} {'tokens':>11} {'tiempo':>9} {'pico RSS':>10}")
+        cuentas = set()
+        for modo in MODOS:
+            r = medir(modo, path)
+            cuentas.add(r["tokens"])
+            print(f"{modo:<9} {r['tokens']:>11} {r['s']:>8.1f}s {r['pico_mb']:>7.0f} MB")
+        if len(cuentas) != 1:
+            raise AssertionError("los modos no produjeron la misma cantidad de tokens")
+    finally:
+        if temporal:
+            os.unlink(temporal)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+###############################################################
+# BENCHMARK: semántico serial vs paralelo (paralelo_cs)
+# Genera un archivo grande con muchas funciones y clases, lo parsea
+# una vez y mide el pase semántico serial y con 1, 2, 4, ... procesos.
+# Verifica que todas las listas de errores sean idénticas.
+#
+# Uso:
+#   python benchmarks/bench_paralelo.py [funciones] [max_procesos]
+###############################################################
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import paralelo_cs
+import semantico_comun
+from sesion_cs import SesionAnalisis
+
+FUNCION = """int total{i} = {i};
+double Calcular{i}(double saldo, double monto, int dias) {{
+    double interes = (saldo + monto) * dias - (saldo + monto) / dias;
+    int k = 0;
+    while (k < dias) {{
+        saldo = saldo + monto * interes - monto / dias;
+        k = k + total{i};
+    }}
+    if (saldo == monto) {{ return saldo + interes; }}
+    return saldo - interes + total{i};
+}}
+class Cuenta{i} {{
+    double saldo;
+    double Depositar(double monto) {{ saldo = saldo + monto; return saldo; }}
+    double Retirar(double monto) {{ saldo = saldo - monto; return saldo + total{i}; }}
+}}
+"""
+
+
+def programa(funciones):
+    return "".join(FUNCION.format(i=i) for i in range(funciones))
+
+
+def main():
+    funciones = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    max_procesos = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1) * 2
+    texto = programa(funciones)
+    ast = SesionAnalisis().parse(texto)
+    print(f"Archivo: {texto.count(chr(10))} líneas, {len(texto) / 1024:.0f} KB, CPUs: {os.cpu_count()}")
+
+    inicio = time.perf_counter()
+    esperado = semantico_comun.ContextoSemantico().analizar_programa(ast)
+    t_serial = time.perf_counter() - inicio
+    print(f"Serial (analizar_programa): {t_serial * 1000:9.1f} ms  ({len(esperado)} errores)")
+
+    procesos = 1
+    while procesos <= max_procesos:
+        inicio = time.perf_counter()
+        errores = paralelo_cs.analizar_programa(ast, procesos)
+        t = time.perf_counter() - inicio
+        estado = "iguales" if errores == esperado else "DISTINTOS"
+        print(f"{procesos:>3} procesos:              {t * 1000:9.1f} ms  x{t_serial / t:5.2f}  errores {estado}")
+        if errores != esperado:
+            sys.exit(1)
+        procesos *= 2
+
+
+if __name__ == '__main__':
+    main()
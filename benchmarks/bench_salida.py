@@ -0,0 +1,72 @@
+###############################################################
+# BENCHMARK: escritura de tokens del CLI del lexer
+# Compara el print + str.format por token anterior contra los
+# escritores de salida_cs (tabla, jsonl, bin) sobre un buffer de
+# 1 MB. Todo se escribe a /dev/null para medir solo la salida.
+#
+# Uso:
+#   python benchmarks/bench_salida.py [MB]
+###############################################################
+
+import contextlib
+import glob
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import lexer_cs
+import salida_cs
+
+
+def generar(n_bytes):
+    partes = []
+    for path in sorted(glob.glob(os.path.join(RAIZ, "algoritmo_*.cs"))):
+        with open(path) as f:
+            partes.append(f.read())
+    base = "\n".join(partes)
+    return base * (n_bytes // len(base) + 1)
+
+
+def tokens(data):
+    lexer = lexer_cs.build_lexer()
+    lexer.errores = []
+    return list(lexer_cs.iter_tokens(lexer, data))
+
+
+def con_print(toks, path):
+    with open(path, "w") as f, contextlib.redirect_stdout(f):
+        for tok in toks:
+            print("{:<20} {:<20} {:<10} {:<10}".format(tok.type, str(tok.value), tok.lineno, tok.column))
+
+
+def con_escritor(formato):
+    def escribir(toks, path):
+        with salida_cs.abrir_salida(path, binario=formato == "bin") as out:
+            if formato == "bin":
+                salida_cs.escribir_tokens_bin(out, toks, lexer_cs.tokens)
+            elif formato == "jsonl":
+                salida_cs.escribir_tokens_jsonl(out, toks)
+            else:
+                salida_cs.escribir_tokens_tabla(out, toks)
+    return escribir
+
+
+def main():
+    mb = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    toks = tokens(generar(int(mb * 1024 * 1024)))
+    print(f"{len(toks)} tokens")
+    print("{:<16} {:>10} {:>14}".format("Salida", "Segundos", "Tokens/s"))
+    print("-" * 42)
+    for nombre, f in (("print (antes)", con_print), ("tabla", con_escritor("tabla")),
+                      ("jsonl", con_escritor("jsonl")), ("bin", con_escritor("bin"))):
+        inicio = time.perf_counter()
+        f(toks, os.devnull)
+        t = time.perf_counter() - inicio
+        print("{:<16} {:>10.3f} {:>14.0f}".format(nombre, t, len(toks) / t))
+
+
+if __name__ == '__main__':
+    main()
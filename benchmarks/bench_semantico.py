@@ -0,0 +1,65 @@
+###############################################################
+# BENCHMARK: análisis semántico con anidamiento profundo
+# Genera programas con:
+#   - una cadena 'a + a + ... + a' de N operandos (una sola OpChain plana)
+#   - una expresión anidada a derecha 'a + (a + (a + ...))' (cadenas anidadas)
+#   - N if anidados
+# y mide solo el pase semántico (el AST se parsea antes). También
+# mide un programa "normal" ancho (muchas sentencias cortas).
+# La pila de Python no crece con la profundidad: no hace falta
+# subir sys.setrecursionlimit.
+#
+# Uso:
+#   python benchmarks/bench_semantico.py [profundidad]
+###############################################################
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import semantico_comun
+from sesion_cs import SesionAnalisis
+
+
+def cadena_izquierda(n):
+    return "int a = 1;\nint x = " + " + ".join(["a"] * n) + ";\n"
+
+
+def cadena_derecha(n):
+    return "int a = 1;\nint x = " + "a + (" * (n - 1) + "a" + ")" * (n - 1) + ";\n"
+
+
+def ifs_anidados(n):
+    return "bool b = true;\n" + "if (b) {\n" * n + "b = false;\n" + "}\n" * n
+
+
+def programa_ancho(n):
+    return "".join(f"int v{i} = {i};\nif (v{i} == 3) {{ v{i} = v{i} + 1; }}\n" for i in range(n))
+
+
+def medir(nombre, texto, sesion):
+    ast = sesion.parse(texto)
+    if ast is None or sesion.errores_sintacticos:
+        print(f"{nombre:<28} error de parseo")
+        return
+    inicio = time.perf_counter()
+    errores = semantico_comun.ContextoSemantico().analizar_programa(ast)
+    ms = (time.perf_counter() - inicio) * 1000
+    print(f"{nombre:<28} {ms:10.1f} ms  ({len(errores)} errores)")
+
+
+def main():
+    profundidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sesion = SesionAnalisis()
+    print(f"Límite de recursión de Python: {sys.getrecursionlimit()}")
+    for n in sorted({1000, profundidad // 10, profundidad}):
+        medir(f"a + a + ... ({n})", cadena_izquierda(n), sesion)
+        medir(f"a + (a + (...)) ({n})", cadena_derecha(n), sesion)
+        medir(f"if anidados ({n})", ifs_anidados(n), sesion)
+    medir(f"programa ancho ({profundidad} sent.)", programa_ancho(profundidad // 2), sesion)
+
+
+if __name__ == '__main__':
+    main()
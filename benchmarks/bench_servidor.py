@@ -0,0 +1,106 @@
+###############################################################
+# BENCHMARK: servidor persistente vs un proceso por archivo
+# Levanta servidor_cs.py en un socket temporal y compara:
+#   - python parser_cs.py archivo.cs      (intérprete + tablas cada vez)
+#   - python cliente_cs.py parse archivo.cs (solo el cliente liviano)
+#   - peticiones desde hilos sobre conexiones abiertas (latencia p50/p95)
+#
+# Uso:
+#   python benchmarks/bench_servidor.py [repeticiones] [hilos]
+###############################################################
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from cliente_cs import Cliente
+
+ARCHIVOS = ["algoritmo_sintactico_daniel.cs", "algoritmo_sintactico_juan.cs", "algoritmo_sintactico_kiara.cs"]
+
+
+def medir_procesos(argumentos, env, repeticiones):
+    tiempos = []
+    for i in range(repeticiones):
+        archivo = ARCHIVOS[i % len(ARCHIVOS)]
+        inicio = time.perf_counter()
+        subprocess.run(
+            [sys.executable] + argumentos + [archivo],
+            cwd=RAIZ, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def medir_hilos(path, hilos, repeticiones):
+    latencias = []
+    lock = threading.Lock()
+
+    def trabajar():
+        propias = []
+        with Cliente(path) as cliente:
+            for i in range(repeticiones):
+                peticion = {"op": "check", "archivo": os.path.join(RAIZ, ARCHIVOS[i % len(ARCHIVOS)])}
+                inicio = time.perf_counter()
+                cliente.pedir(peticion)
+                propias.append(time.perf_counter() - inicio)
+        with lock:
+            latencias.extend(propias)
+
+    inicio = time.perf_counter()
+    trabajadores = [threading.Thread(target=trabajar) for _ in range(hilos)]
+    for t in trabajadores:
+        t.start()
+    for t in trabajadores:
+        t.join()
+    return latencias, time.perf_counter() - inicio
+
+
+def esperar_servidor(path, segundos=30):
+    limite = time.perf_counter() + segundos
+    while time.perf_counter() < limite:
+        try:
+            with Cliente(path) as cliente:
+                cliente.pedir({"op": "ping"})
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("el servidor no arrancó")
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    hilos = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    path = os.path.join(tempfile.mkdtemp(), "bench.sock")
+    env = dict(os.environ, LP_CS_SOCKET=path)
+
+    servidor = subprocess.Popen(
+        [sys.executable, "servidor_cs.py", "-q", "--hilos", str(hilos)],
+        cwd=RAIZ, env=env, stderr=subprocess.DEVNULL,
+    )
+    try:
+        esperar_servidor(path)
+        directo = medir_procesos(["parser_cs.py"], env, repeticiones)
+        cliente = medir_procesos(["cliente_cs.py", "parse"], env, repeticiones)
+        latencias, total = medir_hilos(path, hilos, repeticiones * 10)
+    finally:
+        with Cliente(path) as c:
+            c.pedir({"op": "apagar"})
+        servidor.wait(10)
+
+    latencias.sort()
+    print(f"python parser_cs.py (mediana):    {statistics.median(directo) * 1000:8.1f} ms")
+    print(f"python cliente_cs.py (mediana):   {statistics.median(cliente) * 1000:8.1f} ms")
+    print(f"{hilos} hilos x {repeticiones * 10} peticiones check: {len(latencias) / total:8.0f} pet/s")
+    print(f"  latencia p50: {latencias[len(latencias) // 2] * 1000:8.3f} ms")
+    print(f"  latencia p95: {latencias[int(len(latencias) * 0.95)] * 1000:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
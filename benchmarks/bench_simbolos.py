@@ -0,0 +1,121 @@
+###############################################################
+# BENCHMARK: tabla de símbolos con ámbitos
+#  1. Búsqueda con D ámbitos abiertos: pilas de vínculos por nombre
+#     (TablaSimbolos) vs recorrer una cadena de dicts.
+#  2. Pase semántico sobre programas con N clases de M métodos:
+#     el tiempo por clase debe mantenerse plano al crecer N.
+#  3. Memoria por símbolo: Symbol con __slots__ vs un registro con
+#     __dict__ y un dict `extra` siempre creado (como antes).
+#
+# Uso:
+#   python benchmarks/bench_simbolos.py [clases]
+###############################################################
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import semantico_comun
+from semantico_comun import Symbol, TablaSimbolos
+from sesion_cs import SesionAnalisis
+
+
+class SimboloConDict:
+    """Registro como el de antes: __dict__ por instancia y extra = {} siempre."""
+
+    def __init__(self, name, sym_type, kind, extra=None):
+        self.name = name
+        self.type = sym_type
+        self.kind = kind
+        self.extra = extra or {}
+
+
+def buscar_en_cadena(cadena, name):
+    for ambito in reversed(cadena):
+        sym = ambito.get(name)
+        if sym is not None:
+            return sym
+    return None
+
+
+def medir_busquedas(profundidad, repeticiones=200_000):
+    tabla = TablaSimbolos()
+    cadena = [{}]
+    tabla.declarar(Symbol("global0", "int", "var"))
+    cadena[0]["global0"] = tabla.get("global0")
+    for d in range(profundidad):
+        tabla.abrir()
+        cadena.append({})
+        sym = Symbol(f"local{d}", "int", "var")
+        tabla.declarar(sym)
+        cadena[-1][sym.name] = sym
+
+    get = tabla.get
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        get("global0")
+    t_pilas = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        buscar_en_cadena(cadena, "global0")
+    t_cadena = time.perf_counter() - inicio
+    return t_pilas / repeticiones * 1e9, t_cadena / repeticiones * 1e9
+
+
+def programa_clases(clases, metodos=10):
+    partes = ["int total = 0;\n"]
+    for c in range(clases):
+        partes.append(f"class C{c} {{\n    int campo{c};\n")
+        for m in range(metodos):
+            partes.append(
+                f"    int M{m}(int a, int b) {{\n"
+                f"        int t = a + b;\n"
+                f"        if (t == campo{c}) {{ int u = t + total; t = u; }}\n"
+                f"        return t + campo{c};\n"
+                f"    }}\n"
+            )
+        partes.append("}\n")
+    return "".join(partes)
+
+
+def memoria_por_simbolo(cls, n=100_000):
+    tracemalloc.start()
+    antes = tracemalloc.take_snapshot()
+    simbolos = [cls(f"s{i}", "int", "var") for i in range(n)]
+    despues = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(s.size_diff for s in despues.compare_to(antes, "filename"))
+    # Se descuentan la lista y los nombres, que son iguales en ambos casos
+    nombres = sum(sys.getsizeof(s.name) for s in simbolos) + sys.getsizeof(simbolos)
+    return (total - nombres) / n
+
+
+def main():
+    clases = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    print("Búsqueda de un global con D ámbitos abiertos (ns por búsqueda):")
+    print(f"{'D':>6} {'pilas':>10} {'cadena':>10}")
+    for d in (1, 10, 100, 1000):
+        pilas, cadena = medir_busquedas(d)
+        print(f"{d:>6} {pilas:>10.0f} {cadena:>10.0f}")
+
+    print("\nPase semántico, clases de 10 métodos:")
+    sesion = SesionAnalisis()
+    for n in sorted({clases // 100 or 1, clases // 10 or 1, clases}):
+        ast = sesion.parse(programa_clases(n))
+        inicio = time.perf_counter()
+        semantico_comun.ContextoSemantico().analizar_programa(ast)
+        t = time.perf_counter() - inicio
+        print(f"{n:>6} clases: {t * 1000:9.1f} ms  ({t / n * 1e6:7.1f} µs por clase)")
+
+    print("\nMemoria por símbolo (sin contar el nombre):")
+    print(f"  Symbol (__slots__, extra=None): {memoria_por_simbolo(Symbol):6.0f} bytes")
+    print(f"  con __dict__ y extra={{}}:        {memoria_por_simbolo(SimboloConDict):6.0f} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+###############################################################
+# SUITE DE BENCHMARKS REPRODUCIBLE
+# Cada caso es un programa de generador_cs.py (semilla fija) con un
+# tamaño y una mezcla de construcciones. Para cada uno se miden por
+# separado, con el mejor de varias repeticiones:
+#   - lexer:     tokenizar el texto completo
+#   - parser:    parsear la lista de tokens ya hecha
+#   - semántico: ContextoSemantico().analizar_programa(ast)
+# y se informan tokens/s, nodos/s y el pico de memoria de cada fase
+# (tracemalloc, en una pasada aparte para no ensuciar los tiempos).
+#
+# Los resultados se comparan con la línea base JSON: un tiempo o un
+# pico de memoria que supera el de la línea base en más que el umbral
+# es una regresión y el script termina con código 1. Los tiempos se
+# escalan por una calibración (un bucle fijo de Python medido al
+# empezar) para que una máquina más lenta o más cargada que la que
+# grabó la línea base no se confunda con una regresión. Con --guardar
+# se reescribe la línea base (conservando los umbrales).
+#
+# Uso:
+#   python benchmarks/bench_suite.py [--guardar] [--casos a,b]
+#          [--repeticiones N] [--linea-base archivo.json]
+###############################################################
+
+import argparse
+import copy
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ast_cs
+import generador_cs
+import lexer_cs
+import parser_cs
+import semantico_comun
+
+LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "linea_base.json")
+
+# Cuánto puede empeorar cada métrica respecto de la línea base (fracción)
+UMBRALES = {"tiempo": 0.25, "memoria": 0.10}
+
+# nombre -> argumentos de generador_cs.generar
+CASOS = {
+    "pequeno": {"sentencias": 200, "semilla": 1},
+    "mediano": {"sentencias": 2000, "semilla": 2},
+    "grande": {"sentencias": 6000, "semilla": 3},
+    "expresiones": {"sentencias": 600, "semilla": 4, "mezcla": {"expresion_larga": 30}, "largo_expresion": 300},
+    "clases": {"sentencias": 1500, "semilla": 5, "mezcla": {"clase": 12, "funcion": 6, "procedimiento": 3}},
+    "control": {"sentencias": 2000, "semilla": 6, "mezcla": {"if_else": 12, "while": 8, "for": 8}, "profundidad": 6},
+}
+
+FASES = ("lexer", "parser", "semantico")
+METRICAS_TIEMPO = tuple(f"{f}_ms" for f in FASES)
+METRICAS_MEMORIA = tuple(f"pico_{f}_kb" for f in FASES)
+
+
+class _TokensListos:
+    """Lexer de mentira para el parser: entrega una lista de tokens ya hecha."""
+
+    def __init__(self, tokens, lexdata):
+        self.lexdata = lexdata
+        self._siguiente = iter(tokens).__next__
+
+    def token(self):
+        try:
+            return self._siguiente()
+        except StopIteration:
+            return None
+
+
+def calibrar(repeticiones=5):
+    """ms del mejor de varias corridas de un bucle fijo (velocidad de la máquina)."""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        d = {}
+        for i in range(200_000):
+            d[i & 1023] = str(i)
+        t = time.perf_counter() - inicio
+        mejor = t if mejor is None else min(mejor, t)
+    return round(mejor * 1000, 3)
+
+
+def contar_nodos(ast):
+    nodos = 0
+    pendientes = [ast]
+    while pendientes:
+        n = pendientes.pop()
+        if isinstance(n, ast_cs.Nodo):
+            nodos += 1
+            pendientes.extend(getattr(n, c) for c in n.campos)
+        elif isinstance(n, list):
+            pendientes.extend(n)
+    return nodos
+
+
+# ==========================
+# Fases
+# ==========================
+
+def _lexer(data, lexer):
+    lexer.lineno = 1
+    lexer.errores = []
+    lexer.input(data)
+    return list(lexer)
+
+
+def _parser(data, tokens, parser):
+    return parser.parse(lexer=_TokensListos(tokens, data))
+
+
+def _semantico(ast):
+    return semantico_comun.ContextoSemantico().analizar_programa(ast)
+
+
+def medir_caso(data, repeticiones):
+    lexer = lexer_cs.get_lexer().clone()
+    parser = copy.copy(parser_cs.get_parser())
+    parser.errorfunc = lambda p: None
+
+    tiempos = {f: None for f in FASES}
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        tokens = _lexer(data, lexer)
+        medio = time.perf_counter()
+        ast = _parser(data, tokens, parser)
+        fin_parser = time.perf_counter()
+        _semantico(ast)
+        fin = time.perf_counter()
+        for fase, t in zip(FASES, (medio - inicio, fin_parser - medio, fin - fin_parser)):
+            tiempos[fase] = t if tiempos[fase] is None else min(tiempos[fase], t)
+
+    # Pico de memoria de cada fase por encima de lo que ya estaba vivo
+    def pico(base):
+        return (tracemalloc.get_traced_memory()[1] - base) / 1024
+
+    picos = {}
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tokens = _lexer(data, lexer)
+        picos["lexer"] = pico(base)
+
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        ast = _parser(data, tokens, parser)
+        picos["parser"] = pico(base)
+
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        _semantico(ast)
+        picos["semantico"] = pico(base)
+    finally:
+        tracemalloc.stop()
+
+    nodos = contar_nodos(ast)
+    resultado = {"bytes": len(data), "tokens": len(tokens), "nodos": nodos}
+    for fase in FASES:
+        resultado[f"{fase}_ms"] = round(tiempos[fase] * 1000, 3)
+        resultado[f"pico_{fase}_kb"] = round(picos[fase], 1)
+    resultado["tokens_s"] = round(len(tokens) / tiempos["lexer"])
+    resultado["nodos_s"] = round(nodos / tiempos["parser"])
+    resultado["nodos_semantico_s"] = round(nodos / tiempos["semantico"])
+    return resultado
+
+
+# ==========================
+# Línea base
+# ==========================
+
+def cargar_linea_base(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def guardar_linea_base(path, resultados, calibracion_ms, anterior=None):
+    datos = {
+        "calibracion_ms": calibracion_ms,
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "cpus": os.cpu_count(),
+        "umbrales": (anterior or {}).get("umbrales", UMBRALES),
+        "casos": resultados,
+    }
+    with open(path, "w") as f:
+        json.dump(datos, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def comparar(nombre, actual, base, umbrales, escala=1.0):
+    """
+    Lista de mensajes de regresión del caso frente a su línea base.
+    Los tiempos actuales se dividen por `escala` (calibración actual
+    sobre la de la línea base).
+    """
+    if base is None:
+        return []
+    if (actual["bytes"], actual["tokens"]) != (base["bytes"], base["tokens"]):
+        # Cambió el programa (generador o lexer): los números no son comparables.
+        # Que cambie la cantidad de nodos (otra forma del AST) no es problema.
+        return [f"{nombre}: el programa cambió ({base['bytes']} -> {actual['bytes']} bytes, "
+                f"{base['tokens']} -> {actual['tokens']} tokens); regenerar la línea base"]
+    regresiones = []
+    for metricas, umbral, factor in (
+        (METRICAS_TIEMPO, umbrales["tiempo"], escala),
+        (METRICAS_MEMORIA, umbrales["memoria"], 1.0),
+    ):
+        for m in metricas:
+            valor = actual[m] / factor
+            if base[m] > 0 and valor > base[m] * (1 + umbral):
+                regresiones.append(f"{nombre}: {m} {base[m]:.1f} -> {valor:.1f} "
+                                   f"(+{valor / base[m] - 1:.0%}, umbral {umbral:.0%})")
+    return regresiones
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Suite de benchmarks del lexer, parser y semántico.")
+    ap.add_argument("--guardar", action="store_true", help="reescribir la línea base con estos resultados")
+    ap.add_argument("--casos", default=None, help="casos separados por coma (por defecto todos)")
+    ap.add_argument("--repeticiones", type=int, default=5)
+    ap.add_argument("--linea-base", default=LINEA_BASE)
+    args = ap.parse_args(argv)
+
+    nombres = args.casos.split(",") if args.casos else list(CASOS)
+    desconocidos = [n for n in nombres if n not in CASOS]
+    if desconocidos:
+        sys.stderr.write(f"Error: casos desconocidos: {', '.join(desconocidos)}\n")
+        return 2
+
+    linea_base = cargar_linea_base(args.linea_base)
+    umbrales = (linea_base or {}).get("umbrales", UMBRALES)
+    base_casos = (linea_base or {}).get("casos", {})
+    calibracion_ms = calibrar()
+    escala = calibracion_ms / linea_base["calibracion_ms"] if linea_base else 1.0
+    print(f"Calibración: {calibracion_ms:.1f} ms (x{escala:.2f} respecto de la línea base)")
+
+    print(f"{'caso':<12} {'KB':>6} {'tokens':>8} {'nodos':>8} {'lexer':>9} {'parser':>9} "
+          f"{'semánt.':>9} {'tokens/s':>10} {'nodos/s':>9} {'pico KB':>9}")
+    resultados = {}
+    regresiones = []
+    for nombre in nombres:
+        caso = dict(CASOS[nombre])
+        data = generador_cs.generar(caso.pop("sentencias"), caso.pop("semilla"), **caso)
+        r = medir_caso(data, args.repeticiones)
+        resultados[nombre] = r
+        pico = max(r[m] for m in METRICAS_MEMORIA)
+        print(f"{nombre:<12} {r['bytes'] / 1024:>6.0f} {r['tokens']:>8} {r['nodos']:>8} "
+              f"{r['lexer_ms']:>7.1f}ms {r['parser_ms']:>7.1f}ms {r['semantico_ms']:>7.1f}ms "
+              f"{r['tokens_s']:>10} {r['nodos_s']:>9} {pico:>9.0f}")
+        regresiones.extend(comparar(nombre, r, base_casos.get(nombre), umbrales, escala))
+
+    if args.guardar:
+        # Los casos no medidos en esta corrida se conservan
+        todos = dict(base_casos)
+        todos.update(resultados)
+        guardar_linea_base(args.linea_base, todos, calibracion_ms, linea_base)
+        print(f"Línea base guardada en {args.linea_base}")
+        return 0
+    if linea_base is None:
+        print(f"Sin línea base ({args.linea_base}); crearla con --guardar")
+        return 0
+    if regresiones:
+        print("\nREGRESIONES:")
+        for msg in regresiones:
+            print(f"  {msg}")
+        return 1
+    print(f"\nSin regresiones frente a {os.path.basename(args.linea_base)} "
+          f"(umbral tiempo {umbrales['tiempo']:.0%}, memoria {umbrales['memoria']:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+###############################################################
+# CONFORMIDAD: backend rápido vs lexer PLY
+# Tokeniza los algoritmo_*.cs del repositorio y miles de entradas
+# aleatorias (comentarios sin cerrar, strings cortados, caracteres
+# ilegales, saltos de línea) con los dos backends y compara token
+# por token (tipo, valor, lexema, línea, posición, columna) y los mensajes
+# de error léxico. También pasa por iter_tokens_stream con bloques
+# pequeños. Termina con código 1 si hay alguna diferencia.
+#
+# Uso:
+#   python benchmarks/conformidad_lexer.py [n_aleatorios] [semilla]
+###############################################################
+
+import glob
+import io
+import os
+import random
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import lexer_cs
+
+PIEZAS = [
+    "int ", "x", "Console", ".", "12", "3.5", ".5", " ", "\t", "\n", "\n\n",
+    "/*", "*/", "//", "\"ab", "\"", "'c'", "'", "$", "@", "#", "==", "!=",
+    "<=", ">=", "&&", "||", "+", "-", "/", "*", "=", "<", ">", "!", "{", "}",
+    "(", ")", "[", "]", ";", ",", "if", "while", "return", "class ", "true",
+]
+
+
+def tokens(lexer, data, bloque=None):
+    lexer.lineno = 1
+    lexer.errores = []
+    if bloque is None:
+        it = lexer_cs.iter_tokens(lexer, data)
+    else:
+        it = lexer_cs.iter_tokens_stream(io.StringIO(data), lexer, bloque)
+    lista = [(t.type, t.value, lexer_cs.lexema(t), t.lineno, t.lexpos, t.column) for t in it]
+    return lista, lexer.errores
+
+
+def entradas(n, semilla):
+    for path in sorted(glob.glob(os.path.join(RAIZ, "*.cs"))):
+        with open(path) as f:
+            yield os.path.basename(path), f.read()
+    rnd = random.Random(semilla)
+    for i in range(n):
+        yield f"aleatorio #{i}", "".join(rnd.choice(PIEZAS) for _ in range(rnd.randint(0, 120)))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    semilla = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    ply_lexer = lexer_cs.build_lexer()
+    rapido = lexer_cs.build_lexer_rapido()
+
+    total = diferencias = 0
+    for nombre, data in entradas(n, semilla):
+        total += 1
+        for bloque in (None, 7, 1 << 16):
+            esperado = tokens(ply_lexer, data, bloque)
+            obtenido = tokens(rapido, data, bloque)
+            if esperado != obtenido:
+                diferencias += 1
+                print(f"DIFERENCIA en {nombre} (bloque={bloque}): {data[:80]!r}")
+                for a, b in zip(esperado[0] + esperado[1], obtenido[0] + obtenido[1]):
+                    if a != b:
+                        print(f"    ply:    {a}\n    rapido: {b}")
+                        break
+                break
+
+    print(f"{total} entradas, {diferencias} con diferencias")
+    return 1 if diferencias else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
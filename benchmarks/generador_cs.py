@@ -0,0 +1,233 @@
+###############################################################
+# GENERADOR DE PROGRAMAS C# SINTÉTICOS (con semilla)
+# Emite programas válidos para la gramática de parser_cs.py con el
+# tamaño y la mezcla de construcciones que se pida:
+#   declaraciones, arrays, if/else, for, while, funciones,
+#   procedimientos, clases con métodos, expresiones largas,
+#   Console.WriteLine y comentarios.
+# La misma semilla y los mismos parámetros dan siempre el mismo
+# texto, así las mediciones se pueden repetir y comparar.
+#
+# Uso:
+#   python benchmarks/generador_cs.py [sentencias] [semilla] > programa.cs
+###############################################################
+
+import random
+import sys
+
+# Peso relativo de cada construcción de primer nivel
+MEZCLA = {
+    "declaracion": 6,
+    "arreglo": 1,
+    "asignacion": 4,
+    "if_else": 3,
+    "for": 2,
+    "while": 2,
+    "funcion": 2,
+    "procedimiento": 1,
+    "clase": 1,
+    "expresion_larga": 1,
+    "print": 2,
+    "comentario": 2,
+}
+
+TIPOS_NUMERICOS = ("int", "double")
+
+
+class Generador:
+    """
+    Programas sintéticos reproducibles. `mezcla` reemplaza pesos de
+    MEZCLA (0 desactiva una construcción); `largo_expresion` es la
+    cantidad de operandos de las expresiones largas y `profundidad`
+    el anidamiento máximo de bloques.
+    """
+
+    def __init__(self, semilla=0, mezcla=None, largo_expresion=40, profundidad=3):
+        self.azar = random.Random(semilla)
+        pesos = dict(MEZCLA)
+        pesos.update(mezcla or {})
+        self.construcciones = [c for c, p in pesos.items() if p > 0]
+        self.pesos = [pesos[c] for c in self.construcciones]
+        self.largo_expresion = largo_expresion
+        self.profundidad = profundidad
+        self.contador = 0
+        self.globales = {"int": ["g0"], "double": ["d0"]}
+
+    def _nombre(self, prefijo):
+        self.contador += 1
+        return f"{prefijo}{self.contador}"
+
+    # ==========================
+    # Expresiones
+    # ==========================
+
+    def _literal(self, tipo):
+        if tipo == "int":
+            return str(self.azar.randint(0, 999))
+        return f"{self.azar.randint(0, 99)}.{self.azar.randint(0, 99)}"
+
+    def _operando(self, tipo, variables):
+        candidatos = variables.get(tipo, ())
+        if candidatos and self.azar.random() < 0.7:
+            return self.azar.choice(candidatos)
+        return self._literal(tipo)
+
+    def _expresion(self, tipo, variables, operandos):
+        partes = [self._operando(tipo, variables)]
+        for _ in range(operandos - 1):
+            partes.append(self.azar.choice("+-*"))
+            if self.azar.random() < 0.15:
+                partes.append(f"({self._operando(tipo, variables)} + {self._operando(tipo, variables)})")
+            else:
+                partes.append(self._operando(tipo, variables))
+        return " ".join(partes)
+
+    def _condicion(self, variables):
+        tipo = self.azar.choice(TIPOS_NUMERICOS)
+        op = self.azar.choice(("<", ">", "==", "!=", "<=", ">="))
+        return f"{self._expresion(tipo, variables, 2)} {op} {self._operando(tipo, variables)}"
+
+    # ==========================
+    # Sentencias
+    # ==========================
+
+    def _asignacion(self, variables, sangria):
+        tipo = self.azar.choice(TIPOS_NUMERICOS)
+        if not variables.get(tipo):
+            return f"{sangria}Console.WriteLine({self._literal(tipo)});\n"
+        destino = self.azar.choice(variables[tipo])
+        return f"{sangria}{destino} = {self._expresion(tipo, variables, self.azar.randint(1, 4))};\n"
+
+    def _bloque(self, variables, sangria, nivel):
+        """Cuerpo de if/while/for/función: asignaciones, prints y bloques anidados."""
+        lineas = []
+        for _ in range(self.azar.randint(1, 4)):
+            r = self.azar.random()
+            if r < 0.15 and nivel < self.profundidad:
+                lineas.append(self._if_else(variables, sangria, nivel + 1))
+            elif r < 0.25 and nivel < self.profundidad:
+                lineas.append(self._while(variables, sangria, nivel + 1))
+            elif r < 0.35:
+                lineas.append(f"{sangria}Console.WriteLine({self._operando('int', variables)});\n")
+            else:
+                lineas.append(self._asignacion(variables, sangria))
+        return "".join(lineas)
+
+    def _if_else(self, variables, sangria, nivel=1):
+        dentro = sangria + "    "
+        texto = (f"{sangria}if ({self._condicion(variables)}) {{\n"
+                 f"{self._bloque(variables, dentro, nivel)}{sangria}}}")
+        if self.azar.random() < 0.5:
+            texto += f" else {{\n{self._bloque(variables, dentro, nivel)}{sangria}}}"
+        return texto + "\n"
+
+    def _while(self, variables, sangria, nivel=1):
+        return (f"{sangria}while ({self._condicion(variables)}) {{\n"
+                f"{self._bloque(variables, sangria + '    ', nivel)}{sangria}}}\n")
+
+    def _for(self, variables, sangria, nivel=1):
+        i = self.azar.choice(variables["int"])
+        return (f"{sangria}for ({i} = 0; {i} < {self.azar.randint(1, 100)}; {i} = {i} + 1) {{\n"
+                f"{self._bloque(variables, sangria + '    ', nivel)}{sangria}}}\n")
+
+    def _parametros(self):
+        params = [(self.azar.choice(TIPOS_NUMERICOS), self._nombre("p")) for _ in range(self.azar.randint(0, 3))]
+        visibles = {t: list(v) for t, v in self.globales.items()}
+        for tipo, nombre in params:
+            visibles[tipo].append(nombre)
+        return ", ".join(f"{t} {n}" for t, n in params), visibles
+
+    def _funcion(self, sangria=""):
+        tipo = self.azar.choice(TIPOS_NUMERICOS)
+        params, visibles = self._parametros()
+        dentro = sangria + "    "
+        return (f"{sangria}{tipo} {self._nombre('F')}({params}) {{\n"
+                f"{self._bloque(visibles, dentro, 1)}"
+                f"{dentro}return {self._expresion(tipo, visibles, self.azar.randint(1, 4))};\n"
+                f"{sangria}}}\n")
+
+    def _procedimiento(self):
+        params, visibles = self._parametros()
+        return f"void {self._nombre('P')}({params}) {{\n{self._bloque(visibles, '    ', 1)}}}\n"
+
+    def _clase(self):
+        campos = [(self.azar.choice(TIPOS_NUMERICOS), self._nombre("c")) for _ in range(self.azar.randint(1, 3))]
+        miembros = [f"    {t} {n};\n" for t, n in campos]
+        for _ in range(self.azar.randint(1, 3)):
+            tipo = self.azar.choice(TIPOS_NUMERICOS)
+            params, visibles = self._parametros()
+            for t, n in campos:
+                visibles[t].append(n)
+            miembros.append(
+                f"    {tipo} {self._nombre('M')}({params}) {{\n"
+                f"{self._bloque(visibles, '        ', 2)}"
+                f"        return {self._expresion(tipo, visibles, self.azar.randint(1, 4))};\n"
+                f"    }}\n"
+            )
+        return f"class {self._nombre('C')} {{\n{''.join(miembros)}}}\n"
+
+    def _declaracion(self):
+        tipo = self.azar.choice(TIPOS_NUMERICOS)
+        nombre = self._nombre("v" if tipo == "int" else "d")
+        texto = f"{tipo} {nombre} = {self._expresion(tipo, self.globales, self.azar.randint(1, 3))};\n"
+        self.globales[tipo].append(nombre)
+        return texto
+
+    def _comentario(self):
+        if self.azar.random() < 0.5:
+            return f"// comentario {self.contador}: {'x' * self.azar.randint(0, 60)}\n"
+        lineas = "\n".join(f"   linea {k} del bloque" for k in range(self.azar.randint(1, 4)))
+        return f"/*\n{lineas}\n*/\n"
+
+    def _sentencia(self, construccion):
+        if construccion == "declaracion":
+            return self._declaracion()
+        if construccion == "arreglo":
+            tipo = self.azar.choice(("int", "double", "string"))
+            return f"{tipo}[] {self._nombre('a')} = new {tipo}[{self.azar.randint(1, 500)}];\n"
+        if construccion == "asignacion":
+            return self._asignacion(self.globales, "")
+        if construccion == "if_else":
+            return self._if_else(self.globales, "")
+        if construccion == "for":
+            return self._for(self.globales, "")
+        if construccion == "while":
+            return self._while(self.globales, "")
+        if construccion == "funcion":
+            return self._funcion()
+        if construccion == "procedimiento":
+            return self._procedimiento()
+        if construccion == "clase":
+            return self._clase()
+        if construccion == "expresion_larga":
+            tipo = self.azar.choice(TIPOS_NUMERICOS)
+            nombre = self._nombre("e")
+            texto = f"{tipo} {nombre} = {self._expresion(tipo, self.globales, self.largo_expresion)};\n"
+            self.globales[tipo].append(nombre)
+            return texto
+        if construccion == "print":
+            return f"Console.WriteLine({self._operando('int', self.globales)});\n"
+        return self._comentario()
+
+    def programa(self, sentencias):
+        """Texto de un programa con `sentencias` sentencias de primer nivel."""
+        partes = ["int g0 = 0;\n", "double d0 = 1.5;\n"]
+        elegir = self.azar.choices
+        for construccion in elegir(self.construcciones, self.pesos, k=max(0, sentencias - 2)):
+            partes.append(self._sentencia(construccion))
+        return "".join(partes)
+
+
+def generar(sentencias, semilla=0, mezcla=None, **opciones):
+    """Atajo: Generador(semilla, mezcla, ...).programa(sentencias)."""
+    return Generador(semilla, mezcla, **opciones).programa(sentencias)
+
+
+def main():
+    sentencias = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    semilla = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generar(sentencias, semilla))
+
+
+if __name__ == '__main__':
+    main()
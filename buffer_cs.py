@@ -0,0 +1,133 @@
+###############################################################
+# BUFFER COLUMNAR DE TOKENS
+# PLY pide los tokens de a uno (lexer.token()) y cada uno es un
+# objeto aparte. Cuando el archivo se tokeniza entero de todos modos
+# (sesiones con buffer=True, estadísticas, salida de tokens), se
+# tokeniza de una vez a columnas (LexerRapido.tokenizar_columnas):
+#   tipos    bytearray, índice de cada tipo en lexer_cs.tokens
+#   valores  list: los strings compartidos del lexer (nombres,
+#            palabras reservadas, puntuación) y los números
+#   lineas   array('I')
+#   inicios, fines  array('Q'), offsets en el texto
+# Y de esas mismas columnas sale todo lo demás:
+#   - tokenfunc() para parser.parse: cada token se arma recién
+#     cuando el parser lo pide, desde C (map/zip/next sobre las
+#     columnas), sin código Python por token
+#   - por_tipo(): tokens por tipo para las estadísticas
+#   - columnas_cache(): las columnas en el formato de cache_cs
+#   - columnas_texto() y lexemas(): para salida_cs.escribir_buffer
+#     (tabla, jsonl o bin sin armar tokens)
+# La tokenización en bloque usa siempre el backend rápido, con
+# cualquier LP_CS_LEXER: da los mismos tokens que PLY (ver
+# benchmarks/conformidad_lexer.py).
+#
+# Uso:
+#   buf = buffer_cs.tokenizar(data)
+#   ast = parser.parse(lexer=buf, tokenfunc=buf.tokenfunc())
+###############################################################
+
+from array import array
+from collections import Counter, namedtuple
+from functools import partial
+from itertools import repeat
+from operator import sub
+
+import lexer_cs
+
+# Nombre del tipo de cada código de la columna tipos
+TIPOS = list(lexer_cs.tokens)
+
+
+class TokenBuffer(namedtuple("TokenBuffer", "type value lineno lexpos endlexpos lexer")):
+    """
+    Token que el parser recibe del buffer: una tupla con los mismos
+    atributos que LexToken (más endlexpos, ver parser_cs._ubicar).
+    lexer es el BufferTokens (p_error lee lexer.lexdata).
+    """
+
+    __slots__ = ()
+
+    @property
+    def lexema(self):
+        return self.lexer.lexdata[self.lexpos:self.endlexpos]
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+    __str__ = __repr__
+
+
+# tuple.__new__ con la clase ya puesta: construir un token no pasa por Python
+_token = partial(tuple.__new__, TokenBuffer)
+
+
+class BufferTokens:
+    """
+    Tokens de un texto en columnas (ver arriba). Sirve de `lexer` para
+    parser.parse: tiene lexdata, y errores con los errores léxicos (o
+    None si el lexer los escribió en stderr).
+    """
+
+    __slots__ = ("lexdata", "tipos", "valores", "lineas", "inicios", "fines", "errores")
+
+    def __init__(self, data, columnas, errores=None):
+        self.lexdata = data
+        self.tipos, self.valores, self.lineas, self.inicios, self.fines = columnas
+        self.errores = errores
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def __bool__(self):
+        # Vacío sigue siendo un lexer: parser.parse busca otro si es falso
+        return True
+
+    def tokens(self):
+        """Iterador de TokenBuffer, en orden."""
+        return map(_token, zip(map(TIPOS.__getitem__, self.tipos), self.valores,
+                               self.lineas, self.inicios, self.fines, repeat(self)))
+
+    def tokenfunc(self):
+        """Función sin argumentos que da el siguiente token, y None al final."""
+        return partial(next, self.tokens(), None)
+
+    def por_tipo(self):
+        """Counter tipo de token -> cantidad."""
+        return Counter({TIPOS[k]: n for k, n in Counter(self.tipos).items()})
+
+    def columnas_cache(self):
+        """(tipos, lexpos, lineno, largos) como bytes, igual que cache_cs.columnas_tokens."""
+        largos = array("I", map(sub, self.fines, self.inicios))
+        return bytes(self.tipos), self.inicios.tobytes(), self.lineas.tobytes(), largos.tobytes()
+
+    def columnas_texto(self):
+        """array('I') con la columna (desde 1) de cada token."""
+        # base[k] = inicio de la línea k menos 1: columna = pos - base[linea]
+        base = [0]
+        base.extend(s - 1 for s in lexer_cs.get_line_index(self.lexdata).starts)
+        return array("I", map(sub, self.inicios, map(base.__getitem__, self.lineas)))
+
+    def lexemas(self, desde=0, hasta=None):
+        """Texto de los tokens desde..hasta en el fuente."""
+        return list(map(self.lexdata.__getitem__,
+                        map(slice, self.inicios[desde:hasta], self.fines[desde:hasta])))
+
+
+def nuevo_lexer():
+    """LexerRapido propio para tokenizar (el de get_lexer() si ya es el rápido)."""
+    lexer = lexer_cs.get_lexer()
+    if isinstance(lexer, lexer_cs.LexerRapido):
+        return lexer.clone()
+    return lexer_cs.build_lexer_rapido()
+
+
+def tokenizar(data, lexer=None):
+    """
+    BufferTokens de data. lexer: un LexerRapido (por defecto uno
+    nuevo); sus errores van a lexer.errores si lo tiene.
+    """
+    if lexer is None:
+        lexer = nuevo_lexer()
+    lexer.lineno = 1
+    columnas = lexer.tokenizar_columnas(data)
+    return BufferTokens(data, columnas, getattr(lexer, "errores", None))
@@ -0,0 +1,371 @@
+###############################################################
+# CACHÉ EN DISCO DE TOKENS Y AST (direccionada por contenido)
+# Un archivo que no cambió no se vuelve a tokenizar ni a parsear:
+# SesionAnalisis busca primero su entrada acá.
+#
+# Clave: hash del fuente + firma del código que lo analiza (tokens y
+# patrones del lexer, gramática, y el texto de los módulos que arman
+# tokens y AST: si cambia una acción del parser o el plegado, cambia
+# la clave). Cada entrada es un archivo <dir>/<2 hex>/<clave>.ast
+# con MAGICO y, comprimido con zlib, el marshal de:
+#   - errores léxicos y sintácticos (se informan igual que sin caché)
+#   - tokens en columnas: tipo (1 byte), lexpos, lineno y largo del
+#     lexema; el texto y el valor se recuperan del fuente
+#   - el AST en formato plano (ast_cs.a_plano)
+# marshal no ejecuta código al cargar, pero igual el directorio de
+# la caché no debe poder escribirlo cualquiera.
+#
+# Escrituras atómicas: cada proceso/hilo escribe un temporal propio
+# y lo renombra (os.replace); varios procesos pueden usar el mismo
+# directorio a la vez. Una entrada que no se puede leer se borra y
+# cuenta como fallo.
+#
+# Tamaño máximo con desalojo LRU: cada acierto actualiza el mtime
+# de la entrada; cuando el total (estimado por proceso y recontado
+# al pasarse) supera max_bytes se borran las de mtime más viejo
+# hasta quedar en FRACCION_PODA del máximo.
+#
+# Uso:
+#   python batch_cs.py src/ --cache [DIR] [--cache-max-mb MB]
+#   python cache_cs.py [--dir DIR] estado|podar|limpiar
+###############################################################
+
+import marshal
+import os
+import sys
+import threading
+import time
+import zlib
+from array import array
+
+import ast_cs
+import lexer_cs
+
+MAGICO = b"LPCSAST1"
+FORMATO = 1
+DIRECTORIO = os.environ.get("LP_CS_CACHE_ANALISIS", os.path.join(lexer_cs.CACHE_DIR, "analisis"))
+MAX_BYTES = 256 << 20
+FRACCION_PODA = 0.8
+EXTENSION = ".ast"
+NIVEL_ZLIB = 1
+# Temporales de procesos que murieron a mitad de una escritura
+VIDA_TEMPORAL = 3600
+
+# Módulos cuyo texto entra en la clave: arman los tokens y el AST
+MODULOS_CLAVE = ("lexer_cs", "parser_cs", "ast_cs", "plegado_cs")
+
+_firma_codigo = None
+
+
+def firma_codigo():
+    """Firma del lexer, la gramática y el código que arma tokens y AST (una vez por proceso)."""
+    global _firma_codigo
+    if _firma_codigo is None:
+        import hashlib
+        import parser_cs
+
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr((FORMATO, marshal.version, lexer_cs.firma_lexer(), parser_cs.firma_gramatica())).encode())
+        for nombre in MODULOS_CLAVE:
+            __import__(nombre)
+            with open(sys.modules[nombre].__file__, "rb") as f:
+                h.update(f.read())
+        _firma_codigo = h.digest()
+    return _firma_codigo
+
+
+# ==========================
+# Tokens en columnas
+# ==========================
+
+_TIPOS = list(lexer_cs.tokens)
+_INDICE_TIPO = {t: i for i, t in enumerate(_TIPOS)}
+_CONVERSIONES = {"FLOAT_LITERAL": float, "INT_LITERAL": int}
+_NOMBRES = frozenset(["IDENTIFIER", *lexer_cs.reserved.values()])
+
+
+def columnas_tokens(toks):
+    """(tipos, lexpos, lineno, largos) como bytes de una lista de tokens."""
+    indice = _INDICE_TIPO
+    lexema = lexer_cs.lexema
+    tipos = bytes(indice[t.type] for t in toks)
+    posiciones = array("Q", [t.lexpos for t in toks])
+    lineas = array("I", [t.lineno for t in toks])
+    largos = array("I", [len(lexema(t)) for t in toks])
+    return tipos, posiciones.tobytes(), lineas.tobytes(), largos.tobytes()
+
+
+def registrar_tokens(siguiente):
+    """
+    (tokenfunc, columnas) para el parser: tokenfunc entrega los tokens
+    de siguiente() y los anota en columnas al pasar, sin guardar los
+    objetos; columnas() devuelve lo mismo que columnas_tokens.
+    """
+    tipos, posiciones, lineas, largos = bytearray(), array("Q"), array("I"), array("I")
+    anotar_tipo, anotar_pos = tipos.append, posiciones.append
+    anotar_linea, anotar_largo = lineas.append, largos.append
+    indice = _INDICE_TIPO
+    lexema = lexer_cs.lexema
+
+    def tokenfunc():
+        tok = siguiente()
+        if tok is not None:
+            anotar_tipo(indice[tok.type])
+            anotar_pos(tok.lexpos)
+            anotar_linea(tok.lineno)
+            valor = tok.value
+            anotar_largo(len(valor) if type(valor) is str else len(lexema(tok)))
+        return tok
+
+    def columnas():
+        return bytes(tipos), posiciones.tobytes(), lineas.tobytes(), largos.tobytes()
+
+    return tokenfunc, columnas
+
+
+def tokens_de_columnas(columnas, data):
+    """Tokens (lexer_cs.TokenRapido) de las columnas de columnas_tokens sobre su fuente."""
+    tipos, posiciones, lineas, largos = columnas
+    posiciones, lineas, largos = array("Q", posiciones), array("I", lineas), array("I", largos)
+    nombre = lexer_cs.nombre
+    Token = lexer_cs.TokenRapido
+    toks = []
+    for k, pos, linea, largo in zip(tipos, posiciones, lineas, largos):
+        tipo = _TIPOS[k]
+        texto = data[pos:pos + largo]
+        if tipo in _NOMBRES:
+            tok = Token(tipo, nombre(texto)[1], linea, pos, None)
+        elif tipo in _CONVERSIONES:
+            tok = Token(tipo, _CONVERSIONES[tipo](texto), linea, pos, None)
+            if repr(tok.value) != texto:
+                tok.lexema = texto
+        else:
+            tok = Token(tipo, texto, linea, pos, None)
+        toks.append(tok)
+    return toks
+
+
+class Entrada:
+    """Contenido de una entrada; el AST y los tokens se arman al pedirlos."""
+
+    __slots__ = ("data", "errores_lexicos", "errores_sintacticos", "columnas", "plano")
+
+    def __init__(self, data, errores_lexicos, errores_sintacticos, columnas, plano):
+        self.data = data
+        self.errores_lexicos = errores_lexicos
+        self.errores_sintacticos = errores_sintacticos
+        self.columnas = columnas
+        self.plano = plano
+
+    def ast(self):
+        """AST nuevo (cada llamada arma nodos propios)."""
+        return ast_cs.desde_plano(self.plano)
+
+    def tokens(self):
+        """Lista de tokens, o None si la entrada se guardó sin ellos."""
+        if self.columnas is None:
+            return None
+        return tokens_de_columnas(self.columnas, self.data)
+
+
+# ==========================
+# Caché
+# ==========================
+
+class CacheAnalisis:
+    """
+    Caché de tokens y AST en `directorio`. Con tokens=False se guarda
+    solo el AST (entradas más chicas). Una instancia se puede usar
+    desde varios hilos.
+    """
+
+    def __init__(self, directorio=None, max_bytes=MAX_BYTES, tokens=True):
+        self.directorio = directorio or DIRECTORIO
+        self.max_bytes = max_bytes
+        self.tokens = tokens
+        self.aciertos = 0
+        self.fallos = 0
+        self.escrituras = 0
+        self.desalojos = 0
+        self.corruptas = 0
+        self.bytes_leidos = 0
+        self.bytes_escritos = 0
+        self._estimado = None       # bytes en disco según este proceso; None = sin contar
+        self._lock = threading.Lock()
+
+    def clave(self, data):
+        import hashlib
+
+        h = hashlib.blake2b(firma_codigo(), digest_size=20)
+        h.update(data.encode("utf-8", "surrogatepass"))
+        return h.hexdigest()
+
+    def _path(self, clave):
+        return os.path.join(self.directorio, clave[:2], clave + EXTENSION)
+
+    # ==========================
+    # Lectura
+    # ==========================
+
+    def buscar(self, data, clave=None):
+        """Entrada de data, o None si no está (cuenta acierto o fallo)."""
+        path = self._path(clave or self.clave(data))
+        try:
+            with open(path, "rb") as f:
+                contenido = f.read()
+        except OSError:
+            self.fallos += 1
+            return None
+        try:
+            if not contenido.startswith(MAGICO):
+                raise ValueError("sin MAGICO")
+            errores_lexicos, errores_sintacticos, columnas, plano = marshal.loads(
+                zlib.decompress(memoryview(contenido)[len(MAGICO):]))
+        except (ValueError, EOFError, TypeError, zlib.error):
+            self.corruptas += 1
+            self.fallos += 1
+            self._borrar(path)
+            return None
+        try:
+            os.utime(path)          # más reciente para el LRU
+        except OSError:
+            pass                    # otro proceso la desalojó: el contenido ya está leído
+        self.aciertos += 1
+        self.bytes_leidos += len(contenido)
+        return Entrada(data, errores_lexicos, errores_sintacticos, columnas, plano)
+
+    # ==========================
+    # Escritura
+    # ==========================
+
+    def guardar(self, data, ast, errores_lexicos=(), errores_sintacticos=(), columnas=None, clave=None):
+        """
+        Guarda el resultado de analizar data; columnas son los tokens
+        de columnas_tokens/registrar_tokens (o None). Devuelve False si
+        no se pudo escribir (disco lleno, permisos): la caché nunca hace
+        fallar un análisis.
+        """
+        if not self.tokens:
+            columnas = None
+        contenido = MAGICO + zlib.compress(marshal.dumps(
+            (list(errores_lexicos), list(errores_sintacticos), columnas, ast_cs.a_plano(ast))), NIVEL_ZLIB)
+        path = self._path(clave or self.clave(data))
+        temporal = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temporal, "wb") as f:
+                f.write(contenido)
+            os.replace(temporal, path)
+        except OSError:
+            self._borrar(temporal)
+            return False
+        self.escrituras += 1
+        self.bytes_escritos += len(contenido)
+        with self._lock:
+            if self._estimado is not None:
+                self._estimado += len(contenido)
+            if self._estimado is None or self._estimado > self.max_bytes:
+                self.podar()
+        return True
+
+    # ==========================
+    # Desalojo
+    # ==========================
+
+    def _entradas(self):
+        """[(mtime, tamaño, path)] de las entradas; borra temporales abandonados."""
+        entradas = []
+        limite_temporal = time.time() - VIDA_TEMPORAL
+        try:
+            subdirs = [e.path for e in os.scandir(self.directorio) if e.is_dir()]
+        except OSError:
+            return entradas
+        for subdir in subdirs:
+            try:
+                archivos = list(os.scandir(subdir))
+            except OSError:
+                continue
+            for e in archivos:
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue        # borrada por otro proceso
+                if e.name.endswith(EXTENSION):
+                    entradas.append((st.st_mtime, st.st_size, e.path))
+                elif e.name.endswith(".tmp") and st.st_mtime < limite_temporal:
+                    self._borrar(e.path)
+        return entradas
+
+    def podar(self, max_bytes=None):
+        """Recuenta el disco y desaloja las entradas menos usadas si se pasa del máximo."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entradas = self._entradas()
+        total = sum(tam for _, tam, _ in entradas)
+        if total > max_bytes:
+            objetivo = max_bytes * FRACCION_PODA
+            entradas.sort()
+            for _, tam, path in entradas:
+                if total <= objetivo:
+                    break
+                if self._borrar(path):
+                    self.desalojos += 1
+                total -= tam        # si no se pudo borrar, otro proceso ya lo hizo
+        self._estimado = total
+        return total
+
+    def limpiar(self):
+        """Borra todas las entradas."""
+        return self.podar(0)
+
+    @staticmethod
+    def _borrar(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    # ==========================
+    # Estadísticas
+    # ==========================
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0,
+            "escrituras": self.escrituras,
+            "desalojos": self.desalojos,
+            "corruptas": self.corruptas,
+            "bytes_leidos": self.bytes_leidos,
+            "bytes_escritos": self.bytes_escritos,
+        }
+
+
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Caché en disco de tokens y AST.")
+    ap.add_argument("accion", choices=("estado", "podar", "limpiar"))
+    ap.add_argument("--dir", default=None, help=f"directorio de la caché (por defecto {DIRECTORIO})")
+    ap.add_argument("--max-mb", type=float, default=MAX_BYTES / (1 << 20), help="tamaño máximo para podar")
+    args = ap.parse_args(argv)
+
+    cache = CacheAnalisis(args.dir, max_bytes=int(args.max_mb * (1 << 20)))
+    if args.accion == "estado":
+        entradas = cache._entradas()
+        total = sum(tam for _, tam, _ in entradas)
+        print(f"{cache.directorio}: {len(entradas)} entradas, {total / (1 << 20):.1f} MB "
+              f"(máximo {cache.max_bytes / (1 << 20):.0f} MB)")
+    elif args.accion == "podar":
+        total = cache.podar()
+        print(f"{cache.desalojos} entradas desalojadas; quedan {total / (1 << 20):.1f} MB")
+    else:
+        cache.limpiar()
+        print(f"{cache.desalojos} entradas borradas")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
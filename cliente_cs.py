@@ -0,0 +1,133 @@
+###############################################################
+# CLIENTE DEL SERVIDOR DE ANÁLISIS (servidor_cs.py)
+# Envía la petición por el socket Unix y escribe la respuesta igual
+# que lexer_cs.py / parser_cs.py. Si no hay servidor escuchando,
+# hace el mismo análisis en el proceso (más lento: construye todo).
+# Solo importa módulos livianos mientras haya servidor.
+#
+# Uso:
+#   python cliente_cs.py lex|parse|check <archivo.cs> [-f formato] [-o salida]
+#                        [--socket RUTA] [--local] [-v]
+#   python cliente_cs.py ping|apagar [--socket RUTA]
+###############################################################
+
+import json
+import os
+import socket
+import sys
+import tempfile
+import time
+
+
+def socket_por_defecto():
+    # Igual que servidor_cs.socket_por_defecto (no se importa: arrastra PLY)
+    return os.environ.get(
+        "LP_CS_SOCKET",
+        os.path.join(tempfile.gettempdir(), f"lp_cs-{os.getuid()}.sock"),
+    )
+
+
+class Cliente:
+    """Conexión a un servidor; admite varias peticiones seguidas."""
+
+    def __init__(self, path=None, timeout=None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(path or socket_por_defecto())
+        except OSError:
+            self.sock.close()
+            raise
+        self._entrada = self.sock.makefile("rb")
+
+    def pedir(self, peticion):
+        self.sock.sendall(json.dumps(peticion, ensure_ascii=False).encode("utf-8") + b"\n")
+        linea = self._entrada.readline()
+        if not linea:
+            raise ConnectionError("el servidor cerró la conexión")
+        return json.loads(linea)
+
+    def close(self):
+        self._entrada.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def pedir_local(peticion):
+    """Misma respuesta que el servidor, pero analizando en este proceso."""
+    import servidor_cs
+    from sesion_cs import SesionAnalisis
+
+    inicio = time.perf_counter()
+    respuesta = servidor_cs.ejecutar(SesionAnalisis(), peticion)
+    respuesta["ms"] = round((time.perf_counter() - inicio) * 1000, 3)
+    return respuesta
+
+
+def pedir(peticion, path=None, local=False):
+    """Respuesta del servidor, o del análisis local si no hay servidor. Devuelve (respuesta, remoto)."""
+    if not local:
+        try:
+            with Cliente(path) as cliente:
+                return cliente.pedir(peticion), True
+        except (FileNotFoundError, ConnectionRefusedError):
+            pass
+    return pedir_local(peticion), False
+
+
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Cliente del servidor de análisis C#.")
+    ap.add_argument("op", choices=("lex", "parse", "check", "ping", "apagar"))
+    ap.add_argument("archivo", nargs="?", help="archivo .cs")
+    ap.add_argument("-f", "--formato", default=None,
+                    help="lex: tabla|jsonl; parse: texto|json|jsonl")
+    ap.add_argument("-o", "--salida", default=None, help="archivo de salida (por defecto stdout)")
+    ap.add_argument("--socket", default=None, help="ruta del socket (LP_CS_SOCKET)")
+    ap.add_argument("--local", action="store_true", help="no usar el servidor")
+    ap.add_argument("-v", "--verbose", action="store_true", help="informar latencia y origen")
+    args = ap.parse_args(argv)
+
+    inicio = time.perf_counter()
+    if args.op in ("ping", "apagar"):
+        try:
+            with Cliente(args.socket) as cliente:
+                respuesta = cliente.pedir({"op": args.op})
+        except OSError as e:
+            sys.stderr.write(f"Error: no hay servidor ({e})\n")
+            return 1
+        sys.stdout.write(f"{args.op}: servidor pid {respuesta.get('pid')} ({respuesta['ms']:.3f} ms)\n")
+        return 0
+
+    if not args.archivo:
+        ap.error("falta el archivo .cs")
+    peticion = {"op": args.op, "archivo": os.path.abspath(args.archivo)}
+    if args.formato:
+        peticion["formato"] = args.formato
+    respuesta, remoto = pedir(peticion, args.socket, args.local)
+
+    if not respuesta["ok"]:
+        sys.stderr.write(f"Error: {respuesta['error']}\n")
+        return 1
+    if args.salida:
+        with open(args.salida, 'w', encoding="utf-8") as out:
+            out.write(respuesta["salida"])
+    else:
+        sys.stdout.write(respuesta["salida"])
+    for mensaje in respuesta["errores"]:
+        sys.stderr.write(mensaje + "\n")
+    if args.verbose:
+        total = (time.perf_counter() - inicio) * 1000
+        origen = "servidor" if remoto else "local"
+        sys.stderr.write(f"[{origen}] análisis {respuesta['ms']:.3f} ms, total {total:.3f} ms\n")
+    return 2 if args.op == "check" and respuesta["errores"] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
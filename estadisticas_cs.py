@@ -0,0 +1,251 @@
+###############################################################
+# MODO ESTADÍSTICAS (--stats)
+# Mide una corrida del lexer, el parser y el semántico por separado
+# para saber a dónde se fue el tiempo:
+#   - por fase: tiempo de reloj y pico de memoria (tracemalloc)
+#   - lexer:     cantidad de tokens por tipo (en estadisticas_cs.py y
+#                parser_cs --stats la fase lexer es la tokenización en
+#                bloque a un buffer columnar, ver buffer_cs)
+#   - parser:    reducciones por regla de la gramática (función p_*)
+#   - semántico: llamadas y tiempo total de cada regla semántica
+#                (regla_if, regla_for, regla_while, regla_return_*...)
+#                y de cada tipo de sentencia visitada
+# El reporte sale como texto o como JSON.
+#
+# Nada de esto toca el camino normal: solo en este modo se usa una
+# copia del parser con las reducciones envueltas, una tabla de
+# despacho propia en el ContextoSemantico y las reglas_* envueltas
+# mientras dura el análisis. Sin --stats el costo es cero.
+# (El envoltorio de las reglas es global al proceso: no usar el modo
+# estadísticas con otros análisis corriendo en otros hilos.)
+#
+# Uso:
+#   python estadisticas_cs.py <archivo.cs> [--json] [--sin-memoria] [--sin-semantico]
+#   python parser_cs.py <archivo.cs> --stats [texto|json]
+#   python lexer_cs.py <archivo.cs> --stats [texto|json]
+###############################################################
+
+import copy
+import json
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+import buffer_cs
+import parser_cs
+
+MODULOS_REGLAS = ("semantico_daniel", "semantico_juan", "semantico_kiara")
+
+
+class Estadisticas:
+    """Contadores de una corrida. `memoria=False` no usa tracemalloc (tiempos más limpios)."""
+
+    def __init__(self, memoria=True):
+        self.memoria = memoria
+        self.fases = {}                     # fase -> {"ms": ..., "pico_kb": ...}
+        self.tokens_por_tipo = Counter()
+        self.reducciones = Counter()        # función p_* -> reducciones
+        self.reglas = {}                    # regla semántica -> [llamadas, segundos]
+        self.sentencias = {}                # tag de sentencia -> [visitas, segundos]
+
+    @contextmanager
+    def fase(self, nombre):
+        if self.memoria:
+            ya_activo = tracemalloc.is_tracing()
+            if not ya_activo:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            datos = {"ms": round((time.perf_counter() - inicio) * 1000, 3)}
+            if self.memoria:
+                datos["pico_kb"] = round((tracemalloc.get_traced_memory()[1] - base) / 1024, 1)
+                if not ya_activo:
+                    tracemalloc.stop()
+            self.fases[nombre] = datos
+
+    # ==========================
+    # Reporte
+    # ==========================
+
+    def como_dict(self):
+        def llamadas(tabla):
+            return {nombre: {"llamadas": n, "ms": round(s * 1000, 3)}
+                    for nombre, (n, s) in sorted(tabla.items(), key=lambda x: -x[1][1]) if n}
+
+        return {
+            "fases": self.fases,
+            "tokens": sum(self.tokens_por_tipo.values()),
+            "tokens_por_tipo": dict(self.tokens_por_tipo.most_common()),
+            "reducciones": sum(self.reducciones.values()),
+            "reducciones_por_regla": dict(self.reducciones.most_common()),
+            "reglas_semanticas": llamadas(self.reglas),
+            "sentencias": llamadas(self.sentencias),
+        }
+
+    def como_json(self):
+        return json.dumps(self.como_dict(), indent=2, ensure_ascii=False)
+
+    def como_texto(self):
+        d = self.como_dict()
+        lineas = ["=== Estadísticas ===", "", "Fases:"]
+        if self.memoria:
+            lineas[-1] = "Fases (tiempos medidos con tracemalloc activo):"
+        for fase, datos in d["fases"].items():
+            pico = f"  pico {datos['pico_kb']:10.1f} KB" if "pico_kb" in datos else ""
+            lineas.append(f"  {fase:<12} {datos['ms']:10.1f} ms{pico}")
+        if d["tokens"]:
+            lineas += ["", f"Tokens por tipo ({d['tokens']}):"]
+            lineas += [f"  {t:<24} {n:>10}" for t, n in d["tokens_por_tipo"].items()]
+        if d["reducciones"]:
+            lineas += ["", f"Reducciones por regla ({d['reducciones']}):"]
+            lineas += [f"  {r:<24} {n:>10}" for r, n in d["reducciones_por_regla"].items()]
+        for titulo, clave in (("Reglas semánticas", "reglas_semanticas"), ("Sentencias", "sentencias")):
+            if d[clave]:
+                lineas += ["", f"{titulo}:", f"  {'':<38} {'llamadas':>10} {'ms':>10}"]
+                lineas += [f"  {nombre:<38} {x['llamadas']:>10} {x['ms']:>10.2f}" for nombre, x in d[clave].items()]
+        return "\n".join(lineas) + "\n"
+
+    def escribir(self, out, formato="texto"):
+        out.write(self.como_json() + "\n" if formato == "json" else self.como_texto())
+
+
+# ==========================
+# Instrumentación
+# ==========================
+
+def contar_tokens(toks, est):
+    """Pasa los tokens de toks contando cuántos hay de cada tipo."""
+    cuenta = est.tokens_por_tipo
+    for tok in toks:
+        cuenta[tok.type] += 1
+        yield tok
+
+
+def parser_instrumentado(est, parser=None):
+    """Copia del parser cuyas reducciones cuentan en est.reducciones (por función p_*)."""
+    parser = copy.copy(parser or parser_cs.get_parser())
+    producciones = []
+    for prod in parser.productions:
+        prod = copy.copy(prod)
+        if prod.callable is not None:
+            prod.callable = _contar_reduccion(prod.callable, prod.func, est.reducciones)
+        producciones.append(prod)
+    parser.productions = producciones
+    return parser
+
+
+def _contar_reduccion(funcion, nombre, cuenta):
+    def reducir(p):
+        cuenta[nombre] += 1
+        funcion(p)
+    return reducir
+
+
+def _medir(funcion, nombre, tabla):
+    registro = tabla.setdefault(nombre, [0, 0.0])
+    reloj = time.perf_counter
+
+    def medida(*args):
+        inicio = reloj()
+        try:
+            return funcion(*args)
+        finally:
+            registro[0] += 1
+            registro[1] += reloj() - inicio
+    return medida
+
+
+@contextmanager
+def reglas_instrumentadas(est):
+    """Envuelve las regla_* de los módulos semánticos mientras dura el bloque."""
+    import importlib
+
+    originales = []
+    for nombre_modulo in MODULOS_REGLAS:
+        modulo = importlib.import_module(nombre_modulo)
+        for nombre in dir(modulo):
+            if nombre.startswith("regla_"):
+                funcion = getattr(modulo, nombre)
+                originales.append((modulo, nombre, funcion))
+                setattr(modulo, nombre, _medir(funcion, nombre, est.reglas))
+    try:
+        yield
+    finally:
+        for modulo, nombre, funcion in originales:
+            setattr(modulo, nombre, funcion)
+
+
+def contexto_instrumentado(est):
+    """ContextoSemantico con su propia tabla de despacho que mide cada tipo de sentencia."""
+    import ast_cs
+    import semantico_comun
+
+    ctx = semantico_comun.ContextoSemantico()
+    tabla = list(ctx._SENTENCIAS)
+    for cls in ast_cs.NODOS:
+        if tabla[cls.kind] is not None:
+            tabla[cls.kind] = _medir(tabla[cls.kind], cls.tag, est.sentencias)
+    ctx._SENTENCIAS = tabla   # atributo de la instancia: la clase no cambia
+    return ctx
+
+
+# ==========================
+# Corrida completa
+# ==========================
+
+def analizar(data, est=None, semantico=True):
+    """
+    Lexer, parser y (si semantico) análisis semántico de data con
+    estadísticas. Devuelve (ast, errores semánticos, est).
+    """
+    est = est or Estadisticas()
+    lexer = buffer_cs.nuevo_lexer()
+    lexer.errores = []
+    # El lexer llena un buffer columnar (sin un objeto por token): la
+    # cuenta por tipo sale de sus columnas y el parser lo consume
+    with est.fase("lexer"):
+        buf = buffer_cs.tokenizar(data, lexer)
+    est.tokens_por_tipo.update(buf.por_tipo())
+
+    parser = parser_instrumentado(est)
+    with est.fase("parser"):
+        ast = parser.parse(lexer=buf, tokenfunc=buf.tokenfunc())
+
+    errores = []
+    if semantico and ast is not None:
+        ctx = contexto_instrumentado(est)
+        with est.fase("semantico"), reglas_instrumentadas(est):
+            errores = ctx.analizar_programa(ast)
+    return ast, errores, est
+
+
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Estadísticas de lexer, parser y semántico de un archivo C#.")
+    ap.add_argument("archivo", help="archivo .cs")
+    ap.add_argument("--json", action="store_true", help="reporte en JSON")
+    ap.add_argument("--sin-memoria", action="store_true", help="no medir memoria (tiempos sin tracemalloc)")
+    ap.add_argument("--sin-semantico", action="store_true", help="solo lexer y parser")
+    args = ap.parse_args(argv)
+
+    try:
+        with open(args.archivo, 'r') as f:
+            data = f.read()
+    except FileNotFoundError:
+        sys.stderr.write(f"Error: Archivo '{args.archivo}' no encontrado.\n")
+        return 1
+
+    _, _, est = analizar(data, Estadisticas(memoria=not args.sin_memoria), semantico=not args.sin_semantico)
+    est.escribir(sys.stdout, "json" if args.json else "texto")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
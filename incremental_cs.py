@@ -0,0 +1,571 @@
+###############################################################
+# RE-ANÁLISIS INCREMENTAL
+# DocumentoIncremental guarda el texto y sus sentencias de primer
+# nivel, cada una en una Entrada con su AST, sus errores y los
+# nombres que declara y usa. Al editar:
+#   1. se ubican las entradas que tocan el rango editado,
+#   2. se re-parsea solo el texto entre la entrada anterior y la
+#      siguiente que no cambiaron (el lexer recorre el texto completo
+#      desde lexpos, así líneas, columnas y offsets salen absolutos),
+#   3. se re-chequean las entradas nuevas y las que declaran o usan
+#      algún nombre declarado por las entradas quitadas o las nuevas.
+#
+# La tabla de símbolos es global y secuencial: una entrada ve la
+# PRIMERA declaración de cada nombre hecha por una entrada anterior
+# (con `orden` menor), igual que en un análisis completo.
+#
+# Las entradas se agrupan en bloques con un desplazamiento común, así
+# una edición no recorre todas las entradas siguientes para corregir
+# sus offsets y líneas. errores() se recalcula solo si algo cambió.
+#
+# Si la región re-parseada tiene errores se amplía (a una entrada
+# vecina por lado y, si el error está al final de la región o un
+# token/comentario la cruza, al doble hacia adelante). Con errores
+# sintácticos el resultado puede diferir de un análisis completo en
+# cómo se recupera el parser después del primer error.
+#
+#   doc = DocumentoIncremental(codigo)
+#   doc.editar(inicio, fin, "texto nuevo")
+#   doc.errores()   # mismas listas que SesionAnalisis.analizar
+###############################################################
+
+from bisect import bisect_left, bisect_right
+
+import ast_cs
+import semantico_comun
+from sesion_cs import SesionAnalisis
+
+ESPACIO_ORDEN = 1 << 20
+
+
+class Entrada:
+    """
+    Sentencia de primer nivel (o región con errores, que puede tener
+    varias sentencias). inicio/fin/linea son relativos al desplazamiento
+    de su bloque.
+    """
+
+    __slots__ = (
+        "nodos", "orden", "inicio", "fin", "linea", "bloque",
+        "desde", "hasta", "base", "clave_errores",
+        "errores_lexicos", "errores_sintacticos", "errores_semanticos",
+        "simbolos", "declara", "usa",
+    )
+
+    def __init__(self, nodos, inicio, fin, linea, desde=None, hasta=None):
+        self.nodos = nodos
+        self.orden = 0
+        self.inicio = inicio
+        self.fin = fin
+        self.linea = linea
+        self.bloque = None
+        # Tramo de las sentencias (sin espacios alrededor) y offset con el
+        # que se ubicaron los nodos; se corrigen juntos en DocumentoIncremental.ast
+        self.desde = inicio if desde is None else desde
+        self.hasta = fin if hasta is None else hasta
+        self.base = inicio
+        self.clave_errores = None   # (inicio, línea, columna) de los mensajes
+        self.errores_lexicos = []
+        self.errores_sintacticos = []
+        self.errores_semanticos = []
+        self.simbolos = {}
+        self.declara = frozenset()
+        self.usa = frozenset()
+
+
+def _orden(entrada):
+    return entrada.orden
+
+
+def _trocear(entradas):
+    """Reparte las entradas (en coordenadas absolutas) en bloques nuevos."""
+    return [_Bloque(entradas[i:i + TAM_BLOQUE]) for i in range(0, len(entradas), TAM_BLOQUE)]
+
+
+# ==========================
+# Semántico por entrada
+# ==========================
+
+class _ContextoEntrada(semantico_comun.ContextoSemantico):
+    """
+    ContextoSemantico que anota qué nombres globales declara la entrada
+    y qué nombres usa. Lo que no declara se busca en las entradas
+    anteriores a través de `resolver` (solo ven los globales).
+    """
+
+    def __init__(self, resolver):
+        super().__init__()
+        self.symbol_table = semantico_comun.TablaSimbolos(resolver)
+        self.declara = set()
+        self.usa = set()
+
+    def declare_symbol(self, name, sym_type, kind, extra=None):
+        # Los locales de funciones, clases y bloques no afectan a otras entradas
+        if self.symbol_table.nivel == 0:
+            self.declara.add(name)
+        super().declare_symbol(name, sym_type, kind, extra)
+
+    def lookup_symbol(self, name):
+        self.usa.add(name)
+        return super().lookup_symbol(name)
+
+
+def _sin_simbolos(name):
+    return None
+
+
+# ==========================
+# Parseo de una región del texto
+# ==========================
+
+class _SesionRegion(SesionAnalisis):
+    """Sesión que además avisa si el error sintáctico fue al final de la región."""
+
+    def _p_error(self, p):
+        if p is None:
+            self.error_al_final = True
+        super()._p_error(p)
+
+    def parsear_region(self, texto, inicio, fin, linea):
+        """
+        Parsea texto[inicio:fin] sin copiarlo. Devuelve (programa,
+        hubo_tokens, cruzo): `programa` es el Program de la región (o
+        None) y `cruzo` indica que un token o comentario siguió más
+        allá de fin.
+        """
+        self._reiniciar()
+        self.error_al_final = False
+        lexer = self.lexer
+        lexer.input(texto)
+        lexer.lexpos = inicio
+        lexer.lexlen = fin
+        lexer.lineno = linea
+
+        token = lexer.token
+        vistos = []
+
+        def siguiente():
+            tok = token()
+            if tok is not None and not vistos:
+                vistos.append(tok)
+            return tok
+
+        ast = self.parser.parse(lexer=lexer, tokenfunc=siguiente)
+        # Al terminar, el lexer (PLY y el rápido) deja lexpos uno más allá
+        # de lo que consumió; los t_ignore finales no cuentan como cruce.
+        consumido = lexer.lexpos - 1
+        cruzo = consumido > fin and texto[fin:consumido].strip(" \t") != ""
+        if not vistos:
+            self.errores_sintacticos = []   # región sin tokens: no es un error
+        return ast, bool(vistos), cruzo
+
+
+# ==========================
+# Documento
+# Las entradas se agrupan en bloques de hasta ~TAM_BLOQUE. Cada
+# bloque guarda un desplazamiento (offset y línea) que vale para todas
+# sus entradas: una edición corrige las entradas de los bloques que
+# toca y solo suma el delta a los bloques siguientes.
+# ==========================
+
+TAM_BLOQUE = 64
+
+
+class _Bloque:
+    __slots__ = ("entradas", "delta", "delta_linea")
+
+    def __init__(self, entradas):
+        self.entradas = entradas
+        self.delta = 0
+        self.delta_linea = 0
+        for e in entradas:
+            e.bloque = self
+
+
+def _fin_bloque(bloque):
+    return bloque.entradas[-1].fin + bloque.delta
+
+
+def _fin(entrada):
+    return entrada.fin
+
+
+class DocumentoIncremental:
+
+    def __init__(self, texto=""):
+        self.texto = ""
+        self._bloques = []
+        self._declarantes = {}           # nombre -> entradas que lo declaran
+        self._usuarios = {}              # nombre -> entradas que lo declaran o usan
+        self._con_errores = set()
+        self._errores = None             # caché de errores()
+        self._sesion = _SesionRegion()
+        if texto:
+            self.editar(0, 0, texto)
+
+    # ---------- posiciones ----------
+
+    def _absoluta(self, e):
+        """(inicio, fin, linea) absolutos de una entrada."""
+        b = e.bloque
+        return e.inicio + b.delta, e.fin + b.delta, e.linea + b.delta_linea
+
+    def _acumulado(self):
+        """Índice global de la primera entrada de cada bloque (y el total al final)."""
+        acumulado = [0]
+        for b in self._bloques:
+            acumulado.append(acumulado[-1] + len(b.entradas))
+        return acumulado
+
+    def _entrada(self, acumulado, g):
+        bi = bisect_right(acumulado, g) - 1
+        return self._bloques[bi].entradas[g - acumulado[bi]]
+
+    def _buscar(self, acumulado, pos):
+        """Índice global de la primera entrada que termina en pos o después."""
+        bloques = self._bloques
+        bi = bisect_left(bloques, pos, key=_fin_bloque)
+        if bi == len(bloques):
+            return acumulado[-1]
+        b = bloques[bi]
+        return acumulado[bi] + bisect_left(b.entradas, pos - b.delta, key=_fin)
+
+    def entradas(self):
+        """Todas las entradas en orden del documento."""
+        return [e for b in self._bloques for e in b.entradas]
+
+    # ---------- edición ----------
+
+    def actualizar(self, texto):
+        """Reemplaza el texto completo; solo se re-analiza el tramo que cambió."""
+        inicio, fin, nuevo = _rango_cambiado(self.texto, texto)
+        return self.editar(inicio, fin, nuevo)
+
+    def editar(self, inicio, fin, nuevo):
+        """
+        Reemplaza texto[inicio:fin] por `nuevo` y re-analiza lo afectado.
+        Devuelve cuántas sentencias se re-parsearon, cuántas entradas se
+        re-chequearon y la región re-parseada.
+        """
+        if not 0 <= inicio <= fin <= len(self.texto):
+            raise ValueError(f"rango fuera del texto: {inicio}..{fin}")
+
+        # Entradas [g0, g1) que tocan el rango editado
+        acumulado = self._acumulado()
+        total = acumulado[-1]
+        g0 = g1 = self._buscar(acumulado, self._inicio_afectado(inicio, fin, nuevo))
+        while g1 < total and self._absoluta(self._entrada(acumulado, g1))[0] <= fin:
+            g1 += 1
+
+        viejo = self.texto
+        quitado = viejo[inicio:fin]
+        self.texto = viejo[:inicio] + nuevo + viejo[fin:]
+        delta = len(nuevo) - len(quitado)
+        delta_linea = nuevo.count("\n") - quitado.count("\n")
+
+        # Parseo de la región entre las entradas que no cambiaron;
+        # se amplía si el resultado depende del texto vecino.
+        extra = 1
+        intento = 0
+        sesion = self._sesion
+        while True:
+            if g0:
+                p_inicio, r0, p_linea = self._absoluta(self._entrada(acumulado, g0 - 1))
+                linea = p_linea + self.texto.count("\n", p_inicio, r0)
+            else:
+                r0, linea = 0, 1
+            if g1 < total:
+                r1 = self._absoluta(self._entrada(acumulado, g1))[0] + delta
+            else:
+                r1 = len(self.texto)
+            programa, hubo_tokens, cruzo = sesion.parsear_region(self.texto, r0, r1, linea)
+            sentencias = programa.statements if programa is not None else []
+            limpia = not (sesion.lexer.errores or sesion.errores_sintacticos or cruzo)
+            if limpia:
+                break
+            antes = (g0, g1)
+            if intento == 0:
+                g0 = max(g0 - 1, 0)
+                g1 = min(g1 + 1, total)
+            elif cruzo or sesion.error_al_final:
+                g1 = min(g1 + extra, total)
+                extra *= 2
+            if (g0, g1) == antes:
+                break
+            intento += 1
+
+        # Una entrada por sentencia; las sentencias None (p. ej. un
+        # procedure_def sin 'void') no tienen posición propia y dejan la
+        # región entera en una sola entrada.
+        if limpia and all(sentencias):
+            nuevas = []
+            pos = r0
+            for s in sentencias:
+                linea += self.texto.count("\n", pos, s.inicio)
+                pos = s.inicio
+                nuevas.append(Entrada([s], s.inicio, s.fin, linea))
+        elif sentencias or hubo_tokens or sesion.lexer.errores or sesion.errores_sintacticos:
+            if programa is not None:
+                e = Entrada(sentencias, r0, r1, linea, programa.inicio, programa.fin)
+            else:
+                e = Entrada(sentencias, r0, r1, linea)
+            e.errores_lexicos = list(sesion.lexer.errores)
+            e.errores_sintacticos = list(sesion.errores_sintacticos)
+            if not limpia:
+                e.clave_errores = self._clave_errores(r0, linea)
+            nuevas = [e]
+        else:
+            nuevas = []
+
+        quitadas = [self._entrada(acumulado, g) for g in range(g0, g1)]
+        anterior = self._entrada(acumulado, g0 - 1) if g0 else None
+        siguiente = self._entrada(acumulado, g1) if g1 < total else None
+        self._asignar_orden(nuevas, anterior, siguiente)
+        self._reemplazar(acumulado, g0, g1, nuevas, delta, delta_linea)
+
+        # Los mensajes léxicos/sintácticos llevan línea y columna
+        if delta or "\n" in nuevo or "\n" in quitado:
+            if any(e.errores_lexicos or e.errores_sintacticos for e in self._con_errores):
+                self._errores = None
+        rechequeadas = self._rechequear(quitadas, nuevas)
+        return {"sentencias": len(sentencias), "rechequeadas": rechequeadas, "region": (r0, r1)}
+
+    def _reemplazar(self, acumulado, g0, g1, nuevas, delta, delta_linea):
+        """Cambia las entradas [g0, g1) por nuevas y corre las siguientes."""
+        bloques = self._bloques
+        if not bloques:
+            self._bloques = _trocear(nuevas)
+            return
+        ultimo = len(bloques) - 1
+        b0 = min(bisect_right(acumulado, g0) - 1, ultimo)
+        b1 = min(max(bisect_right(acumulado, max(g1 - 1, g0)) - 1, b0), ultimo)
+
+        # Las entradas de los bloques tocados pasan a coordenadas absolutas
+        entradas = []
+        for bi in range(b0, b1 + 1):
+            b = bloques[bi]
+            for j, e in enumerate(b.entradas):
+                g = acumulado[bi] + j
+                if g == g0:
+                    entradas.extend(nuevas)
+                if g0 <= g < g1:
+                    continue
+                corrido = g >= g1
+                e.inicio += b.delta + (delta if corrido else 0)
+                e.fin += b.delta + (delta if corrido else 0)
+                e.linea += b.delta_linea + (delta_linea if corrido else 0)
+                entradas.append(e)
+        if g0 >= acumulado[b1 + 1]:
+            entradas.extend(nuevas)   # se agregan al final del último bloque tocado
+
+        # Un bloque que quedó chico se junta con el siguiente
+        if len(entradas) < TAM_BLOQUE // 2 and b1 < ultimo:
+            b1 += 1
+            b = bloques[b1]
+            for e in b.entradas:
+                e.inicio += b.delta + delta
+                e.fin += b.delta + delta
+                e.linea += b.delta_linea + delta_linea
+                entradas.append(e)
+
+        for b in bloques[b1 + 1:]:
+            b.delta += delta
+            b.delta_linea += delta_linea
+        bloques[b0:b1 + 1] = _trocear(entradas)
+
+    def _inicio_afectado(self, inicio, fin, nuevo):
+        """
+        Normalmente `inicio`. Pero un string o comentario sin cerrar deja
+        una entrada anterior con errores, y una comilla o un '*/' nuevo
+        puede cerrarlo: en ese caso se re-parsea desde esa entrada.
+        """
+        ventana = self.texto[max(inicio - 1, 0):inicio] + nuevo + self.texto[fin:fin + 1]
+        if not ('"' in nuevo or "'" in nuevo or "*/" in ventana):
+            return inicio
+        for e in sorted(self._con_errores, key=_orden):
+            if e.errores_lexicos or e.errores_sintacticos:
+                return min(inicio, self._absoluta(e)[0])
+        return inicio
+
+    def _asignar_orden(self, nuevas, anterior, siguiente):
+        if not nuevas:
+            return
+
+        def limites():
+            bajo = anterior.orden if anterior else 0
+            alto = siguiente.orden if siguiente else bajo + ESPACIO_ORDEN * (len(nuevas) + 1)
+            return bajo, (alto - bajo) // (len(nuevas) + 1)
+
+        bajo, paso = limites()
+        if paso < 1:
+            # No queda espacio entre los vecinos: se renumera todo (raro)
+            for i, e in enumerate(self.entradas(), 1):
+                e.orden = i * ESPACIO_ORDEN
+            bajo, paso = limites()
+        for i, e in enumerate(nuevas, 1):
+            e.orden = bajo + i * paso
+
+    # ---------- semántico ----------
+
+    def _simbolo_previo(self, name, orden):
+        """Primera declaración de name hecha por una entrada anterior a orden."""
+        declarantes = self._declarantes.get(name)
+        if not declarantes:
+            return None
+        primero = min(declarantes, key=_orden)
+        if primero.orden < orden:
+            return primero.simbolos.get(name)
+        return None
+
+    def _desregistrar(self, e):
+        for name in e.declara:
+            self._declarantes[name].discard(e)
+        for name in e.declara | e.usa:
+            self._usuarios[name].discard(e)
+        self._con_errores.discard(e)
+
+    def _registrar(self, e):
+        for name in e.declara:
+            self._declarantes.setdefault(name, set()).add(e)
+        for name in e.declara | e.usa:
+            self._usuarios.setdefault(name, set()).add(e)
+        if e.errores_lexicos or e.errores_sintacticos or e.errores_semanticos:
+            self._con_errores.add(e)
+
+    def _chequear(self, e):
+        orden = e.orden
+        ctx = _ContextoEntrada(lambda name: self._simbolo_previo(name, orden))
+        for stmt in e.nodos:
+            ctx.analizar_statement(stmt)
+        e.errores_semanticos = ctx.semantic_errors
+        e.simbolos = ctx.symbol_table.globales()
+        e.declara = frozenset(ctx.declara)
+        e.usa = frozenset(ctx.usa)
+
+    def _rechequear(self, quitadas, nuevas):
+        nombres = set()
+        for e in quitadas:
+            if e in self._con_errores:
+                self._errores = None
+            self._desregistrar(e)
+            nombres |= e.declara
+        # Primera pasada solo para saber qué declaran las entradas nuevas
+        for e in nuevas:
+            if e.errores_lexicos or e.errores_sintacticos:
+                self._errores = None
+            ctx = _ContextoEntrada(_sin_simbolos)
+            for stmt in e.nodos:
+                ctx.analizar_statement(stmt)
+            nombres |= ctx.declara
+
+        pendientes = set(nuevas)
+        for name in nombres:
+            pendientes.update(self._usuarios.get(name, ()))
+        # En orden del documento: cada entrada ve ya actualizadas las anteriores
+        for e in sorted(pendientes, key=_orden):
+            previos = e.errores_semanticos
+            self._desregistrar(e)
+            self._chequear(e)
+            self._registrar(e)
+            if e.errores_semanticos != previos:
+                self._errores = None
+        return len(pendientes)
+
+    # ---------- resultados ----------
+
+    def _clave_errores(self, inicio, linea):
+        columna = inicio - (self.texto.rfind("\n", 0, inicio) + 1)
+        return (inicio, linea, columna)
+
+    def _refrescar_errores(self, e):
+        """Los mensajes llevan línea y columna: si la entrada se movió, se regeneran."""
+        inicio, fin, linea = self._absoluta(e)
+        clave = self._clave_errores(inicio, linea)
+        if e.clave_errores == clave:
+            return
+        self._sesion.parsear_region(self.texto, inicio, fin, linea)
+        e.errores_lexicos = list(self._sesion.lexer.errores)
+        e.errores_sintacticos = list(self._sesion.errores_sintacticos)
+        e.clave_errores = clave
+
+    def errores(self):
+        """Listas de errores léxicos, sintácticos y semánticos en orden del documento."""
+        if self._errores is None:
+            lexicos, sintacticos, semanticos = [], [], []
+            for e in sorted(self._con_errores, key=_orden):
+                if e.clave_errores is not None:
+                    self._refrescar_errores(e)
+                lexicos.extend(e.errores_lexicos)
+                sintacticos.extend(e.errores_sintacticos)
+                semanticos.extend(e.errores_semanticos)
+            self._errores = (lexicos, sintacticos, semanticos)
+        lexicos, sintacticos, semanticos = self._errores
+        return {
+            "errores_lexicos": list(lexicos),
+            "errores_sintacticos": list(sintacticos),
+            "errores_semanticos": list(semanticos),
+        }
+
+    @property
+    def ast(self):
+        """Program con las sentencias actuales (offsets corregidos a demanda)."""
+        sentencias = []
+        desde = hasta = None
+        for e in self.entradas():
+            if not e.nodos:
+                continue
+            inicio = self._absoluta(e)[0]
+            if e.base != inicio:
+                delta = inicio - e.base
+                for nodo in e.nodos:
+                    _desplazar(nodo, delta)
+                e.desde += delta
+                e.hasta += delta
+                e.base = inicio
+            sentencias.extend(e.nodos)
+            if desde is None:
+                desde = e.desde
+            hasta = e.hasta
+        if not sentencias:
+            return None
+        return ast_cs.Program(sentencias, desde, hasta)
+
+    def resultado(self):
+        """Mismo formato que SesionAnalisis.analizar."""
+        resultado = {"ast": self.ast}
+        resultado.update(self.errores())
+        return resultado
+
+
+# ==========================
+# Utilidades
+# ==========================
+
+def _desplazar(nodo, delta):
+    pendientes = [nodo]
+    while pendientes:
+        n = pendientes.pop()
+        if isinstance(n, ast_cs.Nodo):
+            n.inicio += delta
+            pendientes.extend(getattr(n, c) for c in n.campos)
+        elif isinstance(n, list):
+            pendientes.extend(n)
+
+
+def _rango_cambiado(viejo, nuevo):
+    """(inicio, fin, reemplazo) mínimos para pasar de viejo a nuevo."""
+    bloque = 4096
+    limite = min(len(viejo), len(nuevo))
+    i = 0
+    # Se compara por bloques (memcmp en C) y luego carácter a carácter
+    while i + bloque <= limite and viejo[i:i + bloque] == nuevo[i:i + bloque]:
+        i += bloque
+    while i < limite and viejo[i] == nuevo[i]:
+        i += 1
+    j = 0
+    limite -= i
+    while j + bloque <= limite and viejo[len(viejo) - j - bloque:len(viejo) - j] == nuevo[len(nuevo) - j - bloque:len(nuevo) - j]:
+        j += bloque
+    while j < limite and viejo[len(viejo) - j - 1] == nuevo[len(nuevo) - j - 1]:
+        j += 1
+    return i, len(viejo) - j, nuevo[i:len(nuevo) - j]
@@ -1,6 +1,9 @@
 # LEXER CORREGIDO PARA EL PROYECTO (AVANCE 2)
-import ply.lex as lex
+from array import array
+from bisect import bisect_right
+import os
 import sys
+import threading
 
 # PALABRAS RESERVADAS
 reserved = {
@@ -34,11 +37,196 @@ tokens = [
     'COMMA', 'SEMICOLON', 'DOT',
 ] + list(reserved.values())
 
+# NOMBRES COMPARTIDOS
+# Cada identificador y palabra reservada se guarda una sola vez por
+# proceso. _NOMBRES lleva cada texto a su string compartido
+# (internado) si es un identificador, o a (tipo de token, string) si
+# es una palabra reservada: UNA búsqueda en vez de reserved.get y
+# después sys.intern en el parser. Los identificadores se agregan la
+# primera vez que aparecen. Así el parser, el AST y la tabla de
+# símbolos reciben siempre el mismo objeto por nombre: comparar es
+# por identidad y el hash ya está calculado. Como sys.intern, la
+# tabla se vacía al llegar a MAX_NOMBRES (los strings ya entregados
+# siguen siendo válidos, solo dejan de compartirse con los nuevos).
+MAX_NOMBRES = 1 << 20
+_NOMBRES = {}
+
+
+def _reiniciar_nombres():
+    _NOMBRES.clear()
+    for palabra, tipo in reserved.items():
+        palabra = sys.intern(palabra)
+        _NOMBRES[palabra] = (tipo, palabra)
+
+
+def nombre(texto):
+    """(tipo de token, string compartido) de un identificador o palabra reservada."""
+    valor = _NOMBRES.get(texto)
+    if valor is None:
+        if len(_NOMBRES) >= MAX_NOMBRES:
+            _reiniciar_nombres()
+        valor = _NOMBRES[texto] = sys.intern(texto)
+    elif type(valor) is tuple:
+        return valor
+    return "IDENTIFIER", valor
+
+
+_reiniciar_nombres()
+
+# ÍNDICE DE INICIOS DE LÍNEA
+# Se calcula una vez por texto (O(n)) y luego cada posición se ubica
+# con búsqueda binaria (O(log n)), en lugar de buscar hacia atrás el
+# '\n' anterior en cada token (cuadrático en archivos de una sola línea).
+class LineIndex:
+    """Offsets donde empieza cada línea de un texto."""
+
+    __slots__ = ("text", "starts")
+
+    def __init__(self, text):
+        self.text = text
+        starts = [0]
+        find = text.find
+        i = find('\n')
+        while i >= 0:
+            starts.append(i + 1)
+            i = find('\n', i + 1)
+        self.starts = starts
+
+    def line(self, pos):
+        """Línea (desde 1) que contiene la posición pos."""
+        return bisect_right(self.starts, pos)
+
+    def column(self, pos):
+        """Columna (desde 1) de la posición pos."""
+        return pos - self.starts[bisect_right(self.starts, pos) - 1] + 1
+
+
+# Último índice construido: find_column se llama muchas veces seguidas
+# sobre el mismo texto (t_error, p_error, listado de tokens).
+_ultimo_indice = None
+
+
+def get_line_index(input_text):
+    global _ultimo_indice
+    indice = _ultimo_indice
+    if indice is None or indice.text is not input_text:
+        indice = _ultimo_indice = LineIndex(input_text)
+    return indice
+
+
+def lexema(tok):
+    """Texto del token en el fuente (los literales numéricos traen su valor convertido)."""
+    valor = tok.value
+    if type(valor) is str:
+        return valor
+    texto = getattr(tok, "lexema", None)
+    return repr(valor) if texto is None else texto
+
+
 # Función para Calcular columna
 def find_column(input_text, token):
     """Calcula la columna de un token en el código fuente"""
-    line_start = input_text.rfind('\n', 0, token.lexpos) + 1
-    return (token.lexpos - line_start) + 1
+    if type(input_text) is not str:
+        return _columna_bytes(input_text, token.lexpos)     # LexerMapeado
+    return get_line_index(input_text).column(token.lexpos)
+
+
+def iter_tokens(lexer, data):
+    """
+    Tokeniza data y asigna tok.column a cada token a medida que se produce.
+    Como los tokens salen en orden, se avanza un cursor sobre el índice de
+    líneas: O(1) amortizado por token.
+    """
+    starts = get_line_index(data).starts
+    ultima = len(starts) - 1
+    linea = 0
+    lexer.lineno = 1
+    lexer.input(data)
+    for tok in lexer:
+        pos = tok.lexpos
+        while linea < ultima and starts[linea + 1] <= pos:
+            linea += 1
+        tok.column = pos - starts[linea] + 1
+        yield tok
+
+
+# TOKENIZACIÓN POR BLOQUES (STREAMING)
+# Se lee el archivo de a bloques y se tokeniza solo hasta el último '\n'
+# leído: ningún token cruza un salto de línea salvo /* */, así que esos
+# tokens son los mismos que daría el texto completo. Si un /* no se
+# cierra dentro del segmento (el lexer lo ve como OPERATOR '/' seguido
+# de '*'), se guarda desde ahí y se siguen leyendo bloques hasta que
+# aparezca el */. La memoria queda acotada por la línea (o comentario)
+# más larga, no por el tamaño del archivo.
+def iter_tokens_stream(archivo, lexer, tam_bloque=1 << 16):
+    """
+    Genera los tokens de un archivo abierto en modo texto, con lexpos
+    absoluto, lineno y tok.column iguales a los de iter_tokens().
+    """
+    lexer.lineno = 1
+    pendiente = ""       # texto leído que todavía no se tokenizó
+    base = 0             # offset absoluto de pendiente[0]
+    buscar_cierre = -1   # si hay un /* abierto: desde dónde buscar el */
+    sin_salto = 0        # prefijo de pendiente ya revisado sin '\n'
+    fin_archivo = False
+
+    while True:
+        if not fin_archivo:
+            bloque = archivo.read(tam_bloque)
+            if bloque:
+                pendiente += bloque
+            else:
+                fin_archivo = True
+
+        if fin_archivo:
+            corte = len(pendiente)
+        else:
+            if buscar_cierre >= 0:
+                cierre = pendiente.find("*/", buscar_cierre)
+                if cierre < 0:
+                    buscar_cierre = max(buscar_cierre, len(pendiente) - 1)
+                    continue
+                buscar_cierre = -1
+            corte = pendiente.rfind("\n", sin_salto) + 1
+            if corte == 0:
+                sin_salto = len(pendiente)
+                continue  # línea incompleta: leer más
+            sin_salto = 0
+
+        segmento = pendiente[:corte]
+        starts = get_line_index(segmento).starts
+        ultima = len(starts) - 1
+        linea = 0
+        abierto = -1
+        lexer.input(segmento)
+        for tok in lexer:
+            pos = tok.lexpos
+            if (not fin_archivo and tok.type == "OPERATOR" and tok.value == "/"
+                    and segmento.startswith("*", pos + 1)):
+                abierto = pos
+                break
+            while linea < ultima and starts[linea + 1] <= pos:
+                linea += 1
+            tok.column = pos - starts[linea] + 1
+            tok.lexpos = base + pos
+            yield tok
+
+        if abierto >= 0:
+            # El comentario empieza a mitad de línea: se rellena con espacios
+            # (t_ignore) para que el segmento siguiente conserve las columnas.
+            while linea < ultima and starts[linea + 1] <= abierto:
+                linea += 1
+            relleno = abierto - starts[linea]
+            pendiente = " " * relleno + pendiente[abierto:]
+            base += abierto - relleno
+            buscar_cierre = relleno + 2
+            sin_salto = 0
+            continue
+
+        pendiente = pendiente[corte:]
+        base += corte
+        if fin_archivo:
+            break
 
 
 # ==========================================================
@@ -47,12 +235,34 @@ def find_column(input_text, token):
 
 def t_IDENTIFIER(t):
     r'[A-Za-z_][A-Za-z0-9_]*'
-    t.type = reserved.get(t.value, 'IDENTIFIER')
+    valor = _NOMBRES.get(t.value)
+    if type(valor) is str:
+        t.value = valor
+    else:
+        t.type, t.value = valor or nombre(t.value)
     return t
 
 # Literales
-t_INT_LITERAL = r'\d+'
-t_FLOAT_LITERAL = r'\d+\.\d+'
+# Los numéricos salen con su valor ya convertido (int / float). El
+# texto original se guarda en tok.lexema solo si repr(valor) no lo
+# reproduce ('007', '1.50'); ver lexema(). FLOAT va antes que INT:
+# las reglas-función se prueban en orden de definición.
+def t_FLOAT_LITERAL(t):
+    r'\d+\.\d+'
+    texto = t.value
+    t.value = float(texto)
+    if repr(t.value) != texto:
+        t.lexema = texto
+    return t
+
+def t_INT_LITERAL(t):
+    r'\d+'
+    texto = t.value
+    t.value = int(texto)
+    if texto[0] == "0" and len(texto) > 1:
+        t.lexema = texto
+    return t
+
 t_STRING_LITERAL = r'\"([^\\\n]|(\\.))*?\"'  # ✅ Maneja escapes
 t_CHAR_LITERAL = r'\'([^\\\n]|(\\.))?\''
 
@@ -98,41 +308,729 @@ def t_newline(t):
 
 # MANEJO DE ERRORES
 def t_error(t):
-    sys.stderr.write(
+    msg = (
         f"ERROR LÉXICO: Carácter ilegal '{t.value[0]}' "
-        f"en línea {t.lineno}, columna {find_column(t.lexer.lexdata, t)}\n"
+        f"en línea {t.lineno}, columna {find_column(t.lexer.lexdata, t)}"
     )
+    # Los lexers de una sesión (sesion_cs) guardan sus errores en lexer.errores
+    errores = getattr(t.lexer, "errores", None)
+    if errores is None:
+        sys.stderr.write(msg + "\n")
+    else:
+        errores.append(msg)
     t.lexer.skip(1)
 
-# CONSTRUCCIÓN DEL LEXER
-lexer = lex.lex()
+# ==========================================================
+# BACKEND RÁPIDO (LP_CS_LEXER=rapido)
+# Compila las mismas reglas t_* en UNA regex con grupos con nombre
+# y despacha por m.lastgroup. Las reglas-función conocidas se
+# resuelven sin llamar a Python (IDENTIFIER busca en `_NOMBRES`;
+# comentarios y saltos de línea solo suman líneas), los espacios de
+# t_ignore se saltan dentro de la misma regex y t_error es el mismo.
+# Respeta el orden de PLY: funciones por número de línea y luego
+# strings por largo de regex decreciente. Produce los mismos tokens
+# que el lexer PLY (ver benchmarks/conformidad_lexer.py).
+# ==========================================================
+
+_TOKEN, _IDENT, _DESCARTE, _IGNORAR, _FUNCION, _NUMERO = range(6)
+
+# Reglas-función cuyo efecto se reproduce sin llamarlas
+_ACCIONES_RAPIDAS = {
+    "IDENTIFIER": _IDENT,
+    "COMMENT_SINGLE": _DESCARTE,
+    "COMMENT_MULTI": _DESCARTE,
+    "newline": _DESCARTE,
+    "FLOAT_LITERAL": _NUMERO,
+    "INT_LITERAL": _NUMERO,
+}
+
+# Conversión de los literales numéricos (lo mismo que hacen sus t_*)
+_CONVERSIONES = {"FLOAT_LITERAL": float, "INT_LITERAL": int}
+
+# Código de cada tipo de token en las columnas (índice en `tokens`)
+_INDICE_TIPO = {t: i for i, t in enumerate(tokens)}
+
+
+class TokenRapido:
+    """Token con la misma interfaz que ply.lex.LexToken, pero con __slots__."""
+
+    __slots__ = ("type", "value", "lineno", "lexpos", "lexer", "column", "lexema")
+
+    def __init__(self, type, value, lineno, lexpos, lexer):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+        self.lexer = lexer
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+    __str__ = __repr__
+
+
+class LexerRapido:
+    """Lexer compatible con la interfaz de ply.lex.Lexer que usa el proyecto."""
+
+    def __init__(self, master, acciones, errorf):
+        self._patron = master
+        self._match = master.match
+        self._codigos = None    # ver _columnas
+        self._acciones = acciones
+        self._errorf = errorf
+        self.lexdata = ""
+        self.lexpos = 0
+        self.lexlen = 0
+        self.lineno = 1
+
+    def clone(self):
+        import copy
+        return copy.copy(self)
+
+    def input(self, s):
+        self.lexdata = s
+        self.lexpos = 0
+        self.lexlen = len(s)
+
+    def skip(self, n):
+        self.lexpos += n
+
+    def token(self):
+        data = self.lexdata
+        pos = self.lexpos
+        n = self.lexlen
+        match = self._match
+        acciones = self._acciones
+        nombres = _NOMBRES
+
+        while pos < n:
+            m = match(data, pos)
+            if m is None:
+                pos = self._error(pos)
+                continue
+            accion, tipo, funcion = acciones[m.lastindex]
+            if accion == _TOKEN:
+                self.lexpos = m.end()
+                return TokenRapido(tipo, m.group(tipo), self.lineno, pos, self)
+            if accion == _IDENT:
+                valor = m.group(tipo)
+                self.lexpos = m.end()
+                compartido = nombres.get(valor)
+                if type(compartido) is str:
+                    return TokenRapido("IDENTIFIER", compartido, self.lineno, pos, self)
+                tipo, valor = compartido or nombre(valor)
+                return TokenRapido(tipo, valor, self.lineno, pos, self)
+            if accion == _NUMERO:
+                texto = m.group(tipo)
+                self.lexpos = m.end()
+                valor = funcion(texto)
+                tok = TokenRapido(tipo, valor, self.lineno, pos, self)
+                if repr(valor) != texto:
+                    tok.lexema = texto
+                return tok
+            if accion == _DESCARTE:
+                self.lineno += m.group(tipo).count("\n")
+                pos = m.end()
+                continue
+            if accion == _IGNORAR:
+                pos = m.end()
+                continue
+            # Regla-función genérica: se llama igual que en PLY, sin
+            # los espacios finales que consumió la regex
+            valor = m.group(tipo)
+            tok = TokenRapido(tipo, valor, self.lineno, pos, self)
+            self.lexpos = pos + len(valor)
+            tok = funcion(tok)
+            pos = self.lexpos
+            if tok:
+                return tok
+
+        self.lexpos = pos + 1   # como PLY: al terminar queda uno más allá del final
+        return None
+
+    def _error(self, pos):
+        # PLY pasa todo el resto del texto (una copia O(n) por error);
+        # t_error solo mira el primer carácter, basta con la línea.
+        data = self.lexdata
+        fin = data.find("\n", pos)
+        tok = TokenRapido("error", data[pos:fin] if fin > pos else data[pos:], self.lineno, pos, self)
+        self.lexpos = pos
+        self._errorf(tok)
+        if self.lexpos == pos:
+            from ply.lex import LexError  # misma excepción que el lexer PLY
+            raise LexError(f"Scanning error. Illegal character {self.lexdata[pos]!r}", self.lexdata[pos:])
+        return self.lexpos
+
+    def tokenizar_columnas(self, data):
+        """
+        Tokeniza todo data de una vez, sin crear un objeto por token:
+        devuelve las columnas (tipos, valores, lineas, inicios, fines)
+        con tipos un bytearray de índices en `tokens`, valores una
+        lista (strings compartidos y números), lineas un array('I') e
+        inicios/fines arrays('Q'). Los errores van a t_error como en
+        token(). Ver buffer_cs.
+        """
+        self.input(data)
+        tipos, valores = bytearray(), []
+        lineas, inicios, fines = array("I"), array("Q"), array("Q")
+        anotar_tipo, anotar_valor = tipos.append, valores.append
+        anotar_linea, anotar_inicio, anotar_fin = lineas.append, inicios.append, fines.append
+        codigos, fijos = self._columnas()
+        acciones = self._acciones
+        nombres = _NOMBRES
+        identificador = codigos[0]
+        lineno = self.lineno
+        n = len(data)
+        pos = 0
+
+        while True:
+            # finditer busca: un hueco entre dos matches es texto que
+            # ninguna regla acepta (errores, igual que en token())
+            reanudar = False
+            for m in self._patron.finditer(data, pos):
+                inicio = m.start()
+                if inicio != pos:
+                    self.lineno = lineno
+                    while pos < inicio:
+                        pos = self._error(pos)
+                    if pos != inicio:   # t_error saltó más allá del match
+                        reanudar = True
+                        break
+                indice = m.lastindex
+                accion = acciones[indice][0]
+                if accion == _IDENT:
+                    valor = m.group(indice)
+                    compartido = nombres.get(valor)
+                    if type(compartido) is str:
+                        anotar_tipo(identificador)
+                        anotar_valor(compartido)
+                    else:
+                        tipo, valor = compartido or nombre(valor)
+                        anotar_tipo(_INDICE_TIPO[tipo])
+                        anotar_valor(valor)
+                elif accion == _TOKEN:
+                    anotar_tipo(codigos[indice])
+                    anotar_valor(fijos[indice] or m.group(indice))
+                elif accion == _NUMERO:
+                    anotar_tipo(codigos[indice])
+                    anotar_valor(acciones[indice][2](m.group(indice)))
+                elif accion == _DESCARTE:
+                    lineno += m.group(indice).count("\n")
+                    pos = m.end()
+                    continue
+                elif accion == _IGNORAR:
+                    pos = m.end()
+                    continue
+                else:
+                    # Regla-función genérica: se llama como en token()
+                    _, tipo, funcion = acciones[indice]
+                    fin = m.end(indice)
+                    self.lineno = lineno
+                    self.lexpos = fin
+                    tok = funcion(TokenRapido(tipo, m.group(indice), lineno, inicio, self))
+                    lineno = self.lineno
+                    if tok:
+                        anotar_tipo(_INDICE_TIPO[tok.type])
+                        anotar_valor(tok.value)
+                        anotar_linea(tok.lineno)
+                        anotar_inicio(inicio)
+                        anotar_fin(fin)
+                    pos = self.lexpos
+                    if pos != fin:
+                        reanudar = True
+                        break
+                    pos = m.end()
+                    continue
+                anotar_linea(lineno)
+                anotar_inicio(inicio)
+                anotar_fin(m.end(indice))
+                pos = m.end()
+            if not reanudar:
+                break
+
+        self.lineno = lineno
+        while pos < n:      # después del último match solo quedan errores
+            pos = self._error(pos)
+        self.lineno = lineno
+        self.lexpos = n + 1
+        return tipos, valores, lineas, inicios, fines
+
+    def _columnas(self):
+        # Por grupo de la regex: índice del tipo en `tokens` y, si el
+        # token tiene un único texto posible, ese string compartido.
+        # codigos[0] es el de IDENTIFIER.
+        if self._codigos is None:
+            codigos = [_INDICE_TIPO["IDENTIFIER"]]
+            fijos = [None]
+            for accion in self._acciones[1:]:
+                tipo = accion[1] if accion else None
+                codigos.append(_INDICE_TIPO.get(tipo))
+                fijos.append(_TEXTOS_FIJOS.get(tipo))
+            self._codigos = codigos, fijos
+        return self._codigos
+
+    def __iter__(self):
+        # iter() con centinela llama a token() directamente desde C
+        return iter(self.token, None)
+
+    def __next__(self):
+        t = self.token()
+        if t is None:
+            raise StopIteration
+        return t
+
+
+def _regla_unica(ignorar_extra=""):
+    """
+    (patrón de la regex única, reglas por nombre de grupo) a partir de
+    las reglas t_* del módulo; ignorar_extra se suma a t_ignore.
+    """
+    import re
+
+    modulo = sys.modules[__name__]
+    nombres = sorted(n for n in dir(modulo) if n.startswith("t_"))
+    funciones = [getattr(modulo, n) for n in nombres
+                 if callable(getattr(modulo, n)) and n not in ("t_error", "t_eof")]
+    funciones.sort(key=lambda f: f.__code__.co_firstlineno)
+    cadenas = [(n[2:], getattr(modulo, n)) for n in nombres
+               if isinstance(getattr(modulo, n), str) and n != "t_ignore"]
+    cadenas.sort(key=lambda x: len(x[1]), reverse=True)
+
+    grupos = []
+    reglas = {}
+    for f in funciones:
+        nombre = f.__name__[2:]
+        grupos.append(f"(?P<{nombre}>{f.__doc__})")
+        reglas[nombre] = (_ACCIONES_RAPIDAS.get(nombre, _FUNCION), nombre, _CONVERSIONES.get(nombre, f))
+    for nombre, patron in cadenas:
+        grupos.append(f"(?P<{nombre}>{patron})")
+        reglas[nombre] = (_TOKEN, nombre, None)
+    patron = "(?:%s)" % "|".join(grupos)
+    if t_ignore or ignorar_extra:
+        # Los t_ignore que siguen a un token se consumen en el mismo match
+        # (el token es el grupo, no el match completo); los del comienzo
+        # se saltan con un grupo propio.
+        ignorar = "[%s]" % re.escape(t_ignore + ignorar_extra)
+        patron = "(?P<_ignore>%s+)|%s%s*" % (ignorar, patron, ignorar)
+        reglas["_ignore"] = (_IGNORAR, "_ignore", None)
+    return patron, reglas
+
+
+def _acciones(master, reglas):
+    # m.lastindex es el grupo de la regla (los grupos internos de una
+    # regla cierran antes que el suyo), así que se despacha por índice
+    acciones = [None] * (master.groups + 1)
+    for nombre, indice in master.groupindex.items():
+        acciones[indice] = reglas[nombre]
+    return acciones
+
+
+def build_lexer_rapido():
+    """Construye el lexer de regex única a partir de las reglas t_* del módulo."""
+    import re
+
+    patron, reglas = _regla_unica()
+    master = re.compile(patron, re.VERBOSE)
+    return LexerRapido(master, _acciones(master, reglas), t_error)
+
+
+# ==========================================================
+# BACKEND MAPEADO (archivos muy grandes)
+# La misma regex única, compilada para bytes, recorre el archivo
+# mapeado en memoria (mmap) sin decodificarlo ni copiarlo. Cada
+# TokenMapeado guarda solo tipo, inicio, fin y línea; value y el
+# lexema se arman del archivo recién cuando alguien los pide (el
+# parser con los nombres y los literales, o un diagnóstico). Las
+# palabras reservadas y la puntuación fija nunca se copian: su value
+# es el string compartido de su tipo.
+# Las páginas ya recorridas se devuelven al sistema cada
+# VENTANA_MAPEO bytes (MADV_DONTNEED): el pico de memoria no crece
+# con el archivo. Si después se pide un lexema viejo, el sistema la
+# vuelve a leer del archivo.
+# Diferencias con los otros backends: lexpos (y las posiciones del
+# AST) son offsets en bytes, no en caracteres (iguales si el archivo
+# es ASCII); '\r' se ignora como un espacio (en modo texto Python
+# convierte '\r\n' en '\n'); \d y \w solo aceptan ASCII.
+# ==========================================================
+
+VENTANA_MAPEO = 16 << 20
+
+# Tipo de token -> su único texto posible (palabras reservadas y
+# puntuación como '{' o ';'); se completa abajo con las reglas string
+_TEXTOS_FIJOS = {tipo: sys.intern(palabra) for palabra, tipo in reserved.items()}
+_RESERVADAS_BYTES = {palabra.encode("ascii"): tipo for palabra, tipo in reserved.items()}
+
+
+def _completar_textos_fijos():
+    import re
+
+    modulo = sys.modules[__name__]
+    for n in dir(modulo):
+        patron = getattr(modulo, n)
+        if n.startswith("t_") and n != "t_ignore" and isinstance(patron, str):
+            texto = re.sub(r"\\(.)", r"\1", patron)
+            if re.escape(texto) == patron:
+                _TEXTOS_FIJOS[n[2:]] = sys.intern(texto)
+
+
+_completar_textos_fijos()
+
+
+class TokenMapeado:
+    """
+    Token de LexerMapeado: tipo, offsets en bytes y línea. value y
+    lexema se calculan al leerlos (no se guardan). endlexpos es el fin
+    del token (el parser lo usa en vez de medir el lexema).
+    """
+
+    __slots__ = ("type", "lexpos", "endlexpos", "lineno", "lexer", "column")
+
+    def __init__(self, type, lexpos, endlexpos, lineno, lexer):
+        self.type = type
+        self.lexpos = lexpos
+        self.endlexpos = endlexpos
+        self.lineno = lineno
+        self.lexer = lexer
+
+    @property
+    def lexema(self):
+        fijo = _TEXTOS_FIJOS.get(self.type)
+        if fijo is not None:
+            return fijo
+        return self.lexer.lexdata[self.lexpos:self.endlexpos].decode("utf-8")
+
+    @property
+    def value(self):
+        tipo = self.type
+        fijo = _TEXTOS_FIJOS.get(tipo)
+        if fijo is not None:
+            return fijo
+        texto = self.lexer.lexdata[self.lexpos:self.endlexpos]
+        if tipo == "IDENTIFIER":
+            return nombre(texto.decode("ascii"))[1]
+        conversion = _CONVERSIONES.get(tipo)
+        if conversion is not None:
+            return conversion(texto)    # int() y float() aceptan bytes
+        return texto.decode("utf-8")
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+    __str__ = __repr__
+
+
+class LexerMapeado(LexerRapido):
+    """LexerRapido sobre bytes (un mmap): tokens TokenMapeado."""
+
+    def input(self, s):
+        super().input(s)
+        self._liberado = 0              # páginas [0, _liberado) ya devueltas
+        self._liberar = VENTANA_MAPEO   # próxima posición en la que devolver
+
+    def _liberar_paginas(self, pos):
+        import mmap
+
+        self._liberar = pos + VENTANA_MAPEO
+        madvise = getattr(self.lexdata, "madvise", None)
+        opcion = getattr(mmap, "MADV_DONTNEED", None)
+        hasta = pos - VENTANA_MAPEO
+        hasta -= hasta % mmap.PAGESIZE
+        if madvise is not None and opcion is not None and hasta > self._liberado:
+            madvise(opcion, self._liberado, hasta - self._liberado)
+            self._liberado = hasta
+
+    def token(self):
+        data = self.lexdata
+        pos = self.lexpos
+        n = self.lexlen
+        if pos >= self._liberar:
+            self._liberar_paginas(pos)
+        match = self._match
+        acciones = self._acciones
+
+        while pos < n:
+            m = match(data, pos)
+            if m is None:
+                pos = self._error(pos)
+                continue
+            indice = m.lastindex
+            accion, tipo, funcion = acciones[indice]
+            if accion == _TOKEN or accion == _NUMERO:
+                self.lexpos = m.end()
+                return TokenMapeado(tipo, pos, m.end(indice), self.lineno, self)
+            if accion == _IDENT:
+                fin = m.end(indice)
+                self.lexpos = m.end()
+                tipo = _RESERVADAS_BYTES.get(data[pos:fin], "IDENTIFIER")
+                return TokenMapeado(tipo, pos, fin, self.lineno, self)
+            if accion == _DESCARTE:
+                fin = m.end(indice)
+                if tipo == "newline":
+                    self.lineno += fin - pos
+                else:
+                    self.lineno += data[pos:fin].count(b"\n")
+                pos = m.end()
+                continue
+            if accion == _IGNORAR:
+                pos = m.end()
+                continue
+            # Regla-función genérica: recibe el texto ya decodificado
+            fin = m.end(indice)
+            tok = TokenRapido(tipo, data[pos:fin].decode("utf-8"), self.lineno, pos, self)
+            self.lexpos = fin
+            tok = funcion(tok)
+            pos = self.lexpos
+            if tok:
+                return tok
+
+        self.lexpos = pos + 1
+        return None
+
+    def _error(self, pos):
+        data = self.lexdata
+        fin = data.find(b"\n", pos)
+        linea = (data[pos:fin] if fin > pos else data[pos:]).decode("utf-8", "replace")
+        tok = TokenRapido("error", linea, self.lineno, pos, self)
+        self.lexpos = pos
+        self._errorf(tok)
+        if self.lexpos == pos:
+            from ply.lex import LexError
+            raise LexError(f"Scanning error. Illegal character {linea[:1]!r}", linea)
+        if self.lexpos == pos + 1:
+            # skip(1) salta un carácter: en UTF-8 puede ocupar hasta 4 bytes
+            primero = data[pos]
+            if primero >= 0xC0:
+                self.lexpos = pos + (2 if primero < 0xE0 else 3 if primero < 0xF0 else 4)
+        return self.lexpos
+
+
+def build_lexer_mapeado():
+    """Lexer de regex única para bytes (ver LexerMapeado)."""
+    import re
+
+    patron, reglas = _regla_unica(ignorar_extra="\r")
+    master = re.compile(patron.encode("utf-8"), re.VERBOSE)
+    return LexerMapeado(master, _acciones(master, reglas), t_error)
+
+
+def mapear(path):
+    """Contenido de un archivo mapeado en memoria, de solo lectura (b"" si está vacío)."""
+    import mmap
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""      # mmap no acepta archivos vacíos
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_tokens_mapeado(lexer, data):
+    """
+    Como iter_tokens, para LexerMapeado sobre bytes: asigna tok.column
+    (en caracteres) sin armar un índice de líneas de todo el archivo;
+    la columna avanza desde el token anterior de la misma línea.
+    """
+    lexer.lineno = 1
+    lexer.input(data)
+    linea = 1
+    pos_ant, col_ant = 0, 1     # último token visto en la línea actual
+    for tok in lexer:
+        pos = tok.lexpos
+        if tok.lineno != linea:
+            linea = tok.lineno
+            pos_ant = data.rfind(b"\n", 0, pos) + 1
+            col_ant = 1
+        col_ant += _caracteres(data[pos_ant:pos])
+        pos_ant = pos
+        tok.column = col_ant
+        yield tok
+
+
+def _caracteres(texto):
+    # Caracteres de un trozo UTF-8 (uno por byte si es ASCII)
+    return len(texto) if texto.isascii() else len(texto.decode("utf-8", "replace"))
+
+
+def _columna_bytes(data, pos):
+    return _caracteres(data[data.rfind(b"\n", 0, pos) + 1:pos]) + 1
+
+
+def backend_lexer():
+    """Backend elegido con LP_CS_LEXER: 'ply' (por defecto) o 'rapido'."""
+    return os.environ.get("LP_CS_LEXER", "ply")
+
+# ==========================================================
+# CACHÉ DE TABLAS PLY
+# Las tablas se generan una vez en CACHE_DIR con un nombre que
+# incluye la firma de los tokens/reglas; si la gramática cambia
+# cambia la firma y se regeneran. LP_CS_SIN_CACHE=1 desactiva la
+# caché (se construye todo en memoria sin escribir archivos).
+# ==========================================================
+
+CACHE_DIR = os.environ.get(
+    "LP_CS_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__", "tablas_ply"),
+)
+
+
+def cache_activa():
+    return os.environ.get("LP_CS_SIN_CACHE", "") in ("", "0")
+
+
+def firma(*partes):
+    """Hash corto de las partes que definen una tabla (más la versión de PLY)."""
+    import zlib  # más liviano de importar que hashlib
+    from ply import __version__
+
+    datos = repr((__version__,) + partes).encode("utf-8")
+    return "%08x%08x" % (zlib.crc32(datos), zlib.adler32(datos))
+
+
+def firma_lexer():
+    """Firma de los tokens, palabras reservadas y patrones t_* de este módulo."""
+    modulo = sys.modules[__name__]
+    reglas = [(n, getattr(modulo, n)) for n in sorted(dir(modulo)) if n.startswith("t_")]
+    # Ser función o string cambia la prioridad de una regla, y entre
+    # funciones vale el orden de definición
+    funciones = sorted((f.__code__.co_firstlineno, n) for n, f in reglas if callable(f))
+    orden = {n: k for k, (_, n) in enumerate(funciones)}
+    reglas = [(n, "funcion", orden[n], v.__doc__) if callable(v) else (n, v) for n, v in reglas]
+    return firma(tokens, sorted(reserved.items()), reglas)
+
+
+def _cargar_modulo(nombre, path):
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location(nombre, path)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def build_lexer():
+    """Construye un lexer nuevo, usando la tabla en caché si existe."""
+    import ply.lex as lex  # import diferido: ply arrastra inspect
+
+    modulo = sys.modules[__name__]
+    if not cache_activa():
+        return lex.lex(module=modulo)
+
+    nombre = "lextab_" + firma_lexer()
+    path = os.path.join(CACHE_DIR, nombre + ".py")
+    if os.path.exists(path):
+        try:
+            return lex.lex(module=modulo, optimize=1, lextab=_cargar_modulo(nombre, path))
+        except Exception:
+            pass  # tabla corrupta o de otra versión: se regenera
+
+    # Se escribe con un nombre temporal y se renombra (atómico entre procesos)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    temporal = f"{nombre}_{os.getpid()}"
+    nuevo = lex.lex(module=modulo, optimize=1, lextab=temporal, outputdir=CACHE_DIR)
+    try:
+        os.replace(os.path.join(CACHE_DIR, temporal + ".py"), path)
+    except OSError:
+        pass
+    return nuevo
+
+
+# CONSTRUCCIÓN DEL LEXER (diferida: se crea en el primer uso)
+_lexer = None
+_lexer_lock = threading.Lock()
+
+
+def get_lexer():
+    global _lexer
+    if _lexer is None:
+        with _lexer_lock:  # varios hilos pueden pedirlo a la vez la primera vez
+            if _lexer is None:
+                _lexer = build_lexer_rapido() if backend_lexer() == "rapido" else build_lexer()
+    return _lexer
+
+
+_lexer_mapeado = None
+
+
+def get_lexer_mapeado():
+    """LexerMapeado compartido (se construye en el primer uso)."""
+    global _lexer_mapeado
+    if _lexer_mapeado is None:
+        with _lexer_lock:
+            if _lexer_mapeado is None:
+                _lexer_mapeado = build_lexer_mapeado()
+    return _lexer_mapeado
+
+
+def __getattr__(name):
+    # Compatibilidad con `from lexer_cs import lexer`
+    if name == "lexer":
+        return get_lexer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # BLOQUE PRINCIPAL (para pruebas)
+def main(argv=None):
+    import argparse
+    import contextlib
+    import salida_cs
+
+    ap = argparse.ArgumentParser(description="Análisis léxico de un archivo C#.")
+    ap.add_argument("archivo", help="archivo .cs")
+    ap.add_argument("-f", "--formato", choices=salida_cs.FORMATOS_TOKENS, default="tabla",
+                    help="tabla (por defecto), jsonl o bin (volcado columnar)")
+    ap.add_argument("-o", "--salida", default=None, help="archivo de salida (por defecto stdout)")
+    ap.add_argument("--stats", nargs="?", const="texto", choices=("texto", "json"), default=None,
+                    help="tiempo, memoria y tokens por tipo en stderr (ver estadisticas_cs)")
+    ap.add_argument("--mmap", action="store_true",
+                    help="mapear el archivo en memoria (LexerMapeado; posiciones en bytes)")
+    ap.add_argument("--buffer", action="store_true",
+                    help="tokenizar el archivo entero a columnas y escribir desde ahí (buffer_cs)")
+    args = ap.parse_args(argv)
+    if args.mmap and args.buffer:
+        ap.error("--mmap no se combina con --buffer")
+
+    try:
+        f = open(args.archivo, 'rb' if args.mmap else 'r')
+    except FileNotFoundError:
+        sys.stderr.write(f"Error: Archivo '{args.archivo}' no encontrado.\n")
+        return 1
+
+    binario = args.formato == "bin"
+    out = salida_cs.abrir_salida(args.salida, binario=binario)
+
+    est = None
+    if args.stats:
+        import estadisticas_cs
+        est = estadisticas_cs.Estadisticas()
+
+    # El archivo se lee por bloques (o se mapea): memoria constante sin
+    # importar su tamaño. Con --buffer se lee entero y se tokeniza de
+    # una vez a columnas (más rápido, memoria proporcional al archivo).
+    with f, out, (est.fase("lexer") if est else contextlib.nullcontext()):
+        if args.buffer:
+            import buffer_cs
+            buf = buffer_cs.tokenizar(f.read())
+            if est:
+                est.tokens_por_tipo.update(buf.por_tipo())
+            salida_cs.escribir_buffer(out, buf, args.formato, tokens)
+        else:
+            if args.mmap:
+                toks = iter_tokens_mapeado(get_lexer_mapeado(), mapear(args.archivo))
+            else:
+                toks = iter_tokens_stream(f, get_lexer())
+            if est:
+                toks = estadisticas_cs.contar_tokens(toks, est)
+            if binario:
+                salida_cs.escribir_tokens_bin(out, toks, tokens)
+            elif args.formato == "jsonl":
+                salida_cs.escribir_tokens_jsonl(out, toks)
+            else:
+                salida_cs.escribir_tokens_tabla(out, toks)
+    if est:
+        est.escribir(sys.stderr, args.stats)
+    return 0
+
+
 if __name__ == '__main__':
     if len(sys.argv) > 1:
-        file_path = sys.argv[1]
-        
-        try:
-            with open(file_path, 'r') as f:
-                data = f.read()
-        except FileNotFoundError:
-            sys.stderr.write(f"Error: Archivo '{file_path}' no encontrado.\n")
-            sys.exit(1)
-
-        lexer.input(data)
-        
-        # Formato de salida
-        print("--- Análisis Léxico de C# (PLY) ---")
-        print("{:<20} {:<20} {:<10} {:<10}".format("Tipo", "Lexema", "Línea", "Columna"))
-        print("-" * 60)
-        
-        for tok in lexer:
-            columna = find_column(data, tok)
-            print("{:<20} {:<20} {:<10} {:<10}".format(
-                tok.type, 
-                str(tok.value), 
-                tok.lineno, 
-                columna
-            ))
+        sys.exit(main())
     else:
-        sys.stderr.write("Uso: python lexer_cs.py <archivo.cs> > log.txt\n")
+        sys.stderr.write("Uso: python lexer_cs.py <archivo.cs> [-f tabla|jsonl|bin] [-o salida] [--stats [texto|json]] [--mmap|--buffer] > log.txt\n")
@@ -0,0 +1,196 @@
+###############################################################
+# ANÁLISIS SEMÁNTICO EN PARALELO DE UN ARCHIVO GRANDE
+# Dos fases sobre el AST ya parseado:
+#   1. Serial y rápida: recorre las sentencias de primer nivel en
+#      orden. Las definiciones (función, procedimiento, clase) solo
+#      declaran su nombre; el resto se analiza completo. Así quedan
+#      todos los globales con el índice de la sentencia que los
+#      declaró.
+#   2. Los cuerpos de las definiciones se reparten en un pool de
+#      procesos, en rangos contiguos. El cuerpo de la sentencia k ve
+#      solo los globales declarados en sentencias <= k, igual que en
+#      el análisis serial.
+# Los errores de cada sentencia se juntan por índice: la lista final
+# es idéntica a la de ContextoSemantico.analizar_programa.
+#
+# Con el método 'fork' los procesos heredan el AST sin copiarlo
+# (las tareas son solo rangos de índices).
+#
+# Uso:
+#   python paralelo_cs.py <archivo.cs> [-j N]
+###############################################################
+
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import semantico_comun
+
+DEFINICIONES = ("function_def", "procedure_def", "class")
+
+# Tareas por proceso: más que 1 para repartir bien cuerpos de distinto tamaño
+TAREAS_POR_PROCESO = 4
+
+
+# ==========================
+# Fase 1: declaraciones globales
+# ==========================
+
+def _fase_globales(statements):
+    """
+    Devuelve (errores por sentencia, globales, unidades) donde globales
+    es name -> (índice, Symbol) y unidades la lista de índices de
+    definiciones cuyo cuerpo falta analizar.
+    """
+    ctx = semantico_comun.ContextoSemantico()
+    tabla = ctx.symbol_table
+    errores = ctx.semantic_errors
+    declarados = tabla.ambitos[0]
+    por_sentencia = []
+    globales = {}
+    unidades = []
+    for k, stmt in enumerate(statements):
+        antes_errores = len(errores)
+        antes_globales = len(declarados)
+        if getattr(stmt, "tag", None) in DEFINICIONES:
+            ctx.declarar_definicion(stmt)
+            unidades.append(k)
+        else:
+            ctx.analizar_statement(stmt)
+        por_sentencia.append(errores[antes_errores:])
+        for name in declarados[antes_globales:]:
+            globales[name] = (k, tabla.get(name))
+    return por_sentencia, globales, unidades
+
+
+# ==========================
+# Fase 2: cuerpos (en los procesos)
+# ==========================
+
+# Estado del proceso: lo fija _iniciar (heredado sin copia con 'fork')
+_statements = None
+_globales = None
+
+
+def _iniciar(statements, globales):
+    global _statements, _globales
+    _statements = statements
+    _globales = globales
+
+
+def analizar_cuerpos(indices, statements=None, globales=None):
+    """Lista de (índice, errores) del cuerpo de cada definición en indices."""
+    statements = _statements if statements is None else statements
+    globales = _globales if globales is None else globales
+    # Los globales entran al ámbito global a medida que avanza k (los
+    # índices vienen en orden): las búsquedas no pasan por un resolver.
+    pendientes = sorted((k, name, sym) for name, (k, sym) in globales.items())
+    siguiente = 0
+
+    # Un solo contexto para todas: se conserva el memo de tipos entre cuerpos
+    ctx = semantico_comun.ContextoSemantico()
+    tabla = ctx.symbol_table
+    errores = ctx.semantic_errors
+    resultados = []
+    for k in indices:
+        if siguiente < len(pendientes) and pendientes[siguiente][0] <= k:
+            while siguiente < len(pendientes) and pendientes[siguiente][0] <= k:
+                _, name, sym = pendientes[siguiente]
+                tabla.vinculos[name] = [sym]
+                siguiente += 1
+            tabla.version += 1
+        antes = len(errores)
+        ctx.analizar_cuerpo(statements[k])
+        resultados.append((k, errores[antes:]))
+    return resultados
+
+
+def _repartir(unidades, statements, partes):
+    """Rangos contiguos de unidades con un largo de fuente parecido."""
+    pesos = [max(1, getattr(statements[k], "largo", 1)) for k in unidades]
+    objetivo = sum(pesos) / partes
+    tareas, actual, acumulado = [], [], 0
+    for k, peso in zip(unidades, pesos):
+        actual.append(k)
+        acumulado += peso
+        if acumulado >= objetivo:
+            tareas.append(actual)
+            actual, acumulado = [], 0
+    if actual:
+        tareas.append(actual)
+    return tareas
+
+
+def _contexto_procesos():
+    metodos = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in metodos else None)
+
+
+# ==========================
+# API
+# ==========================
+
+def analizar_programa(ast, procesos=None):
+    """
+    Mismo resultado que ContextoSemantico().analizar_programa(ast),
+    con los cuerpos repartidos en `procesos` procesos (por defecto uno
+    por CPU). Con procesos=1 todo se hace en este proceso.
+    """
+    if getattr(ast, "tag", None) != "program":
+        return semantico_comun.ContextoSemantico().analizar_programa(ast)
+    statements = ast.statements
+    por_sentencia, globales, unidades = _fase_globales(statements)
+
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(unidades) < 2:
+        resultados = analizar_cuerpos(unidades, statements, globales)
+    else:
+        tareas = _repartir(unidades, statements, procesos * TAREAS_POR_PROCESO)
+        with ProcessPoolExecutor(
+            max_workers=min(procesos, len(tareas)),
+            mp_context=_contexto_procesos(),
+            initializer=_iniciar,
+            initargs=(statements, globales),
+        ) as pool:
+            resultados = [r for parte in pool.map(analizar_cuerpos, tareas) for r in parte]
+
+    # Errores del cuerpo después de los de la declaración, en orden de sentencia
+    for k, errores in resultados:
+        por_sentencia[k].extend(errores)
+    return [e for errores in por_sentencia for e in errores]
+
+
+def main(argv=None):
+    import argparse
+
+    from sesion_cs import SesionAnalisis
+
+    ap = argparse.ArgumentParser(description="Análisis semántico en paralelo de un archivo C#.")
+    ap.add_argument("archivo", help="archivo .cs")
+    ap.add_argument("-j", "--procesos", type=int, default=None, help="procesos (por defecto, uno por CPU)")
+    args = ap.parse_args(argv)
+
+    try:
+        with open(args.archivo, 'r') as f:
+            data = f.read()
+    except FileNotFoundError:
+        sys.stderr.write(f"Error: Archivo '{args.archivo}' no encontrado.\n")
+        return 1
+
+    sesion = SesionAnalisis()
+    ast = sesion.parse(data)
+    for msg in sesion.lexer.errores + sesion.errores_sintacticos:
+        sys.stderr.write(msg + "\n")
+    inicio = time.perf_counter()
+    errores = analizar_programa(ast, args.procesos)
+    segundos = time.perf_counter() - inicio
+    for e in errores:
+        sys.stdout.write(f"ERROR SEMÁNTICO: {e}\n")
+    sys.stderr.write(f"{len(errores)} errores semánticos en {segundos:.3f}s\n")
+    return 2 if errores else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
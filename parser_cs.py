@@ -6,11 +6,14 @@
 # - Juan Romero: FOR, Clases, Métodos
 ###############################################################
 
-import ply.yacc as yacc
-from lexer_cs import tokens, lexer
+import ast_cs
+import lexer_cs
+import plegado_cs
+from lexer_cs import tokens
+import os
 import sys
+import threading
 import datetime
-from semantico_comun import analizar_programa
 
 ###############################################################
 # PRECEDENCIA DE OPERADORES
@@ -20,19 +23,50 @@ precedence = (
     ('left', 'OPERATOR'),
 )
 
+# Los IDENTIFIER y las palabras reservadas (tipos) llegan del lexer
+# como strings ya compartidos (lexer_cs.nombre): las reglas los usan
+# tal cual, sin volver a internarlos.
+
+###############################################################
+# POSICIONES
+# Cada regla calcula el offset inicial/final de lo que reduce y lo
+# deja en p.slice[0] (lexpos/endlexpos) para que la regla padre
+# lo use. Así no hace falta yacc.parse(tracking=True).
+###############################################################
+
+def _ubicar(p):
+    if len(p) == 1:  # producción vacía: no ocupa texto
+        p.slice[0].lexpos = p.slice[0].endlexpos = None
+        return None, None
+    primero = p.slice[1]
+    ultimo = p.slice[-1]
+    inicio = getattr(primero, "lexpos", None)
+    if hasattr(ultimo, "endlexpos"):
+        fin = ultimo.endlexpos
+    else:  # token
+        fin = ultimo.lexpos + len(lexer_cs.lexema(ultimo))
+    p.slice[0].lexpos = inicio
+    p.slice[0].endlexpos = fin
+    return inicio, fin
+
 ###############################################################
 # REGLA PRINCIPAL
 ###############################################################
 
 def p_program(p):
     """program : statement_list"""
-    p[0] = ("program", p[1])
+    p[0] = ast_cs.Program(p[1], *_ubicar(p))
 
+# Las listas se extienden en su lugar (append, O(1) amortizado) en vez de
+# concatenar p[1] + [...], que copiaba toda la lista en cada reducción.
+# La lista de p[1] la creó la reducción anterior y nadie más la usa.
 def p_statement_list(p):
     """statement_list : statement_list statement
                       | statement"""
+    _ubicar(p)
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
@@ -54,15 +88,17 @@ def p_statement(p):
                  | class_def
                  | return_statement
                  | expression_statement"""
+    _ubicar(p)
     p[0] = p[1]
 
 def p_block(p):
     """block : LBRACE statement_list RBRACE
              | LBRACE RBRACE"""
+    posicion = _ubicar(p)
     if len(p) == 4:
-        p[0] = ("block", p[2])
+        p[0] = ast_cs.Block(p[2], *posicion)
     else:
-        p[0] = ("block", [])
+        p[0] = ast_cs.Block([], *posicion)
 
 ###############################################################
 # DECLARACIONES Y ASIGNACIONES (COMPARTIDO)
@@ -71,11 +107,12 @@ def p_block(p):
 def p_declaration(p):
     """declaration : type IDENTIFIER SEMICOLON
                    | type IDENTIFIER OPERATOR expression SEMICOLON"""
+    posicion = _ubicar(p)
     if len(p) == 4:
-        p[0] = ("declaration", p[1], p[2])
+        p[0] = ast_cs.Declaration(p[1], p[2], *posicion)
     else:
         if p[3] == '=':
-            p[0] = ("declaration_init", p[1], p[2], p[4])
+            p[0] = ast_cs.DeclarationInit(p[1], p[2], p[4], *posicion)
 
 def p_type(p):
     """type : KEYWORD_TYPE_INT
@@ -83,25 +120,41 @@ def p_type(p):
             | KEYWORD_TYPE_BOOL
             | KEYWORD_TYPE_CHAR
             | KEYWORD_TYPE_STRING"""
+    _ubicar(p)
     p[0] = p[1]
 
 def p_assignment(p):
     """assignment : IDENTIFIER OPERATOR expression SEMICOLON"""
+    posicion = _ubicar(p)
     if p[2] == '=':
-        p[0] = ("assign", p[1], p[3])
+        p[0] = ast_cs.Assign(p[1], p[3], *posicion)
 
 ###############################################################
 # EXPRESIONES (COMPARTIDO)
 ###############################################################
 
+# 'a + b' es un BinOp; las cadenas de ast_cs.MIN_CADENA operadores o más
+# se juntan en un solo nodo OpChain: p[1] es la cadena de la izquierda
+# (asociatividad a izquierda) y se extiende en su lugar. p[3] solo es un
+# BinOp/OpChain si venía entre paréntesis.
+# Si los dos lados son constantes la operación se pliega a un Literal
+# (plegado_cs): como las reducciones van de adentro hacia afuera, esto
+# es el plegado de constantes completo, sin otra pasada sobre el AST.
 def p_expression_binop(p):
     """expression : expression OPERATOR expression"""
-    p[0] = ("binop", p[2], p[1], p[3])
+    op = ast_cs.compartir(p[2])
+    posicion = _ubicar(p)
+    p[0] = plegado_cs.plegar(op, p[1], p[3], *posicion) or ast_cs.encadenar(op, p[1], p[3], *posicion)
 
 def p_expression_group(p):
     """expression : LPAREN expression RPAREN"""
+    _ubicar(p)
     p[0] = p[2]
 
+# true/false/null llegan como palabras reservadas; los números ya vienen
+# convertidos del lexer y string/char quedan con sus comillas
+_VALORES_CLAVE = {"KEYWORD_TRUE": True, "KEYWORD_FALSE": False, "KEYWORD_NULL": None}
+
 def p_expression_literal(p):
     """expression : INT_LITERAL
                   | FLOAT_LITERAL
@@ -110,15 +163,18 @@ def p_expression_literal(p):
                   | KEYWORD_TRUE
                   | KEYWORD_FALSE
                   | KEYWORD_NULL"""
-    p[0] = ("literal", p[1])
+    tipo = p.slice[1].type
+    valor = _VALORES_CLAVE[tipo] if tipo in _VALORES_CLAVE else ast_cs.compartir(p[1])
+    p[0] = ast_cs.Literal(valor, *_ubicar(p))
 
 def p_expression_var(p):
     """expression : IDENTIFIER"""
-    p[0] = ("var", p[1])
+    _ubicar(p)
+    p[0] = ast_cs.Var(p[1], p.lexpos(1))
 
 def p_expression_statement(p):
     """expression_statement : expression SEMICOLON"""
-    p[0] = ("expr_stmt", p[1])
+    p[0] = ast_cs.ExprStmt(p[1], *_ubicar(p))
 
 ###############################################################
 # 1️⃣ SECCIÓN DE DANIEL VILEMA
@@ -131,38 +187,43 @@ def p_expression_statement(p):
 # ARRAYS: int[] arr = new int[5];
 def p_array_declaration(p):
     """array_declaration : type LBRACKET RBRACKET IDENTIFIER OPERATOR KEYWORD_NEW type LBRACKET INT_LITERAL RBRACKET SEMICOLON"""
+    posicion = _ubicar(p)
     if p[5] == '=':
-        p[0] = ("array_decl", p[1], p[4], p[9])
+        p[0] = ast_cs.ArrayDecl(p[1], p[4], p[9], *posicion)
 
 # IF-ELSE
 def p_if_statement(p):
     """if_statement : KEYWORD_IF LPAREN expression RPAREN block
                     | KEYWORD_IF LPAREN expression RPAREN block KEYWORD_ELSE block"""
+    posicion = _ubicar(p)
     if len(p) == 6:
-        p[0] = ("if", p[3], p[5])
+        p[0] = ast_cs.If(p[3], p[5], *posicion)
     else:
-        p[0] = ("if_else", p[3], p[5], p[7])
+        p[0] = ast_cs.IfElse(p[3], p[5], p[7], *posicion)
 
 # FUNCIONES CON RETORNO
 def p_function_def(p):
     """function_def : type IDENTIFIER LPAREN params RPAREN block"""
-    p[0] = ("function_def", p[1], p[2], p[4], p[6])
+    p[0] = ast_cs.FunctionDef(p[1], p[2], p[4], p[6], *_ubicar(p))
 
 # RETURN STATEMENT
 def p_return_statement(p):
     """return_statement : KEYWORD_RETURN expression SEMICOLON"""
-    p[0] = ("return", p[2])
+    p[0] = ast_cs.Return(p[2], *_ubicar(p))
 
 def p_params(p):
     """params : param_list
               | empty"""
+    _ubicar(p)
     p[0] = p[1] if p[1] else []
 
 def p_param_list(p):
     """param_list : param_list COMMA type IDENTIFIER
                   | type IDENTIFIER"""
+    _ubicar(p)
     if len(p) == 5:
-        p[0] = p[1] + [(p[3], p[4])]
+        p[1].append((p[3], p[4]))
+        p[0] = p[1]
     else:
         p[0] = [(p[1], p[2])]
 
@@ -171,28 +232,66 @@ def p_param_list(p):
 def p_class_def(p):
     """class_def : KEYWORD_CLASS IDENTIFIER LBRACE class_body RBRACE
                  | KEYWORD_CLASS IDENTIFIER LBRACE RBRACE"""
+    posicion = _ubicar(p)
     if len(p) == 6:
-        p[0] = ("class", p[2], p[4])
+        p[0] = ast_cs.Class(p[2], p[4], *posicion)
     else:
-        p[0] = ("class", p[2], [])
+        p[0] = ast_cs.Class(p[2], [], *posicion)
 
 def p_class_body(p):
     """class_body : class_body class_member
                   | class_member"""
+    _ubicar(p)
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
 def p_class_member(p):
     """class_member : declaration
                     | method_def"""
+    _ubicar(p)
     p[0] = p[1]
 
 # MÉTODOS DE CLASE
 def p_method_def(p):
     """method_def : type IDENTIFIER LPAREN params RPAREN block"""
-    p[0] = ("method", p[1], p[2], p[4], p[6])
+    p[0] = ast_cs.Method(p[1], p[2], p[4], p[6], *_ubicar(p))
+
+
+###############################################################
+# SECCIÓN DE KIARA MORÁN
+# Responsabilidad:
+# - Estructura de control: WHILE
+# - Entrada/Salida: Console.WriteLine / Console.ReadLine
+# - Tipo de función: Procedimientos (void)
+###############################################################
+
+# WHILE
+def p_while_statement(p):
+    """while_statement : KEYWORD_WHILE LPAREN expression RPAREN block"""
+    p[0] = ast_cs.While(p[3], p[5], *_ubicar(p))
+
+# IMPRESIÓN: Console.WriteLine(expr);
+def p_print_statement(p):
+    """print_statement : IDENTIFIER DOT IDENTIFIER LPAREN expression RPAREN SEMICOLON"""
+    p[0] = ast_cs.Print(p[5], *_ubicar(p))
+
+# INGRESO DE DATOS: x = Console.ReadLine();
+def p_input_statement(p):
+    """input_statement : IDENTIFIER OPERATOR IDENTIFIER DOT IDENTIFIER LPAREN RPAREN SEMICOLON"""
+    posicion = _ubicar(p)
+    if p[2] == '=':
+        p[0] = ast_cs.Input(p[1], *posicion)
+
+# PROCEDIMIENTOS: void Nombre(params) { ... }
+# 'void' no es palabra reservada en el lexer, llega como IDENTIFIER.
+def p_procedure_def(p):
+    """procedure_def : IDENTIFIER IDENTIFIER LPAREN params RPAREN block"""
+    posicion = _ubicar(p)
+    if p[1] == 'void':
+        p[0] = ast_cs.ProcedureDef(p[2], p[4], p[6], *posicion)
 
 
 ###############################################################
@@ -206,44 +305,50 @@ def p_method_def(p):
 # FOR
 def p_for_statement(p):
     """for_statement : KEYWORD_FOR LPAREN for_init expression SEMICOLON for_update RPAREN block"""
-    p[0] = ("for", p[3], p[4], p[6], p[8])
+    p[0] = ast_cs.For(p[3], p[4], p[6], p[8], *_ubicar(p))
 
 def p_for_init(p):
     """for_init : IDENTIFIER OPERATOR expression SEMICOLON"""
+    posicion = _ubicar(p)
     if p[2] == '=':
-        p[0] = ("assign", p[1], p[3])
+        p[0] = ast_cs.Assign(p[1], p[3], *posicion)
 
 def p_for_update(p):
     """for_update : IDENTIFIER OPERATOR expression"""
+    posicion = _ubicar(p)
     if p[2] == '=':
-        p[0] = ("assign", p[1], p[3])
+        p[0] = ast_cs.Assign(p[1], p[3], *posicion)
 
 # CLASES
 def p_class_def(p):
     """class_def : KEYWORD_CLASS IDENTIFIER LBRACE class_body RBRACE
                  | KEYWORD_CLASS IDENTIFIER LBRACE RBRACE"""
+    posicion = _ubicar(p)
     if len(p) == 6:
-        p[0] = ("class", p[2], p[4])
+        p[0] = ast_cs.Class(p[2], p[4], *posicion)
     else:
-        p[0] = ("class", p[2], [])
+        p[0] = ast_cs.Class(p[2], [], *posicion)
 
 def p_class_body(p):
     """class_body : class_body class_member
                   | class_member"""
+    _ubicar(p)
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
 def p_class_member(p):
     """class_member : declaration
                     | method_def"""
+    _ubicar(p)
     p[0] = p[1]
 
 # MÉTODOS DE CLASE
 def p_method_def(p):
     """method_def : type IDENTIFIER LPAREN params RPAREN block"""
-    p[0] = ("method", p[1], p[2], p[4], p[6])
+    p[0] = ast_cs.Method(p[1], p[2], p[4], p[6], *_ubicar(p))
 
 ###############################################################
 # EMPTY
@@ -251,50 +356,151 @@ def p_method_def(p):
 
 def p_empty(p):
     """empty :"""
-    pass
+    _ubicar(p)
 
 ###############################################################
 # MANEJO DE ERRORES
 ###############################################################
 
-def p_error(p):
+def mensaje_error_sintactico(p):
     if p:
-        sys.stderr.write(
-            f"ERROR SINTÁCTICO: Token inesperado '{p.value}' "
-            f"(tipo: {p.type}) en línea {p.lineno}\n"
+        return (
+            f"ERROR SINTÁCTICO: Token inesperado '{lexer_cs.lexema(p)}' "
+            f"(tipo: {p.type}) en línea {p.lineno}, "
+            f"columna {lexer_cs.find_column(p.lexer.lexdata, p)}"
         )
-    else:
-        sys.stderr.write("ERROR SINTÁCTICO: Fin inesperado del archivo\n")
+    return "ERROR SINTÁCTICO: Fin inesperado del archivo"
+
+def p_error(p):
+    sys.stderr.write(mensaje_error_sintactico(p) + "\n")
 
 ###############################################################
 # CONSTRUCCIÓN DEL PARSER
+# Las tablas LALR se guardan en lexer_cs.CACHE_DIR como pickle,
+# con la firma de la gramática en el nombre. Solo se generan la
+# primera vez (o cuando cambia la gramática); parser.out solo se
+# escribe con LP_CS_DEBUG=1.
 ###############################################################
 
-parser = yacc.yacc()
+def firma_gramatica():
+    """Firma de tokens, precedencia y reglas p_* de este módulo."""
+    modulo = sys.modules[__name__]
+    reglas = []
+    for nombre in sorted(dir(modulo)):
+        if nombre.startswith("p_") and nombre != "p_error":
+            reglas.append((nombre, getattr(modulo, nombre).__doc__))
+    return lexer_cs.firma(tokens, precedence, reglas)
+
+
+def build_parser():
+    """Construye un parser nuevo, usando las tablas en caché si existen."""
+    import ply.yacc as yacc  # import diferido: ply.yacc arrastra inspect
+
+    modulo = sys.modules[__name__]
+    debug = os.environ.get("LP_CS_DEBUG", "") not in ("", "0")
+    if not lexer_cs.cache_activa():
+        return yacc.yacc(module=modulo, debug=debug, write_tables=False)
+
+    os.makedirs(lexer_cs.CACHE_DIR, exist_ok=True)
+    path = os.path.join(lexer_cs.CACHE_DIR, f"parsetab_{firma_gramatica()}.pickle")
+    opciones = dict(module=modulo, debug=debug, outputdir=lexer_cs.CACHE_DIR)
+    if os.path.exists(path):
+        try:
+            # yacc valida además la firma guardada dentro del pickle
+            return yacc.yacc(picklefile=path, **opciones)
+        except Exception:
+            pass  # tabla corrupta: se regenera
+
+    # Se escribe con un nombre temporal y se renombra (atómico entre procesos)
+    temporal = f"{path}.{os.getpid()}.tmp"
+    nuevo = yacc.yacc(picklefile=temporal, **opciones)
+    try:
+        os.replace(temporal, path)
+    except OSError:
+        pass
+    return nuevo
+
+
+# Construcción diferida: se crea en el primer uso
+_parser = None
+_parser_lock = threading.Lock()
+
+
+def get_parser():
+    global _parser
+    if _parser is None:
+        with _parser_lock:  # varios hilos pueden pedirlo a la vez la primera vez
+            if _parser is None:
+                _parser = build_parser()
+    return _parser
+
+
+def get_semantico():
+    """Importa el analizador semántico solo cuando se necesita."""
+    import semantico_comun
+    return semantico_comun
+
+
+def __getattr__(name):
+    # Compatibilidad con `from parser_cs import parser, lexer`
+    if name == "parser":
+        return get_parser()
+    if name == "lexer":
+        return lexer_cs.get_lexer()
+    if name == "analizar_programa":
+        return get_semantico().analizar_programa
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 ###############################################################
 # MAIN - EJECUCIÓN
 ###############################################################
 
-if __name__ == '__main__':
-    if len(sys.argv) > 1:
-        file_path = sys.argv[1]
-        try:
-            with open(file_path, 'r') as f:
+def main(argv=None):
+    import argparse
+    import salida_cs
+
+    ap = argparse.ArgumentParser(description="Análisis sintáctico de un archivo C#.")
+    ap.add_argument("archivo", help="archivo .cs")
+    ap.add_argument("-f", "--formato", choices=salida_cs.FORMATOS_AST, default="texto",
+                    help="texto (tuplas, por defecto), json o jsonl (una sentencia por línea)")
+    ap.add_argument("-o", "--salida", default=None, help="archivo de salida (por defecto stdout)")
+    ap.add_argument("--stats", nargs="?", const="texto", choices=("texto", "json"), default=None,
+                    help="estadísticas de lexer y parser en stderr (ver estadisticas_cs)")
+    ap.add_argument("--mmap", action="store_true",
+                    help="mapear el archivo en memoria (lexer_cs.LexerMapeado; posiciones en bytes)")
+    args = ap.parse_args(argv)
+    if args.mmap and args.stats:
+        ap.error("--mmap no se combina con --stats")
+
+    try:
+        if args.mmap:
+            # Sin leer el archivo: el lexer recorre el mmap
+            result = get_parser().parse(lexer_cs.mapear(args.archivo), lexer=lexer_cs.get_lexer_mapeado())
+        else:
+            with open(args.archivo, 'r') as f:
                 data = f.read()
-            
-            result = parser.parse(data, lexer=lexer)
-            print("--- ANÁLISIS SINTÁCTICO EXITOSO ---")
-            if result:
-                print(result)
-            
-        except FileNotFoundError:
-            sys.stderr.write(f"Error: Archivo '{file_path}' no encontrado.\n")
-            sys.exit(1)
-        except Exception as e:
-            sys.stderr.write(f"Error durante el análisis: {str(e)}\n")
-            sys.exit(1)
-    else:
-        sys.stderr.write("Uso: python parser_cs.py <archivo.cs> 2> sintactico-log.txt\n")
+
+            if args.stats:
+                import estadisticas_cs
+                result, _, est = estadisticas_cs.analizar(data, semantico=False)
+            else:
+                result = get_parser().parse(data, lexer=lexer_cs.get_lexer())
+        with salida_cs.abrir_salida(args.salida) as out:
+            salida_cs.escribir_ast(out, result, args.formato)
+        if args.stats:
+            est.escribir(sys.stderr, args.stats)
+
+    except FileNotFoundError:
+        sys.stderr.write(f"Error: Archivo '{args.archivo}' no encontrado.\n")
+        return 1
+    except Exception as e:
+        sys.stderr.write(f"Error durante el análisis: {str(e)}\n")
+        return 1
+    return 0
 
 
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        sys.exit(main())
+    else:
+        sys.stderr.write("Uso: python parser_cs.py <archivo.cs> [-f texto|json|jsonl] [-o salida] [--stats [texto|json]] [--mmap] 2> sintactico-log.txt\n")
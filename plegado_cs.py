@@ -0,0 +1,110 @@
+###############################################################
+# PLEGADO DE CONSTANTES
+# Una operación entre dos literales se reemplaza por el Literal de
+# su resultado ('2 * 3 + 1' queda como 7, 'MAX < 10' no se toca).
+# El parser lo aplica en cada reducción de 'expression OPERATOR
+# expression' (ver parser_cs.p_expression_binop); como el árbol se
+# reduce de adentro hacia afuera, los prefijos constantes de una
+# cadena y las subexpresiones entre paréntesis quedan plegados, y las
+# condiciones de if/while/for que ya se conocen llegan al semántico
+# como un literal bool.
+#
+# Solo se pliega lo que el semántico aceptaría sin errores y con el
+# mismo tipo (ContextoSemantico._tipo_binop):
+#   - aritmética (+ - * / %) entre int y double; int con int da int
+#     (división y resto truncados como en C#) y si el resultado se sale
+#     de 32 bits no se pliega
+#   - comparaciones (== != < > <= >=) entre números, y == != entre bool
+#   - && || entre bool
+# Nada más (strings, null, operadores de asignación, división por
+# cero): así la lista de errores semánticos es la misma con o sin
+# plegado. Las ramas de un if con condición constante NO se eliminan:
+# sus errores se siguen informando.
+###############################################################
+
+import math
+import operator
+
+from ast_cs import Literal
+
+INT_MIN = -(1 << 31)
+INT_MAX = (1 << 31) - 1
+
+_NUMEROS = (int, float)
+
+
+def _dividir_int(a, b):
+    # C# trunca hacia cero (// de Python redondea hacia abajo)
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+def _resto_int(a, b):
+    # El resto tiene el signo del dividendo
+    r = abs(a) % abs(b)
+    return r if a >= 0 else -r
+
+
+# operador -> (función con dos int, función con double)
+_ARITMETICOS = {
+    "+": (operator.add, operator.add),
+    "-": (operator.sub, operator.sub),
+    "*": (operator.mul, operator.mul),
+    "/": (_dividir_int, operator.truediv),
+    "%": (_resto_int, math.fmod),
+}
+
+_RELACIONALES = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+    "<=": operator.le,
+    ">=": operator.ge,
+}
+
+_LOGICOS = {
+    "&&": lambda a, b: a and b,
+    "||": lambda a, b: a or b,
+}
+
+
+def valor_plegado(op, a, b):
+    """
+    Valor de 'a op b' con a y b ya tipados, o None si la operación no
+    se pliega.
+    """
+    ta, tb = type(a), type(b)
+    if op in _ARITMETICOS:
+        if ta not in _NUMEROS or tb not in _NUMEROS:
+            return None
+        if (op == "/" or op == "%") and b == 0:
+            return None
+        con_int, con_double = _ARITMETICOS[op]
+        if ta is int and tb is int:
+            valor = con_int(a, b)
+            return valor if INT_MIN <= valor <= INT_MAX else None
+        valor = con_double(float(a), float(b))
+        return valor if math.isfinite(valor) else None
+    if op in _RELACIONALES:
+        if ta in _NUMEROS and tb in _NUMEROS:
+            return _RELACIONALES[op](a, b)
+        if ta is bool and tb is bool and (op == "==" or op == "!="):
+            return _RELACIONALES[op](a, b)
+        return None
+    if op in _LOGICOS and ta is bool and tb is bool:
+        return _LOGICOS[op](a, b)
+    return None
+
+
+def plegar(op, left, right, inicio=0, fin=0):
+    """
+    Literal con el resultado de 'left op right' (abarcando inicio..fin)
+    si los dos lados son literales y la operación se pliega; si no, None.
+    """
+    if type(left) is not Literal or type(right) is not Literal:
+        return None
+    valor = valor_plegado(op, left.valor, right.valor)
+    if valor is None:
+        return None
+    return Literal(valor, inicio, fin)
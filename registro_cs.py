@@ -0,0 +1,166 @@
+###############################################################
+# REGISTRO DE ERRORES SEMÁNTICOS EN STREAMING (corridas batch)
+# Un solo EscritorErrores por corrida: un hilo de fondo que saca
+# registros de una cola acotada y los escribe en UN archivo de log
+# (JSON Lines o texto) con buffer grande, rotándolo por tamaño
+# (errores.jsonl, errores.jsonl.1, ...). Cada registro lleva el
+# archivo, la regla (el tipo de sentencia que se analizaba), la
+# línea/columna y el mensaje.
+#
+# Los errores se mandan a la cola apenas el semántico los encuentra
+# (ContextoSemantico.reportar), no al final. Si la cola se llena el
+# análisis espera al escritor: la memoria queda acotada por el
+# tamaño de la cola sin importar cuántos errores haya. Con
+# max_por_archivo se cortan los errores de un archivo y se escribe
+# una línea con cuántos se omitieron.
+#
+# Con procesos (batch_cs -j N) la cola es una multiprocessing.Queue
+# que heredan los workers.
+#
+#   with EscritorErrores("logs/errores.jsonl") as escritor:
+#       reportero = Reportero(escritor.cola, "a.cs", data, max_por_archivo=100)
+#       contexto.reportar = reportero
+#       contexto.analizar_programa(ast)
+#       reportero.terminar()
+###############################################################
+
+import io
+import json
+import os
+import queue
+import threading
+
+import lexer_cs
+
+FORMATOS_LOG = ("jsonl", "texto")
+TAM_COLA = 10_000
+MAX_BYTES = 16 << 20
+RESPALDOS = 5
+TAM_BUFFER = 1 << 20
+
+
+class Reportero:
+    """
+    reportar(msg, nodo) para el ContextoSemantico de un archivo: pone
+    (archivo, regla, línea, columna, msg) en la cola del escritor.
+    """
+    __slots__ = ("cola", "archivo", "data", "indice", "max_por_archivo", "enviados", "omitidos")
+
+    def __init__(self, cola, archivo, data, max_por_archivo=None):
+        self.cola = cola
+        self.archivo = archivo
+        self.data = data
+        self.indice = None      # índice de líneas: se arma con el primer error
+        self.max_por_archivo = max_por_archivo
+        self.enviados = 0
+        self.omitidos = 0
+
+    def __call__(self, msg, nodo):
+        if self.max_por_archivo is not None and self.enviados >= self.max_por_archivo:
+            self.omitidos += 1
+            return
+        self.enviados += 1
+        linea = columna = None
+        inicio = getattr(nodo, "inicio", None)
+        if inicio is not None:
+            if self.indice is None:
+                self.indice = lexer_cs.get_line_index(self.data)
+            linea = self.indice.line(inicio)
+            columna = self.indice.column(inicio)
+        self.cola.put((self.archivo, getattr(nodo, "tag", None), linea, columna, msg))
+
+    def terminar(self):
+        """Deja constancia de los errores que se cortaron por max_por_archivo."""
+        if self.omitidos:
+            self.cola.put((self.archivo, None, None, None,
+                           f"{self.omitidos} errores más omitidos (máximo {self.max_por_archivo} por archivo)"))
+
+
+class EscritorErrores:
+    """
+    Hilo escritor del log de errores. `cola` puede ser una
+    multiprocessing.Queue para recibir errores de otros procesos.
+    """
+
+    def __init__(self, path, formato="jsonl", max_bytes=MAX_BYTES, respaldos=RESPALDOS, cola=None):
+        if formato not in FORMATOS_LOG:
+            raise ValueError(f"formato de log desconocido: {formato}")
+        self.path = path
+        self.formato = formato
+        self.max_bytes = max_bytes
+        self.respaldos = respaldos
+        self.cola = cola if cola is not None else queue.Queue(TAM_COLA)
+        self.escritos = 0
+        self._out = None
+        self._bytes = 0
+        self._hilo = None
+
+    # ==========================
+    # Archivo y rotación
+    # ==========================
+
+    def _abrir(self):
+        directorio = os.path.dirname(self.path)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._out = io.open(self.path, "a", encoding="utf-8", buffering=TAM_BUFFER)
+        self._bytes = self._out.tell()
+
+    def _rotar(self):
+        self._out.close()
+        for k in range(self.respaldos - 1, 0, -1):
+            viejo = f"{self.path}.{k}"
+            if os.path.exists(viejo):
+                os.replace(viejo, f"{self.path}.{k + 1}")
+        if self.respaldos > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._abrir()
+
+    def formatear(self, registro):
+        archivo, regla, linea, columna, msg = registro
+        if self.formato == "jsonl":
+            return json.dumps({"archivo": archivo, "regla": regla, "linea": linea,
+                               "columna": columna, "mensaje": msg}, ensure_ascii=False) + "\n"
+        lugar = archivo if linea is None else f"{archivo}:{linea}:{columna}"
+        return f"{lugar}: [{regla or '-'}] {msg}\n"
+
+    # ==========================
+    # Hilo
+    # ==========================
+
+    def _escribir(self):
+        cola = self.cola
+        while True:
+            registro = cola.get()
+            if registro is None:
+                break
+            linea = self.formatear(registro)
+            if self.max_bytes and self._bytes and self._bytes + len(linea) > self.max_bytes:
+                self._rotar()
+            self._out.write(linea)
+            self._bytes += len(linea.encode("utf-8"))
+            self.escritos += 1
+
+    def iniciar(self):
+        self._abrir()
+        self._hilo = threading.Thread(target=self._escribir, name="escritor-errores", daemon=True)
+        self._hilo.start()
+        return self
+
+    def cerrar(self):
+        """Escribe lo que quede en la cola y cierra el log."""
+        if self._hilo is not None:
+            self.cola.put(None)
+            self._hilo.join()
+            self._hilo = None
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.cerrar()
@@ -0,0 +1,285 @@
+###############################################################
+# FORMATOS DE SALIDA DE LOS CLI (lexer_cs / parser_cs)
+# Todo se escribe a través de un único buffer grande (1 MB) en vez
+# de un print por token. Formatos:
+#   tabla  - tokens en el formato de siempre (Tipo, Lexema, Línea, Columna)
+#   texto  - el AST como tuplas, igual que antes
+#   jsonl  - un objeto JSON por línea (tokens) o por sentencia (AST)
+#   json   - el AST completo como un documento JSON
+#   bin    - volcado columnar binario de tokens (ver más abajo)
+# Los lectores (leer_tokens_jsonl, leer_bloques_bin, leer_ast_json)
+# cargan esas salidas sin reparsear texto.
+###############################################################
+
+import io
+import json
+import operator
+import struct
+import sys
+from array import array
+from json.encoder import encode_basestring
+
+import ast_cs
+from buffer_cs import TIPOS
+from lexer_cs import lexema
+
+TAM_BUFFER = 1 << 20
+FORMATOS_TOKENS = ("tabla", "jsonl", "bin")
+FORMATOS_AST = ("texto", "json", "jsonl")
+
+
+# ==========================
+# Buffer de salida
+# ==========================
+
+def abrir_salida(path=None, binario=False):
+    """
+    Abre `path` (o stdout si es None/'-') con un buffer de TAM_BUFFER.
+    Devuelve un stream de bytes si binario, si no uno de texto UTF-8.
+    """
+    if path in (None, "-"):
+        sys.stdout.flush()
+        raw = io.FileIO(sys.stdout.fileno(), "wb", closefd=False)
+    else:
+        raw = io.FileIO(path, "wb")
+    buffer = io.BufferedWriter(raw, TAM_BUFFER)
+    if binario:
+        return buffer
+    return io.TextIOWrapper(buffer, encoding="utf-8", newline="\n")
+
+
+# ==========================
+# Tokens: tabla y JSON Lines
+# ==========================
+
+FILA_TABLA = "{:<20} {:<20} {:<10} {:<10}\n"
+
+
+def _filas(toks):
+    # (tipo, lexema, línea, columna, posición) de cada token
+    for tok in toks:
+        yield tok.type, lexema(tok), tok.lineno, tok.column, tok.lexpos
+
+
+def escribir_tokens_tabla(out, toks):
+    return _escribir_tabla(out, _filas(toks))
+
+
+def _escribir_tabla(out, filas):
+    out.write("--- Análisis Léxico de C# (PLY) ---\n")
+    out.write(FILA_TABLA.format("Tipo", "Lexema", "Línea", "Columna"))
+    out.write("-" * 60 + "\n")
+    fila = FILA_TABLA.format
+    write = out.write
+    n = 0
+    for tipo, texto, linea, columna, _ in filas:
+        write(fila(tipo, texto, linea, columna))
+        n += 1
+    return n
+
+
+def escribir_tokens_jsonl(out, toks):
+    """Un token por línea: {"type", "value", "line", "column", "pos"}."""
+    return _escribir_jsonl(out, _filas(toks))
+
+
+def _escribir_jsonl(out, filas):
+    write = out.write
+    n = 0
+    for tipo, texto, linea, columna, pos in filas:
+        write(
+            f'{{"type":"{tipo}","value":{encode_basestring(texto)},'
+            f'"line":{linea},"column":{columna},"pos":{pos}}}\n'
+        )
+        n += 1
+    return n
+
+
+def leer_tokens_jsonl(f):
+    """Devuelve un dict por token de una salida jsonl."""
+    for linea in f:
+        if linea.strip():
+            yield json.loads(linea)
+
+
+# ==========================
+# Tokens: volcado binario columnar
+# Little-endian. Cabecera:
+#   b"LPCSTOK1", uint32 n_tipos, por tipo: uint16 largo + nombre UTF-8
+# Luego bloques de hasta TAM_BLOQUE tokens:
+#   uint32 n (0 = fin del volcado)
+#   uint8  tipo[n]     (índice en la tabla de tipos)
+#   uint32 linea[n]
+#   uint32 columna[n]
+#   uint64 posicion[n]
+#   uint32 largo[n]    (bytes UTF-8 de cada lexema)
+#   lexemas UTF-8 concatenados
+# ==========================
+
+MAGICO = b"LPCSTOK1"
+TAM_BLOQUE = 1 << 16
+_COLUMNAS = (("tipo", "B"), ("linea", "I"), ("columna", "I"), ("posicion", "Q"), ("largo", "I"))
+_INVERTIR = sys.byteorder == "big"
+
+
+def _volcar_bloque(out, columnas, lexemas):
+    # lexemas: los bytes UTF-8 de todos los lexemas, ya concatenados
+    out.write(struct.pack("<I", len(columnas[0])))
+    for arr in columnas:
+        if _INVERTIR:
+            arr.byteswap()
+        out.write(arr)
+    out.write(lexemas)
+
+
+def _cabecera_bin(out, tipos):
+    # Devuelve el índice de cada tipo en la tabla
+    out.write(MAGICO + struct.pack("<I", len(tipos)))
+    for t in tipos:
+        nombre = t.encode("utf-8")
+        out.write(struct.pack("<H", len(nombre)) + nombre)
+    return {t: i for i, t in enumerate(tipos)}
+
+
+def escribir_tokens_bin(out, toks, tipos):
+    indice = _cabecera_bin(out, list(tipos))
+    n = 0
+    tipo, linea, columna, posicion, largo = columnas = [array(c) for _, c in _COLUMNAS]
+    lexemas = []
+    for tok in toks:
+        valor = lexema(tok).encode("utf-8")
+        tipo.append(indice[tok.type])
+        linea.append(tok.lineno)
+        columna.append(tok.column)
+        posicion.append(tok.lexpos)
+        largo.append(len(valor))
+        lexemas.append(valor)
+        if len(lexemas) == TAM_BLOQUE:
+            _volcar_bloque(out, columnas, b"".join(lexemas))
+            n += len(lexemas)
+            tipo, linea, columna, posicion, largo = columnas = [array(c) for _, c in _COLUMNAS]
+            lexemas = []
+    if lexemas:
+        _volcar_bloque(out, columnas, b"".join(lexemas))
+        n += len(lexemas)
+    out.write(struct.pack("<I", 0))
+    return n
+
+
+# ==========================
+# Tokens desde un buffer columnar (buffer_cs)
+# Las mismas salidas leyendo las columnas, sin armar tokens: la
+# tabla y el jsonl formatean fila por fila; el volcado bin copia
+# rebanadas de las columnas por bloque.
+# ==========================
+
+def escribir_buffer(out, buf, formato, tipos):
+    """Tokens de un buffer_cs.BufferTokens en formato (FORMATOS_TOKENS); devuelve cuántos."""
+    columnas = buf.columnas_texto()
+    if formato == "bin":
+        return _escribir_buffer_bin(out, buf, columnas, list(tipos))
+    filas = zip(map(TIPOS.__getitem__, buf.tipos), buf.lexemas(), buf.lineas, columnas, buf.inicios)
+    if formato == "jsonl":
+        return _escribir_jsonl(out, filas)
+    return _escribir_tabla(out, filas)
+
+
+def _escribir_buffer_bin(out, buf, columnas, tipos):
+    indice = _cabecera_bin(out, tipos)
+    # Código del buffer -> índice en la tabla de tipos del volcado
+    traduccion = bytes(indice.get(t, 0) for t in TIPOS).ljust(256, b"\0")
+    codigos = bytes(buf.tipos).translate(traduccion)
+    n = len(buf)
+    for desde in range(0, n, TAM_BLOQUE):
+        hasta = desde + TAM_BLOQUE
+        lexemas = buf.lexemas(desde, hasta)
+        datos = "".join(lexemas).encode("utf-8")
+        inicios = buf.inicios[desde:hasta]
+        if datos.isascii():     # un byte por carácter: el largo es fin - inicio
+            largos = array("I", map(operator.sub, buf.fines[desde:hasta], inicios))
+        else:
+            largos = array("I", [len(x.encode("utf-8")) for x in lexemas])
+        _volcar_bloque(out, [array("B", codigos[desde:hasta]), buf.lineas[desde:hasta],
+                             columnas[desde:hasta], inicios, largos], datos)
+    out.write(struct.pack("<I", 0))
+    return n
+
+
+def _leer(f, n):
+    datos = f.read(n)
+    if len(datos) != n:
+        raise ValueError("volcado binario de tokens truncado")
+    return datos
+
+
+def leer_bloques_bin(f):
+    """
+    Lee un volcado binario (f abierto en 'rb'). Devuelve un dict por
+    bloque con las columnas: tipo (list de str), linea, columna,
+    posicion (arrays) y valor (list de str).
+    """
+    if _leer(f, len(MAGICO)) != MAGICO:
+        raise ValueError("no es un volcado binario de tokens (LPCSTOK1)")
+    (n_tipos,) = struct.unpack("<I", _leer(f, 4))
+    tipos = []
+    for _ in range(n_tipos):
+        (largo,) = struct.unpack("<H", _leer(f, 2))
+        tipos.append(_leer(f, largo).decode("utf-8"))
+
+    while True:
+        (n,) = struct.unpack("<I", _leer(f, 4))
+        if n == 0:
+            return
+        bloque = {}
+        for nombre, codigo in _COLUMNAS:
+            arr = array(codigo)
+            arr.frombytes(_leer(f, n * arr.itemsize))
+            if _INVERTIR:
+                arr.byteswap()
+            bloque[nombre] = arr
+        datos = _leer(f, sum(bloque["largo"]))
+        valores = []
+        inicio = 0
+        for largo in bloque.pop("largo"):
+            valores.append(datos[inicio:inicio + largo].decode("utf-8"))
+            inicio += largo
+        bloque["tipo"] = [tipos[i] for i in bloque["tipo"]]
+        bloque["valor"] = valores
+        yield bloque
+
+
+def leer_tokens_bin(f):
+    """Tuplas (tipo, valor, linea, columna, posicion) de un volcado binario."""
+    for b in leer_bloques_bin(f):
+        yield from zip(b["tipo"], b["valor"], b["linea"], b["columna"], b["posicion"])
+
+
+# ==========================
+# AST
+# ==========================
+
+def escribir_ast(out, ast, formato):
+    if formato == "texto":
+        out.write("--- ANÁLISIS SINTÁCTICO EXITOSO ---\n")
+        if ast:
+            out.write(repr(ast_cs.a_tupla(ast)) + "\n")
+    elif formato == "json":
+        out.write(json.dumps(ast_cs.a_dict(ast), ensure_ascii=False, separators=(",", ":")))
+        out.write("\n")
+    elif formato == "jsonl":
+        # Una sentencia de primer nivel por línea
+        for stmt in (ast.statements if ast else ()):
+            out.write(json.dumps(ast_cs.a_dict(stmt), ensure_ascii=False, separators=(",", ":")))
+            out.write("\n")
+    else:
+        raise ValueError(f"formato de AST desconocido: {formato}")
+
+
+def leer_ast_json(f):
+    """Reconstruye los nodos de una salida json (un Program) o jsonl (lista de sentencias)."""
+    lineas = [l for l in f.read().splitlines() if l.strip()]
+    nodos = [ast_cs.desde_dict(json.loads(l)) for l in lineas]
+    if len(nodos) == 1 and isinstance(nodos[0], ast_cs.Program):
+        return nodos[0]
+    return nodos
+
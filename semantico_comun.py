@@ -1,52 +1,128 @@
 from datetime import datetime
 import os
 
+from ast_cs import NODOS, BinOp, Block, Nodo, OpChain
 import semantico_kiara
 import semantico_juan
 import semantico_daniel
 
 
+_BINOP = BinOp.kind
+_TIPOS_LITERAL = {int: "int", float: "double", bool: "bool", type(None): "null"}
+# kinds que son cadenas de operadores (BinOp = cadena de un operador)
+_ES_CADENA = [cls in (BinOp, OpChain) for cls in sorted(NODOS, key=lambda cls: cls.kind)]
+
+
 class Symbol:
-    def __init__(self, name, sym_type, kind, extra=None):
+    __slots__ = ("name", "type", "kind", "nivel", "extra")
+
+    def __init__(self, name, sym_type, kind, extra=None, nivel=0):
         self.name = name
         self.type = sym_type
-        self.kind = kind          # "var", "array", "func", "method", "class"
-        self.extra = extra or {}  # params, etc.
+        self.kind = kind          # "var", "param", "array", "func", "method", "class"
+        self.nivel = nivel        # profundidad del ámbito donde se declaró (0 = global)
+        self.extra = extra or None  # params, size; None si no hay nada que guardar
 
 
-# Tabla de símbolos (solo scope global para simplificar)
-symbol_table = {}
-semantic_errors = []
+# ==========================
+# Tabla de símbolos con ámbitos
+# Global, clase, función/método y bloque. En vez de una cadena de
+# dicts que se recorre en cada búsqueda, cada nombre tiene su pila
+# de vínculos (el de arriba es el visible) y cada ámbito la lista de
+# nombres que declaró, que se desapilan al cerrarlo. Buscar es un
+# dict.get sin importar cuántos ámbitos haya abiertos.
+# ==========================
 
-# Pila de funciones/métodos en los que estamos (para return)
-# Cada elemento: {"name": str, "ret_type": str, "kind": "func"|"method"}
-function_stack = []
+class TablaSimbolos:
+    """
+    Símbolos visibles en el punto actual del análisis. Lo que no está
+    declarado aquí se busca con `resolver(name)` si se da (por ejemplo
+    los globales de otras partes del archivo en incremental_cs).
+    """
+    __slots__ = ("vinculos", "ambitos", "resolver", "version")
+
+    def __init__(self, resolver=None):
+        self.vinculos = {}      # name -> [Symbol, ...] (el último es el visible)
+        self.ambitos = [[]]     # nombres declarados en cada ámbito abierto
+        self.resolver = resolver
+        self.version = 0        # cambia cada vez que cambia algún vínculo visible
+
+    @property
+    def nivel(self):
+        return len(self.ambitos) - 1
+
+    def abrir(self):
+        self.ambitos.append([])
+
+    def cerrar(self):
+        vinculos = self.vinculos
+        nombres = self.ambitos.pop()
+        if nombres:
+            self.version += 1
+        for name in nombres:
+            pila = vinculos[name]
+            pila.pop()
+            if not pila:
+                del vinculos[name]
+
+    def get(self, name, default=None):
+        pila = self.vinculos.get(name)
+        if pila:
+            return pila[-1]
+        if self.resolver is not None:
+            sym = self.resolver(name)
+            if sym is not None:
+                return sym
+        return default
+
+    def en_ambito_actual(self, name):
+        pila = self.vinculos.get(name)
+        if pila:
+            return pila[-1].nivel == len(self.ambitos) - 1
+        return len(self.ambitos) == 1 and self.resolver is not None and self.resolver(name) is not None
+
+    def declarar(self, sym):
+        self.version += 1
+        sym.nivel = len(self.ambitos) - 1
+        pila = self.vinculos.get(sym.name)
+        if pila is None:
+            self.vinculos[sym.name] = [sym]
+        else:
+            pila.append(sym)
+        self.ambitos[-1].append(sym.name)
 
+    def globales(self):
+        """Dict name -> Symbol de los declarados en el ámbito global."""
+        return {name: pila[0] for name, pila in self.vinculos.items() if pila[0].nivel == 0}
 
-# ==========================
-# Utilidades básicas
-# ==========================
+    def __contains__(self, name):
+        return self.get(name) is not None
 
-def reset_semantic_state():
-    global symbol_table, semantic_errors, function_stack
-    symbol_table = {}
-    semantic_errors = []
-    function_stack = []
+    def __getitem__(self, name):
+        sym = self.get(name)
+        if sym is None:
+            raise KeyError(name)
+        return sym
 
+    def __iter__(self):
+        return iter(self.vinculos)
 
-def add_error(msg):
-    semantic_errors.append(msg)
+    def __len__(self):
+        return len(self.vinculos)
 
 
-def declare_symbol(name, sym_type, kind, extra=None):
-    if name in symbol_table:
-        add_error(f"Identificador redeclarado: '{name}'.")
-    else:
-        symbol_table[name] = Symbol(name, sym_type, kind, extra)
+TYPE_TOKENS = {
+    "KEYWORD_TYPE_INT": "int",
+    "KEYWORD_TYPE_DOUBLE": "double",
+    "KEYWORD_TYPE_BOOL": "bool",
+    "KEYWORD_TYPE_CHAR": "char",
+    "KEYWORD_TYPE_STRING": "string",
+}
 
 
-def lookup_symbol(name):
-    return symbol_table.get(name)
+def map_type_token_to_type(tipo):
+    """Convierte el lexema/token de tipo del parser ('int', 'KEYWORD_TYPE_INT') al tipo semántico."""
+    return TYPE_TOKENS.get(tipo, tipo)
 
 
 def tipos_compatibles(expected, actual):
@@ -58,69 +134,236 @@ def tipos_compatibles(expected, actual):
     return False
 
 
-def write_semantic_log(user_git="usuario"):
-    """Genera el archivo logs/semantico-usuarioGit-fecha-hora.txt."""
-    if not semantic_errors:
-        print("Analizador semántico: sin errores.")
-        return
+# Un subárbol con más errores que esto no se memoriza
+MAX_ERRORES_MEMO = 8
 
-    os.makedirs("logs", exist_ok=True)
-    filename = datetime.now().strftime(f"semantico-%s-%%d%%m%%Y-%%Hh%%M.txt" % user_git)
-    path = os.path.join("logs", filename)
-    with open(path, "w", encoding="utf-8") as f:
-        for e in semantic_errors:
-            f.write(e + "\n")
-    print(f"Log semántico generado en: {path}")
+
+class _TipoMemo:
+    __slots__ = ("version", "tipo", "errores", "tipos_libres")
+
+    def __init__(self, version, tipo, errores, tipos_libres):
+        self.version = version
+        self.tipo = tipo
+        self.errores = errores
+        self.tipos_libres = tipos_libres
 
 
 # ==========================
-# Análisis de EXPRESIONES
+# Contexto del análisis
 # ==========================
 
-def analizar_expresion(node):
+def _apilar_bloque(pila, block_node, ambito=True):
     """
-    Devuelve el tipo de la expresión como string:
-    'int', 'double', 'bool', 'string', 'char', 'null', 'error'
-    AST esperado según tu parser:
-      - ("literal", valor)
-      - ("var", nombre)
-      - ("binop", op, left, right)
+    Apila las sentencias del bloque para que salgan en orden, entre
+    la apertura y el cierre de su ámbito (si `ambito`).
     """
-    if node is None:
-        return "error"
+    if isinstance(block_node, Block):
+        if ambito:
+            pila.append(_CERRAR_AMBITO)
+        pila.extend(reversed(block_node.statements))
+        if ambito:
+            pila.append(_ABRIR_AMBITO)
 
-    tag = node[0]
 
-    if tag == "literal":
-        val = node[1]
-        # Deducción muy simple por tipo de Python / tokens esperados
-        if isinstance(val, int):
-            return "int"
-        if isinstance(val, float):
-            return "double"
-        if val in ("true", "false", True, False):
-            return "bool"
-        if isinstance(val, str) and len(val) == 1:
-            # char con comillas simples en el original, aquí ya vino como string
-            return "char"
-        if val is None or val == "null":
-            return "null"
-        # por defecto, asumimos string
-        return "string"
-
-    if tag == "var":
-        name = node[1]
-        sym = lookup_symbol(name)
+class ContextoSemantico:
+    """
+    Estado de UN análisis semántico: tabla de símbolos, errores y pila de
+    funciones. Cada análisis usa su propio contexto, así que varios
+    análisis pueden correr a la vez (por ejemplo desde hilos distintos).
+    """
+
+    def __init__(self):
+        # Tabla de símbolos con ámbitos (global, clase, función, bloque)
+        self.symbol_table = TablaSimbolos()
+        self.semantic_errors = []
+
+        # Pila de funciones/métodos en los que estamos (para return)
+        # Cada elemento: {"name": str, "ret_type": str, "kind": "func"|"method", "nodo": definición}
+        self.function_stack = []
+
+        # Tipos ya inferidos por forma de subexpresión (ver _tipo_memorizado)
+        self._memo = {}
+        self.memo_consultas = 0
+        self.memo_aciertos = 0
+
+        # Si se da, reportar(msg, nodo) recibe cada error apenas aparece,
+        # con la sentencia que se estaba analizando (ver registro_cs)
+        self.reportar = None
+        self.nodo_actual = None
+
+    # ==========================
+    # Utilidades básicas
+    # ==========================
+
+    def add_error(self, msg):
+        self.semantic_errors.append(msg)
+        if self.reportar is not None:
+            self.reportar(msg, self.nodo_actual)
+
+    def declare_symbol(self, name, sym_type, kind, extra=None):
+        if self.symbol_table.en_ambito_actual(name):
+            self.add_error(f"Identificador redeclarado: '{name}'.")
+        else:
+            self.symbol_table.declarar(Symbol(name, sym_type, kind, extra))
+
+    def lookup_symbol(self, name):
+        return self.symbol_table.get(name)
+
+    def _abrir_ambito(self, _):
+        self.symbol_table.abrir()
+
+    def _cerrar_ambito(self, _):
+        self.symbol_table.cerrar()
+
+    # ==========================
+    # Análisis de EXPRESIONES
+    # Un BinOp o una OpChain se tipan con un bucle de izquierda a
+    # derecha sobre sus operandos. Los operandos que son otra cadena
+    # (paréntesis a la derecha) no se analizan recursivamente: se
+    # guarda en `pila` dónde iba la cadena de afuera (cadena, índice,
+    # tipo acumulado, errores antes) y se sigue con la de adentro. La
+    # profundidad de la expresión no consume pila de Python. Cada kind
+    # de nodo tiene su función en _EXPRESIONES (la de binop/op_chain
+    # hace el recorrido).
+    # ==========================
+
+    def analizar_expresion(self, node):
+        """
+        Devuelve el tipo de la expresión como string:
+        'int', 'double', 'bool', 'string', 'char', 'null', 'error'
+        AST esperado según tu parser (ast_cs):
+          - Literal(valor)
+          - Var(nombre)
+          - BinOp(op, left, right)
+          - OpChain(ops, operands)
+        """
+        if node is None:
+            return "error"
+        return self._EXPRESIONES[node.kind](self, node)
+
+    def _e_binop(self, node):
+        left, right = node.left, node.right
+        if left is not None and right is not None and not _ES_CADENA[left.kind] and not _ES_CADENA[right.kind]:
+            # binop de dos hojas (el caso más común): sin pilas y sin memo,
+            # recalcularlo cuesta lo mismo que validar el memo
+            tabla = self._EXPRESIONES
+            t_left = tabla[left.kind](self, left)
+            return self._tipo_binop(node.op, t_left, tabla[right.kind](self, right))
+        return self._e_op_chain(node)
+
+    def _e_op_chain(self, node):
+        tipo = self._tipo_memorizado(node.forma)
+        if tipo is not None:
+            return tipo
+        tabla = self._EXPRESIONES
+        tipo_binop = self._tipo_binop
+        errores = self.semantic_errors
+        pila = []
+        cadena, ops, operands = node, node.ops, node.operands
+        i, acumulado, inicio = 0, None, len(errores)
+        while True:
+            while i < len(operands):
+                n = operands[i]
+                if n is None:
+                    t = "error"
+                elif _ES_CADENA[n.kind]:
+                    if n.kind == _BINOP:
+                        left, right = n.left, n.right
+                        if left is not None and right is not None and not _ES_CADENA[left.kind] \
+                                and not _ES_CADENA[right.kind]:
+                            # BinOp de dos hojas: igual que en _e_binop, sin memo
+                            t = tipo_binop(n.op, tabla[left.kind](self, left), tabla[right.kind](self, right))
+                            acumulado = t if i == 0 else tipo_binop(ops[i - 1], acumulado, t)
+                            i += 1
+                            continue
+                    t = self._tipo_memorizado(n.forma)
+                    if t is None:
+                        # Se sigue con la cadena de adentro y después se vuelve aquí
+                        pila.append((cadena, i, acumulado, inicio))
+                        cadena, ops, operands = n, n.ops, n.operands
+                        i, acumulado, inicio = 0, None, len(errores)
+                        continue
+                else:
+                    t = tabla[n.kind](self, n)
+                acumulado = t if i == 0 else tipo_binop(ops[i - 1], acumulado, t)
+                i += 1
+            self._memorizar(cadena.forma, acumulado, inicio)
+            if not pila:
+                return acumulado
+            t = acumulado
+            cadena, i, acumulado, inicio = pila.pop()
+            ops, operands = cadena.ops, cadena.operands
+            acumulado = t if i == 0 else tipo_binop(ops[i - 1], acumulado, t)
+            i += 1
+
+    # ---------- memo de tipos por forma ----------
+    # Una subexpresión ya tipada con la misma forma (ast_cs.Forma) da
+    # el mismo tipo y los mismos errores si sus variables libres
+    # siguen teniendo los mismos tipos (o siguen sin declarar): así
+    # `(a + b) * c` sirve para todos los métodos con parámetros int.
+    # Si la tabla no cambió desde entonces (misma versión) ni siquiera
+    # hace falta mirarlas.
+
+    def _tipo_memorizado(self, forma):
+        self.memo_consultas += 1
+        memo = self._memo.get(forma)
+        if memo is None:
+            return None
+        tabla = self.symbol_table
+        if memo.version != tabla.version:
+            get = tabla.get
+            for name, tipo in zip(forma.libres, memo.tipos_libres):
+                sym = get(name)
+                if (sym.type if sym is not None else None) != tipo:
+                    return None
+            memo.version = tabla.version
+        if memo.errores:
+            # Los errores se repiten en cada aparición, como sin memo
+            if self.reportar is None:
+                self.semantic_errors.extend(memo.errores)
+            else:
+                for msg in memo.errores:
+                    self.add_error(msg)
+        self.memo_aciertos += 1
+        return memo.tipo
+
+    def _memorizar(self, forma, tipo, inicio_errores):
+        if forma.libres is None:
+            return
+        errores = self.semantic_errors
+        if len(errores) - inicio_errores > MAX_ERRORES_MEMO:
+            return
+        tipos_libres = []
+        for name in forma.libres:
+            sym = self.symbol_table.get(name)
+            tipos_libres.append(sym.type if sym is not None else None)
+        self._memo[forma] = _TipoMemo(
+            self.symbol_table.version, tipo,
+            tuple(errores[inicio_errores:]), tuple(tipos_libres),
+        )
+
+    def _e_desconocida(self, node):
+        # Si viene algo que no conocemos
+        self.add_error(f"Expresión desconocida: {node}")
+        return "error"
+    def _e_literal(self, node):
+        # El lexer/parser ya dejaron el valor tipado (ver ast_cs.Literal)
+        val = node.valor
+        tipo = _TIPOS_LITERAL.get(type(val))
+        if tipo is None:
+            # string o char: el valor es el lexema con sus comillas
+            tipo = "char" if val[:1] == "'" else "string"
+        return tipo
+
+    def _e_var(self, node):
+        name = node.nombre
+        sym = self.lookup_symbol(name)
         if sym is None:
-            add_error(f"Uso de variable no declarada: '{name}'.")
+            self.add_error(f"Uso de variable no declarada: '{name}'.")
             return "error"
         return sym.type
 
-    if tag == "binop":
-        op, left, right = node[1], node[2], node[3]
-        t_left = analizar_expresion(left)
-        t_right = analizar_expresion(right)
-
+    def _tipo_binop(self, op, t_left, t_right):
         # Operadores relacionales y de igualdad
         if op in ("==", "!=", "<", ">", "<=", ">="):
             # podrías chequear que sean comparables; aquí asumimos que sí
@@ -130,7 +373,7 @@ def analizar_expresion(node):
         if op in ("&&", "||"):
             # regla de Juan/Daniel/ Kiara podría exigir bool en ambos
             if t_left != "bool" or t_right != "bool":
-                add_error(
+                self.add_error(
                     f"Operador lógico '{op}' con operandos no booleanos "
                     f"('{t_left}', '{t_right}')."
                 )
@@ -144,195 +387,316 @@ def analizar_expresion(node):
             return "int"
 
         # Si llega aquí, tipo desconocido
-        add_error(f"Operación '{op}' con tipos incompatibles: '{t_left}', '{t_right}'.")
+        self.add_error(f"Operación '{op}' con tipos incompatibles: '{t_left}', '{t_right}'.")
         return "error"
 
-    # Si viene algo que no conocemos
-    add_error(f"Expresión desconocida: {node}")
-    return "error"
-
-
-# ==========================
-# Análisis de STATEMENTS
-# ==========================
-
-def analizar_statement(node):
-    """
-    Usa el tag del AST (primer elemento de la tupla)
-    para decidir qué hacer.
-    """
-    if not isinstance(node, tuple):
-        return
 
-    tag = node[0]
+    # ==========================
+    # Análisis de STATEMENTS
+    # Cada tipo de nodo (ast_cs.kind) tiene su función en
+    # _SENTENCIAS. Las sentencias anidadas no se analizan por
+    # recursión: se apilan en `pila` (en orden inverso, así salen en
+    # orden) junto con tuplas (función, dato) que se ejecutan al
+    # terminar un bloque, por ejemplo para cerrar una función.
+    # ==========================
+
+    def analizar_statement(self, node):
+        """
+        Usa el kind del nodo (el código de la antigua etiqueta de
+        tupla) para decidir qué hacer.
+        """
+        self._ejecutar([node])
+
+    def analizar_block(self, block_node):
+        """block_node = Block([stmts])"""
+        if isinstance(block_node, Nodo) and block_node.tag == "block":
+            self._ejecutar([block_node])
+
+    def _ejecutar(self, pila):
+        tabla = self._SENTENCIAS
+        while pila:
+            n = pila.pop()
+            if isinstance(n, Nodo):
+                self.nodo_actual = n
+                visitar = tabla[n.kind]
+                # Nodo no contemplado → solo lo ignoramos
+                if visitar is not None:
+                    visitar(self, n, pila)
+            elif type(n) is tuple:
+                n[0](self, n[1])
 
     # Declaración simple: ("declaration", type, ident)
-    if tag == "declaration":
-        _, tipo, nombre = node
-        declare_symbol(nombre, map_type_token_to_type(tipo), "var")
+    def _s_declaration(self, node, pila):
+        self.declare_symbol(node.nombre, map_type_token_to_type(node.tipo), "var")
 
     # Declaración con inicialización: ("declaration_init", type, ident, expr)
-    elif tag == "declaration_init":
-        _, tipo, nombre, expr = node
-        declare_symbol(nombre, map_type_token_to_type(tipo), "var")
-        expr_type = analizar_expresion(expr)
+    def _s_declaration_init(self, node, pila):
+        tipo, nombre, expr = node.tipo, node.nombre, node.expr
+        self.declare_symbol(nombre, map_type_token_to_type(tipo), "var")
+        expr_type = self.analizar_expresion(expr)
         if not tipos_compatibles(map_type_token_to_type(tipo), expr_type):
-            add_error(
+            self.add_error(
                 f"No se puede asignar valor de tipo '{expr_type}' "
                 f"a variable '{nombre}' de tipo '{tipo}'."
             )
 
     # Asignación: ("assign", ident, expr)
-    elif tag == "assign":
-        _, nombre, expr = node
-        sym = lookup_symbol(nombre)
+    def _s_assign(self, node, pila):
+        nombre, expr = node.nombre, node.expr
+        sym = self.lookup_symbol(nombre)
         if sym is None:
-            add_error(f"Asignación a variable no declarada: '{nombre}'.")
+            self.add_error(f"Asignación a variable no declarada: '{nombre}'.")
         else:
-            expr_type = analizar_expresion(expr)
+            expr_type = self.analizar_expresion(expr)
             if not tipos_compatibles(sym.type, expr_type):
-                add_error(
+                self.add_error(
                     f"No se puede asignar valor de tipo '{expr_type}' "
                     f"a variable '{nombre}' de tipo '{sym.type}'."
                 )
 
     # Array: ("array_decl", type, ident, size_literal)
-    elif tag == "array_decl":
-        _, tipo, nombre, size = node
-        declare_symbol(nombre, map_type_token_to_type(tipo), "array", extra={"size": size})
+    def _s_array_decl(self, node, pila):
+        self.declare_symbol(node.nombre, map_type_token_to_type(node.tipo), "array", extra={"size": node.size})
 
     # IF: ("if", cond, block) o IF-ELSE: ("if_else", cond, then_block, else_block)
-    elif tag == "if":
-        _, cond, block = node
-        cond_type = analizar_expresion(cond)
-        msg = semantico_daniel.regla_if(cond_type)
+    def _s_if(self, node, pila):
+        msg = semantico_daniel.regla_if(self.analizar_expresion(node.cond))
         if msg:
-            add_error(msg)
-        analizar_block(block)
+            self.add_error(msg)
+        _apilar_bloque(pila, node.block)
 
-    elif tag == "if_else":
-        _, cond, then_block, else_block = node
-        cond_type = analizar_expresion(cond)
-        msg = semantico_daniel.regla_if(cond_type)
+    def _s_if_else(self, node, pila):
+        msg = semantico_daniel.regla_if(self.analizar_expresion(node.cond))
         if msg:
-            add_error(msg)
-        analizar_block(then_block)
-        analizar_block(else_block)
-
-    # WHILE: asumimos AST ("while", cond, block) cuando tengas la regla en el parser
-    elif tag == "while":
-        _, cond, block = node
-        cond_type = analizar_expresion(cond)
-        msg = semantico_kiara.regla_while(cond_type)
+            self.add_error(msg)
+        _apilar_bloque(pila, node.else_block)
+        _apilar_bloque(pila, node.then_block)
+
+    # WHILE: ("while", cond, block)
+    def _s_while(self, node, pila):
+        msg = semantico_kiara.regla_while(self.analizar_expresion(node.cond))
         if msg:
-            add_error(msg)
-        analizar_block(block)
+            self.add_error(msg)
+        _apilar_bloque(pila, node.block)
 
     # FOR: ("for", init_assign, cond_expr, update_assign, block)
-    elif tag == "for":
-        _, init, cond, update, block = node
-        if init:
-            analizar_statement(init)
-        cond_type = analizar_expresion(cond) if cond else "bool"  # for(;;) → ok
+    # Orden: init, condición, update y bloque
+    def _s_for(self, node, pila):
+        _apilar_bloque(pila, node.block)
+        if node.update:
+            pila.append(node.update)
+        pila.append((ContextoSemantico._condicion_for, node.cond))
+        if node.init:
+            pila.append(node.init)
+
+    def _condicion_for(self, cond):
+        cond_type = self.analizar_expresion(cond) if cond else "bool"  # for(;;) → ok
         msg = semantico_juan.regla_for(cond_type)
         if msg:
-            add_error(msg)
-        if update:
-            analizar_statement(update)
-        analizar_block(block)
-
-    # Funciones con retorno: ("function_def", type, name, params, block)
-    elif tag == "function_def":
-        _, tipo, nombre, params, block = node
-        ret_type = map_type_token_to_type(tipo)
-        declare_symbol(nombre, ret_type, "func", extra={"params": params})
-        function_stack.append({"name": nombre, "ret_type": ret_type, "kind": "func", "has_return": False})
-        # parámetros no se declaran a fondo para simplificar
-        analizar_block(block)
-        info = function_stack.pop()
-        # Regla de Daniel: funciones no void deben retornar algo
+            self.add_error(msg)
+
+    # Definiciones:
+    #   Funciones con retorno: ("function_def", type, name, params, block)
+    #   Métodos: ("method", type, name, params, block)
+    #   Procedimientos (Kiara): ("procedure_def", name, params, block)
+    #   CLASES: ("class", name, members)
+    # Primero se declara el nombre y después se analiza el cuerpo;
+    # paralelo_cs hace las dos cosas por separado (y en otro proceso).
+    def _s_function_def(self, node, pila):
+        self.declarar_definicion(node)
+        self._abrir_cuerpo(node, pila)
+
+    _s_method = _s_procedure_def = _s_class = _s_function_def
+
+    def declarar_definicion(self, node):
+        tag = node.tag
+        if tag == "class":
+            self.declare_symbol(node.nombre, node.nombre, "class")
+        elif tag == "procedure_def":
+            self.declare_symbol(node.nombre, "void", "func", extra={"params": node.params})
+        else:
+            kind = "method" if tag == "method" else "func"
+            ret_type = map_type_token_to_type(node.tipo)
+            self.declare_symbol(node.nombre, ret_type, kind, extra={"params": node.params})
+
+    def analizar_cuerpo(self, node):
+        """Cuerpo de una definición cuyo nombre ya está declarado."""
+        pila = []
+        self._abrir_cuerpo(node, pila)
+        self._ejecutar(pila)
+
+    def _abrir_cuerpo(self, node, pila):
+        tag = node.tag
+        if tag == "class":
+            # Los miembros viven en el ámbito de la clase
+            self.symbol_table.abrir()
+            pila.append(_CERRAR_AMBITO)
+            pila.extend(reversed(node.members))
+            return
+        if tag == "procedure_def":
+            ret_type, kind, cierre = "void", "func", ContextoSemantico._cerrar_procedimiento
+        else:
+            ret_type = map_type_token_to_type(node.tipo)
+            kind = "method" if tag == "method" else "func"
+            cierre = ContextoSemantico._cerrar_funcion
+        self.function_stack.append(
+            {"name": node.nombre, "ret_type": ret_type, "kind": kind, "has_return": False, "nodo": node}
+        )
+        self._abrir_parametros(node.params)
+        pila.append((cierre, None))
+        _apilar_bloque(pila, node.block, ambito=False)
+
+    def _abrir_parametros(self, params):
+        # Parámetros y cuerpo comparten el ámbito de la función
+        self.symbol_table.abrir()
+        for tipo, nombre in params:
+            self.declare_symbol(nombre, map_type_token_to_type(tipo), "param")
+
+    def _cerrar_funcion(self, _):
+        self.symbol_table.cerrar()
+        info = self.function_stack.pop()
+        # Regla de Daniel: funciones/métodos no void deben retornar algo
         msg = semantico_daniel.regla_funcion_retorno_obligatorio(info["ret_type"], info["has_return"], info["name"])
         if msg:
-            add_error(msg)
-
-    # Métodos: ("method", type, name, params, block)
-    elif tag == "method":
-        _, tipo, nombre, params, block = node
-        ret_type = map_type_token_to_type(tipo)
-        declare_symbol(nombre, ret_type, "method", extra={"params": params})
-        function_stack.append({"name": nombre, "ret_type": ret_type, "kind": "method", "has_return": False})
-        analizar_block(block)
-        info = function_stack.pop()
-        # Regla de Juan (retorno correcto) + Daniel (retorno obligatorio si no es void)
-        msg_oblig = semantico_daniel.regla_funcion_retorno_obligatorio(info["ret_type"], info["has_return"], info["name"])
-        if msg_oblig:
-            add_error(msg_oblig)
+            self.nodo_actual = info["nodo"]
+            self.add_error(msg)
+
+    def _cerrar_procedimiento(self, _):
+        self.symbol_table.cerrar()
+        self.function_stack.pop()
 
     # RETURN: ("return", expr)
-    elif tag == "return":
-        _, expr = node
-        if not function_stack:
-            add_error("Sentencia 'return' fuera de función o método.")
-        else:
-            ctx = function_stack[-1]
-            ctx["has_return"] = True
-            expr_type = analizar_expresion(expr)
-            # Kiara: métodos void no retornan valor
-            msg_void = semantico_kiara.regla_return_void(ctx["ret_type"], expr_type)
-            if msg_void:
-                add_error(msg_void)
-            # Daniel + Juan: retorno compatible con tipo del método/función
-            msg_ret = semantico_daniel.regla_return_tipo(ctx["ret_type"], expr_type, ctx["name"])
-            if msg_ret:
-                add_error(msg_ret)
-
-    # CLASES: ("class", name, members)
-    elif tag == "class":
-        _, nombre, members = node
-        declare_symbol(nombre, nombre, "class")
-        for m in members:
-            analizar_statement(m)
+    def _s_return(self, node, pila):
+        if not self.function_stack:
+            self.add_error("Sentencia 'return' fuera de función o método.")
+            return
+        ctx = self.function_stack[-1]
+        ctx["has_return"] = True
+        expr_type = self.analizar_expresion(node.expr)
+        # Kiara: métodos void no retornan valor
+        msg_void = semantico_kiara.regla_return_void(ctx["ret_type"], expr_type)
+        if msg_void:
+            self.add_error(msg_void)
+        # Daniel + Juan: retorno compatible con tipo del método/función
+        msg_ret = semantico_daniel.regla_return_tipo(ctx["ret_type"], expr_type, ctx["name"])
+        if msg_ret:
+            self.add_error(msg_ret)
 
     # Bloque: ("block", [statements])
-    elif tag == "block":
-        analizar_block(node)
+    def _s_block(self, node, pila):
+        _apilar_bloque(pila, node)
 
     # Expresión sola: ("expr_stmt", expr)
-    elif tag == "expr_stmt":
-        analizar_expresion(node[1])
+    def _s_expr_stmt(self, node, pila):
+        self.analizar_expresion(node.expr)
+
+    # ==========================
+    # Programa completo
+    # ==========================
+
+    def analizar_programa(self, ast):
+        """Analiza el AST completo y devuelve la lista de errores."""
+        if not isinstance(ast, Nodo) or ast.tag != "program":
+            self.add_error("AST inválido: no inicia con 'program'.")
+        else:
+            self._ejecutar(list(reversed(ast.statements)))
+        return self.semantic_errors
+
+
+def _tabla_despacho(prefijo, defecto=None):
+    """Lista indexada por ast_cs kind con el método `prefijo + tag` (o `defecto`)."""
+    tabla = [defecto] * len(NODOS)
+    for cls in NODOS:
+        tabla[cls.kind] = getattr(ContextoSemantico, prefijo + cls.tag, defecto)
+    return tabla
+
 
-    else:
-        # Nodo no contemplado → solo lo ignoramos
-        pass
+ContextoSemantico._EXPRESIONES = _tabla_despacho("_e_", ContextoSemantico._e_desconocida)
+ContextoSemantico._SENTENCIAS = _tabla_despacho("_s_")
+_ABRIR_AMBITO = (ContextoSemantico._abrir_ambito, None)
+_CERRAR_AMBITO = (ContextoSemantico._cerrar_ambito, None)
+
+
+# ==========================
+# API de módulo (compatibilidad)
+# Usa un contexto global que se reemplaza en cada analizar_programa;
+# para análisis concurrentes crear un ContextoSemantico por análisis.
+# ==========================
+
+_contexto = ContextoSemantico()
+symbol_table = _contexto.symbol_table
+semantic_errors = _contexto.semantic_errors
+function_stack = _contexto.function_stack
+
+
+def reset_semantic_state():
+    global _contexto, symbol_table, semantic_errors, function_stack
+    _contexto = ContextoSemantico()
+    symbol_table = _contexto.symbol_table
+    semantic_errors = _contexto.semantic_errors
+    function_stack = _contexto.function_stack
+
+
+def add_error(msg):
+    _contexto.add_error(msg)
+
+
+def declare_symbol(name, sym_type, kind, extra=None):
+    _contexto.declare_symbol(name, sym_type, kind, extra)
+
+
+def lookup_symbol(name):
+    return _contexto.lookup_symbol(name)
+
+
+def analizar_expresion(node):
+    return _contexto.analizar_expresion(node)
+
+
+def analizar_statement(node):
+    _contexto.analizar_statement(node)
 
 
 def analizar_block(block_node):
-    """block_node = ('block', [stmts])"""
-    if not isinstance(block_node, tuple):
-        return
-    tag = block_node[0]
-    if tag != "block":
+    _contexto.analizar_block(block_node)
+
+
+def write_semantic_log(user_git="usuario", errores=None):
+    """Genera el archivo logs/semantico-usuarioGit-fecha-hora.txt."""
+    if errores is None:
+        errores = semantic_errors
+    if not errores:
+        print("Analizador semántico: sin errores.")
         return
-    for stmt in block_node[1]:
-        analizar_statement(stmt)
+
+    os.makedirs("logs", exist_ok=True)
+    base = datetime.now().strftime(f"semantico-%s-%%d%%m%%Y-%%Hh%%M" % user_git)
+    # Dos corridas en el mismo minuto no se pisan: la segunda agrega -2, -3, ...
+    n = 1
+    while True:
+        path = os.path.join("logs", f"{base}.txt" if n == 1 else f"{base}-{n}.txt")
+        try:
+            f = open(path, "x", encoding="utf-8")
+            break
+        except FileExistsError:
+            n += 1
+    with f:
+        f.write("".join(e + "\n" for e in errores))
+    print(f"Log semántico generado en: {path}")
 
 
 # ==========================
 # FUNCIÓN PRINCIPAL DEL SEMÁNTICO
 # ==========================
 
-def analizar_programa(ast, user_git="usuarioGit"):
+def analizar_programa(ast, user_git="usuarioGit", escribir_log=True):
     """
     ast: lo que devuelve parser_cs.py (programa).
+    escribir_log: si es False no se genera el archivo en logs/ (modo batch).
     """
     reset_semantic_state()
+    _contexto.analizar_programa(ast)
 
-    if not ast or ast[0] != "program":
-        add_error("AST inválido: no inicia con 'program'.")
-    else:
-        _, stmt_list = ast
-        for stmt in stmt_list:
-            analizar_statement(stmt)
-
-    write_semantic_log(user_git)
+    if escribir_log:
+        write_semantic_log(user_git)
     return semantic_errors
@@ -0,0 +1,208 @@
+###############################################################
+# SERVIDOR DE ANÁLISIS PERSISTENTE (socket Unix)
+# Mantiene en memoria el lexer, las tablas LALR y el semántico, y
+# atiende peticiones lex/parse/check por un socket de dominio Unix.
+# Cada conexión se atiende en su propio hilo con una sesión del
+# PoolSesiones, así que varios clientes pueden pedir a la vez.
+#
+# Protocolo: una petición JSON por línea y una respuesta JSON por línea.
+#   {"op": "lex"|"parse"|"check", "archivo": "/ruta/abs.cs", "formato": ...}
+#   {"op": "lex"|..., "codigo": "texto C#", ...}
+#   {"op": "ping"} / {"op": "apagar"}
+# Respuesta:
+#   {"ok": true, "salida": "...", "errores": [...], "ms": 1.23}
+#   {"ok": false, "error": "mensaje", "ms": 0.05}
+# "salida" es exactamente lo que escribirían lexer_cs.py / parser_cs.py.
+#
+# Uso:
+#   python servidor_cs.py [--socket RUTA] [--hilos N]
+# El cliente es cliente_cs.py.
+###############################################################
+
+import io
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+import lexer_cs
+import salida_cs
+from sesion_cs import PoolSesiones
+
+OPERACIONES = ("lex", "parse", "check")
+FORMATO_POR_DEFECTO = {"lex": "tabla", "parse": "texto", "check": "texto"}
+
+
+def socket_por_defecto():
+    """LP_CS_SOCKET o un socket por usuario en el directorio temporal."""
+    return os.environ.get(
+        "LP_CS_SOCKET",
+        os.path.join(tempfile.gettempdir(), f"lp_cs-{os.getuid()}.sock"),
+    )
+
+
+# ==========================
+# Ejecución de una petición (la usan el servidor y el cliente sin servidor)
+# ==========================
+
+def _leer_codigo(peticion):
+    if "codigo" in peticion:
+        return peticion["codigo"]
+    with open(peticion["archivo"], 'r') as f:
+        return f.read()
+
+
+def ejecutar(sesion, peticion):
+    """
+    Atiende una petición con la sesión dada. Devuelve el dict de
+    respuesta sin "ms"; los errores se informan con ok=False.
+    """
+    op = peticion.get("op")
+    if op not in OPERACIONES:
+        return {"ok": False, "error": f"operación desconocida: {op!r}"}
+    formato = peticion.get("formato") or FORMATO_POR_DEFECTO[op]
+    try:
+        data = _leer_codigo(peticion)
+    except FileNotFoundError:
+        return {"ok": False, "error": f"Archivo '{peticion.get('archivo')}' no encontrado."}
+    except (KeyError, OSError) as e:
+        return {"ok": False, "error": f"no se pudo leer el código: {e}"}
+
+    out = io.StringIO()
+    if op == "lex":
+        if formato not in ("tabla", "jsonl"):
+            return {"ok": False, "error": f"formato de tokens no soportado por el servidor: {formato}"}
+        sesion._reiniciar()
+        toks = lexer_cs.iter_tokens(sesion.lexer, data)
+        if formato == "jsonl":
+            salida_cs.escribir_tokens_jsonl(out, toks)
+        else:
+            salida_cs.escribir_tokens_tabla(out, toks)
+        errores = list(sesion.lexer.errores)
+    elif op == "parse":
+        if formato not in salida_cs.FORMATOS_AST:
+            return {"ok": False, "error": f"formato de AST desconocido: {formato}"}
+        ast = sesion.parse(data)
+        salida_cs.escribir_ast(out, ast, formato)
+        errores = list(sesion.lexer.errores) + list(sesion.errores_sintacticos)
+    else:
+        analisis = sesion.analizar(data)
+        errores = analisis["errores_lexicos"] + analisis["errores_sintacticos"]
+        errores.extend(f"ERROR SEMÁNTICO: {e}" for e in analisis["errores_semanticos"])
+        for clave in ("errores_lexicos", "errores_sintacticos", "errores_semanticos"):
+            out.write(f"{clave}: {len(analisis[clave])}\n")
+    return {"ok": True, "salida": out.getvalue(), "errores": errores}
+
+
+# ==========================
+# Servidor
+# ==========================
+
+class _Manejador(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        servidor = self.server
+        for linea in self.rfile:
+            if not linea.strip():
+                continue
+            inicio = time.perf_counter()
+            try:
+                peticion = json.loads(linea)
+            except ValueError as e:
+                respuesta = {"ok": False, "error": f"petición JSON inválida: {e}"}
+                peticion = {}
+            else:
+                respuesta = servidor.atender(peticion)
+            ms = (time.perf_counter() - inicio) * 1000
+            respuesta["ms"] = round(ms, 3)
+            self.wfile.write(json.dumps(respuesta, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if servidor.verbose:
+                sys.stderr.write(f"{peticion.get('op', '?'):<6} {peticion.get('archivo', '<codigo>')} {ms:9.3f} ms\n")
+            if peticion.get("op") == "apagar":
+                # shutdown() espera a serve_forever: se llama desde otro hilo
+                threading.Thread(target=servidor.shutdown, daemon=True).start()
+                return
+
+
+class ServidorAnalisis(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Servidor con un hilo por conexión y un pool de sesiones compartido."""
+
+    daemon_threads = True
+
+    def __init__(self, path, hilos=4, verbose=False):
+        self.pool = PoolSesiones(hilos)
+        self.verbose = verbose
+        _limpiar_socket_viejo(path)
+        super().__init__(path, _Manejador)
+
+    def atender(self, peticion):
+        op = peticion.get("op")
+        if op in ("ping", "apagar"):
+            return {"ok": True, "pid": os.getpid()}
+        try:
+            with self.pool.sesion() as sesion:
+                return ejecutar(sesion, peticion)
+        except Exception as e:
+            return {"ok": False, "error": f"Error durante el análisis: {e}"}
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def _limpiar_socket_viejo(path):
+    """Borra un socket que quedó de un servidor muerto; falla si hay uno vivo."""
+    import socket
+
+    if not os.path.exists(path):
+        return
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        s.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise OSError(f"ya hay un servidor escuchando en {path}")
+    finally:
+        s.close()
+
+
+def calentar(pool):
+    """Construye lexer, parser y semántico antes de aceptar conexiones."""
+    with pool.sesion() as sesion:
+        sesion.analizar("int x = 1;\n")
+
+
+def main(argv=None):
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Servidor de análisis C# por socket Unix.")
+    ap.add_argument("--socket", default=socket_por_defecto(), help="ruta del socket (LP_CS_SOCKET)")
+    ap.add_argument("--hilos", type=int, default=4, help="sesiones de análisis simultáneas")
+    ap.add_argument("-q", "--silencioso", action="store_true", help="no registrar cada petición en stderr")
+    args = ap.parse_args(argv)
+
+    try:
+        servidor = ServidorAnalisis(args.socket, args.hilos, verbose=not args.silencioso)
+    except OSError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+    with servidor:
+        calentar(servidor.pool)
+        sys.stderr.write(f"Escuchando en {args.socket} (pid {os.getpid()})\n")
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
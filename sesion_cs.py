@@ -0,0 +1,228 @@
+###############################################################
+# SESIONES DE ANÁLISIS REENTRANTES
+# Una SesionAnalisis tiene su propio lexer (clon), su propia copia
+# del parser LALR (las tablas se comparten, son de solo lectura) y
+# un ContextoSemantico nuevo por análisis. Así varios hilos pueden
+# analizar fuentes a la vez sin mezclar lineno, errores ni tablas
+# de símbolos, y sin reconstruir las tablas PLY.
+#
+# PoolSesiones reutiliza sesiones entre análisis:
+#   pool = PoolSesiones(8)
+#   resultado = pool.analizar(codigo)
+#
+# Con una cache_cs.CacheAnalisis, parse busca primero el AST del
+# fuente en la caché y solo parsea (y guarda) si no está.
+#
+# Con buffer=True el fuente se tokeniza entero a columnas antes de
+# parsear y el parser toma los tokens de ahí (buffer_cs); con caché,
+# las columnas que se guardan son las del mismo buffer.
+#
+# Con una Cancelacion, parse y analizar se cortan con
+# AnalisisCancelado si otro hilo la cancela o se pasa su límite de
+# tiempo: se consulta en cada token y en cada sentencia del semántico
+# (ver asincrono_cs).
+###############################################################
+
+import copy
+import math
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import lexer_cs
+import parser_cs
+
+
+class AnalisisCancelado(Exception):
+    pass
+
+
+class Cancelacion:
+    """
+    Corte cooperativo de un análisis. cancelar() se puede llamar desde
+    cualquier hilo; timeout (segundos desde que se crea) corta solo.
+    """
+    __slots__ = ("cancelado", "limite")
+
+    def __init__(self, timeout=None):
+        self.cancelado = False
+        self.limite = time.monotonic() + timeout if timeout else math.inf
+
+    def cancelar(self):
+        self.cancelado = True
+
+    def verificar(self):
+        if self.cancelado or time.monotonic() > self.limite:
+            raise AnalisisCancelado("cancelado" if self.cancelado else "tiempo agotado")
+
+
+def _token_vigilado(siguiente, cancelacion):
+    verificar = cancelacion.verificar
+
+    def token():
+        verificar()
+        return siguiente()
+    return token
+
+
+def _sentencias_vigiladas(tabla, cancelacion):
+    """Tabla de despacho del semántico que verifica la cancelación antes de cada sentencia."""
+    verificar = cancelacion.verificar
+
+    def vigilar(visitar):
+        def visita(ctx, nodo, pila):
+            verificar()
+            visitar(ctx, nodo, pila)
+        return visita
+    return [None if v is None else vigilar(v) for v in tabla]
+
+
+class SesionAnalisis:
+    """Lexer + parser + semántico propios. Una sesión la usa un hilo a la vez."""
+
+    def __init__(self, cache=None, buffer=False):
+        if buffer:
+            import buffer_cs
+            self.lexer = buffer_cs.nuevo_lexer()
+        else:
+            self.lexer = lexer_cs.get_lexer().clone()
+        self.lexer.errores = []
+        self.parser = copy.copy(parser_cs.get_parser())
+        self.parser.errorfunc = self._p_error
+        self.errores_sintacticos = []
+        self.cache = cache
+        self.buffer = buffer
+        self.desde_cache = None     # True/False según el último parse (None sin caché)
+
+    def _p_error(self, p):
+        self.errores_sintacticos.append(parser_cs.mensaje_error_sintactico(p))
+
+    def _reiniciar(self):
+        self.lexer.lineno = 1
+        self.lexer.errores = []
+        self.errores_sintacticos = []
+
+    def parse(self, data, cancelacion=None):
+        """
+        Devuelve el AST de data; los errores quedan en la sesión.
+        Con cancelacion lanza AnalisisCancelado si se cancela.
+        """
+        self._reiniciar()
+        if self.cache is None and cancelacion is None and not self.buffer:
+            return self.parser.parse(data, lexer=self.lexer)
+        if cancelacion is not None:
+            cancelacion.verificar()
+        if self.cache is None:
+            return self._parse_tokens(data, cancelacion)[0]
+        return self._parse_con_cache(data, cancelacion)
+
+    def _parse_tokens(self, data, cancelacion, columnas=False):
+        """
+        (AST, columnas de los tokens para la caché o None). Los tokens
+        salen del lexer o, con buffer, de un buffer_cs.BufferTokens.
+        """
+        if self.buffer:
+            import buffer_cs
+            buf = buffer_cs.tokenizar(data, self.lexer)
+            lexer, tokenfunc, data = buf, buf.tokenfunc(), None
+            columnas = buf.columnas_cache if columnas else None
+        else:
+            lexer, tokenfunc = self.lexer, self.lexer.token
+            if columnas:
+                import cache_cs
+                # Los tokens se anotan en columnas mientras el parser los pide
+                tokenfunc, columnas = cache_cs.registrar_tokens(tokenfunc)
+            else:
+                columnas = None
+        if cancelacion is not None:
+            tokenfunc = _token_vigilado(tokenfunc, cancelacion)
+        ast = self.parser.parse(data, lexer=lexer, tokenfunc=tokenfunc)
+        return ast, columnas() if columnas else None
+
+    def _parse_con_cache(self, data, cancelacion):
+        cache = self.cache
+        clave = cache.clave(data)
+        entrada = cache.buscar(data, clave)
+        self.desde_cache = entrada is not None
+        if entrada is not None:
+            self.lexer.errores.extend(entrada.errores_lexicos)
+            self.errores_sintacticos.extend(entrada.errores_sintacticos)
+            return entrada.ast()
+
+        ast, columnas = self._parse_tokens(data, cancelacion, cache.tokens)
+        cache.guardar(data, ast, self.lexer.errores, self.errores_sintacticos, columnas, clave)
+        return ast
+
+    def analizar(self, data, semantico=True, procesos=1, reportar=None, cancelacion=None):
+        """
+        Lexer + parser (+ semántico). Devuelve un dict con el AST y las
+        listas de errores léxicos, sintácticos y semánticos.
+        Con procesos != 1 los cuerpos de funciones y clases se chequean
+        en paralelo (paralelo_cs); None = un proceso por CPU.
+        reportar(msg, nodo) recibe cada error semántico apenas aparece
+        (solo con procesos=1; ver registro_cs).
+        cancelacion (una Cancelacion) corta el análisis con
+        AnalisisCancelado (con procesos != 1 solo antes del semántico).
+        """
+        ast = self.parse(data, cancelacion)
+        errores_semanticos = []
+        if semantico and ast:
+            if cancelacion is not None:
+                cancelacion.verificar()
+            if procesos == 1:
+                contexto = parser_cs.get_semantico().ContextoSemantico()
+                contexto.reportar = reportar
+                if cancelacion is not None:
+                    # Atributo de la instancia: la clase no cambia
+                    contexto._SENTENCIAS = _sentencias_vigiladas(contexto._SENTENCIAS, cancelacion)
+                errores_semanticos = contexto.analizar_programa(ast)
+            else:
+                import paralelo_cs
+                errores_semanticos = paralelo_cs.analizar_programa(ast, procesos)
+        return {
+            "ast": ast,
+            "errores_lexicos": list(self.lexer.errores),
+            "errores_sintacticos": list(self.errores_sintacticos),
+            "errores_semanticos": errores_semanticos,
+            "desde_cache": self.desde_cache,
+        }
+
+
+class PoolSesiones:
+    """
+    Conjunto de hasta `tamano` sesiones compartidas entre hilos.
+    Las sesiones se crean a demanda; si todas están ocupadas, el hilo
+    espera a que se libere una.
+    """
+
+    def __init__(self, tamano=4, cache=None, buffer=False):
+        self.tamano = tamano
+        self.cache = cache
+        self.buffer = buffer
+        self._libres = queue.LifoQueue()
+        self._creadas = 0
+        self._lock = threading.Lock()
+
+    def _obtener(self):
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._creadas < self.tamano:
+                self._creadas += 1
+                return SesionAnalisis(self.cache, self.buffer)
+        return self._libres.get()
+
+    @contextmanager
+    def sesion(self):
+        s = self._obtener()
+        try:
+            yield s
+        finally:
+            self._libres.put(s)
+
+    def analizar(self, data, semantico=True):
+        with self.sesion() as s:
+            return s.analizar(data, semantico)